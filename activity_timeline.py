@@ -0,0 +1,177 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+from feedback_sessions import parse_timestamps_ms
+from team_index import get_owner_name
+
+TEAMS_PATH = 'structured_teams.json'
+TIMELINE_PATH = 'activity_timeline.json'
+BIN_SECONDS = 60
+IDLE_SECONDS = 300
+MAX_BINS = 10000
+
+def collect_events(teams_list):
+    """
+    팀 리스트에서 시각이 있는 모든 활동을 (팀 index, 행위자, 유형, 시각 문자열) 평행 리스트로 모으는 함수
+    유형: idea, evaluation(아이디어 평가 제출), chat:<메시지 유형>, feedback_session(세션 시작), feedback_message(세션 내 메시지)
+    """
+    events = {'team': [], 'actor': [], 'type': [], 'timestamp': []}
+
+    def add(team_index, actor, event_type, timestamp):
+        events['team'].append(team_index)
+        events['actor'].append(actor or '')
+        events['type'].append(event_type)
+        events['timestamp'].append(timestamp)
+
+    for team_index, team in enumerate(teams_list):
+        for idea_json in team.get('ideas', []):
+            idea = json.loads(idea_json) if isinstance(idea_json, str) else idea_json
+            add(team_index, idea.get('author'), 'idea', idea.get('timestamp'))
+            for evaluation in idea.get('evaluations') or []:
+                add(team_index, evaluation.get('evaluator'), 'evaluation', evaluation.get('timestamp'))
+        for message_json in team.get('chat', []):
+            message = json.loads(message_json) if isinstance(message_json, str) else message_json
+            add(team_index, message.get('sender'), f"chat:{message.get('type')}", message.get('timestamp'))
+            if message.get('type') == 'feedback_session_summary' and isinstance(message.get('payload'), dict):
+                for session_message in message['payload'].get('sessionMessages') or []:
+                    add(team_index, session_message.get('sender'), 'feedback_message', session_message.get('timestamp'))
+        for session in team.get('feedback_sessions', []):
+            add(team_index, None, 'feedback_session', session.get('created_at'))
+    return events
+
+def _group_lookup(values):
+    """문자열 배열을 (고유값 리스트, 각 원소의 코드 배열)로 바꾸는 함수"""
+    unique, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    return unique.tolist(), codes
+
+def _optional(value, digits=3):
+    """nan이면 None, 아니면 반올림한 float을 반환하는 함수"""
+    return None if np.isnan(value) else round(float(value), digits)
+
+def build_timeline(teams_list, bin_seconds=BIN_SECONDS, idle_seconds=IDLE_SECONDS, max_bins=MAX_BINS):
+    """
+    모든 팀의 활동 타임라인을 한 번에 계산하는 함수
+    시각 문자열을 한 번만 epoch 밀리초 배열로 바꾼 뒤, 팀 생성 시각 기준 bin_seconds 간격으로
+    팀별 x 유형별, 팀별 x 행위자별 히스토그램을 bincount로 만든다.
+    팀별 파생 지표(첫 아이디어까지 걸린 시간, burstiness, idle 구간)도 팀 루프 없이 그룹 연산으로 계산한다.
+    """
+    team_count = len(teams_list)
+    events = collect_events(teams_list)
+    timestamps = parse_timestamps_ms(events['timestamp'])
+    teams = np.asarray(events['team'], dtype=np.int64)
+    valid = timestamps >= 0
+    timestamps, teams = timestamps[valid], teams[valid]
+    types, type_codes = _group_lookup(np.asarray(events['type'], dtype=object)[valid])
+    actor_keys = [f"{team}|{actor}"
+                  for team, actor in zip(teams.tolist(), np.asarray(events['actor'], dtype=object)[valid])]
+    actors, actor_codes = _group_lookup(actor_keys)
+
+    # 팀 시작 시각: team_info.createdAt, 없으면 첫 활동 시각
+    starts = parse_timestamps_ms([(team.get('team_info') or {}).get('createdAt') for team in teams_list])
+    first_event = np.full(team_count, np.iinfo(np.int64).max)
+    np.minimum.at(first_event, teams, timestamps)
+    last_event = np.full(team_count, -1, dtype=np.int64)
+    np.maximum.at(last_event, teams, timestamps)
+    has_events = last_event >= 0
+    starts = np.where((starts < 0) & has_events, first_event, starts)
+
+    bin_ms = int(bin_seconds * 1000)
+    offsets = np.maximum(timestamps - starts[teams], 0)
+    bins = np.minimum(offsets // bin_ms, max_bins - 1)
+    bin_count = int(bins.max()) + 1 if len(bins) else 0
+    type_hist = np.bincount((teams * len(types) + type_codes) * bin_count + bins,
+                            minlength=team_count * len(types) * bin_count).reshape(team_count, len(types), bin_count)
+    actor_hist = np.bincount(actor_codes * bin_count + bins, minlength=len(actors) * bin_count).reshape(len(actors), bin_count)
+    # 팀마다 마지막 활동이 있는 bin까지만 잘라서 저장
+    team_bins = np.zeros(team_count, dtype=np.int64)
+    np.maximum.at(team_bins, teams, bins + 1)
+
+    # 첫 아이디어까지 걸린 시간
+    idea_mask = type_codes == types.index('idea') if 'idea' in types else np.zeros(len(teams), dtype=bool)
+    first_idea = np.full(team_count, np.iinfo(np.int64).max)
+    np.minimum.at(first_idea, teams[idea_mask], timestamps[idea_mask])
+    time_to_first_idea = np.where(first_idea < np.iinfo(np.int64).max, (first_idea - starts) / 1000, np.nan)
+
+    # 팀 안의 연속 활동 간격: (팀, 시각) 정렬 후 diff
+    order = np.lexsort((timestamps, teams))
+    sorted_teams, sorted_times = teams[order], timestamps[order]
+    same_team = sorted_teams[1:] == sorted_teams[:-1]
+    gaps = (np.diff(sorted_times) / 1000)[same_team]
+    gap_teams = sorted_teams[1:][same_team]
+    gap_count = np.bincount(gap_teams, minlength=team_count)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        gap_mean = np.bincount(gap_teams, weights=gaps, minlength=team_count) / gap_count
+        gap_var = np.bincount(gap_teams, weights=gaps * gaps, minlength=team_count) / gap_count - gap_mean ** 2
+        gap_std = np.sqrt(np.maximum(gap_var, 0))
+        # Goh-Barabási burstiness: -1(규칙적) ~ 0(포아송) ~ 1(몰아서 활동)
+        burstiness = np.where(gap_count > 1, (gap_std - gap_mean) / (gap_std + gap_mean), np.nan)
+    max_gap = np.zeros(team_count)
+    np.maximum.at(max_gap, gap_teams, gaps)
+    idle = gaps >= idle_seconds
+    idle_count = np.bincount(gap_teams[idle], minlength=team_count)
+    idle_time = np.bincount(gap_teams[idle], weights=gaps[idle], minlength=team_count)
+    active_span = np.where(has_events, (last_event - first_event) / 1000, np.nan)
+    event_count = np.bincount(teams, minlength=team_count)
+
+    team_rows = []
+    for team_index, team in enumerate(teams_list):
+        width = int(team_bins[team_index])
+        team_rows.append({
+            'team_id': team['team_id'],
+            'owner': get_owner_name(team),
+            'start_ms': int(starts[team_index]) if starts[team_index] >= 0 else None,
+            'events': int(event_count[team_index]),
+            'active_span_s': _optional(active_span[team_index]),
+            'time_to_first_idea_s': _optional(time_to_first_idea[team_index]),
+            'burstiness': _optional(burstiness[team_index], 4),
+            'mean_gap_s': _optional(gap_mean[team_index]),
+            'max_idle_gap_s': round(float(max_gap[team_index]), 3),
+            'idle_gaps': int(idle_count[team_index]),
+            'idle_time_s': round(float(idle_time[team_index]), 3),
+            'histogram': {event_type: type_hist[team_index, type_index, :width].tolist()
+                          for type_index, event_type in enumerate(types) if type_hist[team_index, type_index].any()}
+        })
+
+    agent_names = {}
+    for team in teams_list:
+        for agent in team.get('agents', []):
+            agent_names[agent['agentId']] = (agent.get('agent_info') or {}).get('name')
+    actor_rows = []
+    for actor_index, actor_key in enumerate(actors):
+        team_index, actor = actor_key.split('|', 1)
+        width = int(team_bins[int(team_index)])
+        actor_rows.append({'team_id': teams_list[int(team_index)]['team_id'], 'actor': actor or None,
+                           'name': agent_names.get(actor), 'events': int(actor_hist[actor_index].sum()),
+                           'histogram': actor_hist[actor_index, :width].tolist()})
+
+    return {
+        'params': {'bin_seconds': bin_seconds, 'idle_seconds': idle_seconds, 'max_bins': max_bins},
+        'types': types,
+        'totals': {event_type: int(type_hist[:, type_index].sum()) for type_index, event_type in enumerate(types)},
+        'teams': team_rows,
+        'actors': actor_rows
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='팀 활동 타임라인 히스토그램과 시간 지표 계산')
+    parser.add_argument('--teams', default=TEAMS_PATH)
+    parser.add_argument('--bin', type=float, default=BIN_SECONDS, help='히스토그램 bin 폭 (초)')
+    parser.add_argument('--idle', type=float, default=IDLE_SECONDS, help='idle 구간으로 볼 최소 간격 (초)')
+    parser.add_argument('--output', default=TIMELINE_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with open(args.teams, 'r', encoding='utf-8') as f:
+        teams_list = json.load(f)
+    timeline = build_timeline(teams_list, args.bin, args.idle)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(timeline, f, ensure_ascii=False)
+
+    print(f"활동 {sum(timeline['totals'].values())}건, 유형 {timeline['totals']}")
+    for row in timeline['teams']:
+        print(f"- {row['owner']} / {row['team_id']}: 활동 {row['events']}건, 첫 아이디어 {row['time_to_first_idea_s']}초, "
+              f"burstiness {row['burstiness']}, 최장 idle {row['max_idle_gap_s']}초 (idle {row['idle_gaps']}회)")
+    print(f"{args.output}에 저장했습니다. ({(time.perf_counter() - start) * 1000:.0f}ms)")
@@ -0,0 +1,104 @@
+import json
+from collections import OrderedDict
+
+from snapshot import SNAPSHOT_PATH, load_snapshot, read_snapshot_entry
+
+AGENT_MEMORY_PREFIX = 'new_agent_memory:'
+AGENT_LONG_TERM_PATH = 'agent_long_term.json'
+
+# 일괄 추출 기본 필드 (longTerm)
+LONG_TERM_FIELDS = ('relation', 'knowledge')
+
+class AgentMemoryStore:
+    """
+    new_agent_memory:* 값을 필요할 때만 디코딩하는 agent 메모리 저장소
+    snapshot을 처음 읽을 때 기록한 바이트 오프셋만 보관하고, 디코딩된 메모리는 LRU 캐시에 최대 cache_size개 유지한다.
+    """
+
+    def __init__(self, path, offsets, cache_size=32):
+        self.path = path
+        self.cache_size = cache_size
+        # agent ID → (바이트 오프셋, 길이)
+        self._offsets = {key[len(AGENT_MEMORY_PREFIX):]: offset for key, offset in offsets.items()
+                         if key.startswith(AGENT_MEMORY_PREFIX)}
+        self._cache = OrderedDict()
+
+    def __contains__(self, agent_id):
+        return agent_id in self._offsets
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def agent_ids(self):
+        """메모리가 있는 agent ID 목록을 반환하는 함수"""
+        return list(self._offsets)
+
+    def _read_value(self, agent_id):
+        """agent 메모리 항목의 원본 JSON 문자열을 읽는 함수 (만료된 항목은 None)"""
+        offset, length = self._offsets[agent_id]
+        record = read_snapshot_entry(self.path, offset, length)
+        if record.get('type') != 'string':
+            return None
+        return record['value']
+
+    def get(self, agent_id):
+        """agent 메모리 전체를 디코딩하여 반환하는 함수 (LRU 캐시 사용, 없으면 None)"""
+        if agent_id not in self._offsets:
+            return None
+        if agent_id in self._cache:
+            self._cache.move_to_end(agent_id)
+            return self._cache[agent_id]
+
+        value = self._read_value(agent_id)
+        memory = json.loads(value) if value is not None else None
+        self._cache[agent_id] = memory
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return memory
+
+    def extract_long_term(self, fields=LONG_TERM_FIELDS, agent_ids=None):
+        """
+        여러 agent의 longTerm 필드만 일괄 추출하는 함수 (agent ID → {필드: 값})
+        메모리 전체를 디코딩하지 않고 longTerm 객체만 디코딩하며, LRU 캐시에도 넣지 않는다.
+        """
+        decoder = json.JSONDecoder()
+        if agent_ids is None:
+            agent_ids = self._offsets
+        # 파일을 앞에서부터 순서대로 읽도록 오프셋 순 정렬
+        ordered_ids = sorted((agent_id for agent_id in agent_ids if agent_id in self._offsets),
+                             key=lambda agent_id: self._offsets[agent_id][0])
+
+        extracted = {}
+        for agent_id in ordered_ids:
+            if agent_id in self._cache and self._cache[agent_id] is not None:
+                long_term = self._cache[agent_id].get('longTerm', {})
+            else:
+                value = self._read_value(agent_id)
+                if value is None:
+                    continue
+                marker = value.find('"longTerm":')
+                if marker < 0:
+                    continue
+                long_term, _ = decoder.raw_decode(value, marker + len('"longTerm":'))
+            extracted[agent_id] = {field: long_term.get(field) for field in fields}
+        return extracted
+
+def load_snapshot_with_memory(path=SNAPSHOT_PATH, cache_size=32):
+    """agent 메모리는 오프셋만 기록하며 snapshot을 로드하는 함수 ((data, AgentMemoryStore) 반환)"""
+    data, lazy_offsets = load_snapshot(path, lazy_prefixes=(AGENT_MEMORY_PREFIX,))
+    return data, AgentMemoryStore(path, lazy_offsets, cache_size)
+
+def join_long_term_to_teams(memory_store, teams_list, fields=LONG_TERM_FIELDS):
+    """팀별 agent의 longTerm 필드를 team_id → agent ID → {필드: 값} 형태로 연결하는 함수"""
+    team_agents = {team['team_id']: [agent['agentId'] for agent in team.get('agents', [])] for team in teams_list}
+    all_agent_ids = {agent_id for agent_ids in team_agents.values() for agent_id in agent_ids}
+    long_term = memory_store.extract_long_term(fields, all_agent_ids)
+    return {team_id: {agent_id: long_term[agent_id] for agent_id in agent_ids if agent_id in long_term}
+            for team_id, agent_ids in team_agents.items()}
+
+def write_long_term_by_team(memory_store, teams_list, path=AGENT_LONG_TERM_PATH, fields=LONG_TERM_FIELDS):
+    """팀별 agent longTerm 필드를 JSON 파일로 저장하고, 메모리가 연결된 agent 수를 반환하는 함수"""
+    joined = join_long_term_to_teams(memory_store, teams_list, fields)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(joined, f, ensure_ascii=False, indent=2)
+    return sum(len(agents) for agents in joined.values())
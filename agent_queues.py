@@ -0,0 +1,246 @@
+import json
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from feedback_sessions import parse_timestamps_ms
+from snapshot import find_snapshot_path, load_snapshot
+
+AGENT_QUEUE_PREFIX = 'agent_queue:'
+AGENT_STATE_PREFIX = 'agent_state:'
+USER_STATE_SUFFIX = ':user_state'
+KEY_STRIDE = 10 ** 13   # (agent 번호, 밀리초 시각)을 int64 하나로 합칠 때 agent 번호에 곱하는 값
+
+def get_action_type(action):
+    """큐 액션의 유형을 반환하는 함수 (retrospective는 memoryEvent 유형까지 포함, 예: retrospective:REQUEST_MADE)"""
+    action_type = action.get('type', 'unknown')
+    if action_type == 'retrospective':
+        memory_event = (action.get('payload') or {}).get('memoryEvent') or {}
+        if memory_event.get('type'):
+            return f"{action_type}:{memory_event['type']}"
+    return action_type
+
+def _decode_json_value(value):
+    """string 타입 값을 JSON으로 디코딩하는 함수 (실패하거나 만료된 값은 None)"""
+    if value['type'] != 'string':
+        return None
+    try:
+        return json.loads(value['value'])
+    except json.JSONDecodeError:
+        return None
+
+def collect_queue_data(data):
+    """
+    snapshot을 한 번 순회하며 agent 큐 액션, agent/사용자 상태, 큐가 있는 팀의 chat 메시지를 모으는 함수
+    큐 액션은 (team_id, agent_id, 액션) 목록, chat은 team_id → 디코딩된 메시지 목록으로 반환한다.
+    """
+    queue_actions = []
+    queued_agents = set()
+    agent_states = {}
+    user_states = {}
+    chat_lists = {}
+
+    for key, value in data.items():
+        if key.startswith(AGENT_QUEUE_PREFIX) and value['type'] == 'list':
+            _, team_id, agent_id = key.split(':', 2)
+            queued_agents.add((team_id, agent_id))
+            for raw_action in value['value']:
+                try:
+                    queue_actions.append((team_id, agent_id, json.loads(raw_action)))
+                except json.JSONDecodeError:
+                    continue
+        elif key.startswith(AGENT_STATE_PREFIX):
+            state = _decode_json_value(value)
+            if state is not None:
+                _, team_id, agent_id = key.split(':', 2)
+                agent_states[(team_id, agent_id)] = state
+        elif key.startswith('team:') and key.endswith(USER_STATE_SUFFIX):
+            state = _decode_json_value(value)
+            if state is not None:
+                user_states[key.split(':')[1]] = state
+        elif key.startswith('team:') and key.endswith(':chat') and value['type'] == 'list':
+            chat_lists[key.split(':')[1]] = value['value']
+
+    # 큐가 있는 팀의 chat만 디코딩
+    queued_teams = {team_id for team_id, _ in queued_agents}
+    chats = {}
+    for team_id in queued_teams:
+        messages = []
+        for raw_message in chat_lists.get(team_id, []):
+            try:
+                messages.append(json.loads(raw_message))
+            except json.JSONDecodeError:
+                continue
+        chats[team_id] = messages
+
+    return queue_actions, queued_agents, agent_states, user_states, chats
+
+def _match_chat_timestamp(action, team_id, agent_id, chat_by_id, request_chats):
+    """큐 액션을 발생시킨 chat 메시지의 시각을 찾는 함수 (없으면 None)"""
+    payload = action.get('payload') or {}
+    memory_event = payload.get('memoryEvent') or {}
+    event_payload = memory_event.get('payload') or {}
+
+    # CHAT_MESSAGE_SENT: memoryEvent에 chat 메시지 id가 들어 있음
+    message = event_payload.get('message')
+    if isinstance(message, dict) and message.get('id') is not None:
+        chat_message = chat_by_id.get((team_id, message['id']))
+        return chat_message.get('timestamp') if chat_message else message.get('timestamp')
+
+    # 요청으로 생긴 액션(generate_idea 등, REQUEST_MADE): 같은 대상/내용의 make_request 메시지 중 큐 등록 직전 것
+    content = event_payload.get('content') if memory_event else payload.get('message')
+    target_id = event_payload.get('targetId', agent_id)
+    candidates = request_chats.get((team_id, target_id, content), [])
+    enqueued_at = action.get('timestamp', '')
+    earlier = [timestamp for timestamp in candidates if timestamp <= enqueued_at]
+    return max(earlier) if earlier else None
+
+def _next_agent_chat_ms(queue_actions, enqueued_ms, chats):
+    """
+    큐 액션마다 같은 agent가 큐 등록 이후 처음 보낸 chat 메시지의 시각(밀리초, 없으면 -1)을 찾는 함수
+    모든 agent의 chat 시각을 (agent 번호, 시각) 정렬 배열 하나로 만들고 searchsorted로 한 번에 찾는다.
+    """
+    agent_codes = {}
+    chat_keys = []
+    chat_times = []
+    for team_id, messages in chats.items():
+        for message in messages:
+            code = agent_codes.setdefault((team_id, message.get('sender')), len(agent_codes))
+            chat_keys.append(code)
+            chat_times.append(message.get('timestamp'))
+    chat_ms = parse_timestamps_ms(chat_times)
+    valid = chat_ms >= 0
+    combined = np.sort(np.asarray(chat_keys, dtype=np.int64)[valid] * KEY_STRIDE + chat_ms[valid])
+
+    action_keys = np.array([agent_codes.get((team_id, agent_id), -1) for team_id, agent_id, _ in queue_actions],
+                           dtype=np.int64)
+    positions = np.searchsorted(combined, action_keys * KEY_STRIDE + enqueued_ms, side='right')
+    following = combined[np.minimum(positions, len(combined) - 1)] if len(combined) else np.zeros_like(positions)
+    found = (action_keys >= 0) & (enqueued_ms >= 0) & (positions < len(combined)) \
+        & (following // KEY_STRIDE == action_keys)
+    return np.where(found, following % KEY_STRIDE, -1)
+
+def _latency_summary(latencies):
+    """nan을 제외한 지연 배열의 개수/평균/중앙값/최댓값 dict를 만드는 함수"""
+    values = latencies[~np.isnan(latencies)]
+    return {
+        'count': int(len(values)),
+        'mean': round(float(np.mean(values)), 3) if len(values) else None,
+        'median': round(float(np.median(values)), 3) if len(values) else None,
+        'max': round(float(np.max(values)), 3) if len(values) else None
+    }
+
+def compute_queue_metrics(data):
+    """
+    모든 팀의 agent 큐 지표를 한 번에 계산하는 함수
+    agent별 큐 깊이, 액션 유형 구성, 지연(초)과 팀별 합계, 사용자/agent 현재 상태를 반환한다.
+    - dispatch 지연: 액션을 발생시킨 chat 메시지 → 큐 등록
+    - response 지연: 큐 등록 → 같은 agent가 그 뒤 처음 보낸 chat 메시지 (agent 처리 지연)
+    """
+    queue_actions, queued_agents, agent_states, user_states, chats = collect_queue_data(data)
+
+    # chat 메시지 id, make_request (대상, 내용) 인덱스
+    chat_by_id = {}
+    request_chats = defaultdict(list)
+    for team_id, messages in chats.items():
+        for message in messages:
+            chat_by_id[(team_id, message.get('id'))] = message
+            if message.get('type') == 'make_request':
+                payload = message.get('payload') or {}
+                request_chats[(team_id, payload.get('mention'), payload.get('content'))].append(message.get('timestamp', ''))
+
+    # 큐 액션 ↔ 발생시킨 chat 시각 매칭 후 dispatch 지연을 한 번에 계산
+    enqueued_at = []
+    chat_at = []
+    for team_id, agent_id, action in queue_actions:
+        enqueued_at.append(action.get('timestamp'))
+        chat_at.append(_match_chat_timestamp(action, team_id, agent_id, chat_by_id, request_chats))
+    enqueued_ms = parse_timestamps_ms(enqueued_at)
+    chat_ms = parse_timestamps_ms(chat_at)
+    matched = (enqueued_ms >= 0) & (chat_ms >= 0)
+    dispatch_latencies = np.where(matched, (enqueued_ms - chat_ms) / 1000, np.nan)
+    response_ms = _next_agent_chat_ms(queue_actions, enqueued_ms, chats)
+    response_latencies = np.where(response_ms >= 0, (response_ms - enqueued_ms) / 1000, np.nan)
+
+    agent_rows = {}
+    for team_id, agent_id in sorted(queued_agents):
+        state = agent_states.get((team_id, agent_id)) or {}
+        agent_rows[(team_id, agent_id)] = {
+            'team_id': team_id,
+            'agent_id': agent_id,
+            'queue_depth': 0,
+            'action_types': Counter(),
+            'oldest_enqueued_at': None,
+            'dispatch_latencies': [],
+            'response_latencies': [],
+            'current_state': state.get('currentState')
+        }
+
+    for (team_id, agent_id, action), latency, response_latency in zip(queue_actions, dispatch_latencies.tolist(),
+                                                                       response_latencies.tolist()):
+        row = agent_rows[(team_id, agent_id)]
+        row['queue_depth'] += 1
+        row['action_types'][get_action_type(action)] += 1
+        timestamp = action.get('timestamp')
+        if timestamp and (row['oldest_enqueued_at'] is None or timestamp < row['oldest_enqueued_at']):
+            row['oldest_enqueued_at'] = timestamp
+        if not np.isnan(latency):
+            row['dispatch_latencies'].append(latency)
+        if not np.isnan(response_latency):
+            row['response_latencies'].append(response_latency)
+
+    agents = []
+    teams = {}
+    for row in agent_rows.values():
+        row_latencies = row.pop('dispatch_latencies')
+        row['action_types'] = dict(row['action_types'])
+        row['matched_actions'] = len(row_latencies)
+        row['mean_dispatch_latency_s'] = round(float(np.mean(row_latencies)), 3) if row_latencies else None
+        row['max_dispatch_latency_s'] = round(float(np.max(row_latencies)), 3) if row_latencies else None
+        row_responses = row.pop('response_latencies')
+        row['responded_actions'] = len(row_responses)
+        row['mean_response_latency_s'] = round(float(np.mean(row_responses)), 3) if row_responses else None
+        row['max_response_latency_s'] = round(float(np.max(row_responses)), 3) if row_responses else None
+        agents.append(row)
+
+        team = teams.setdefault(row['team_id'], {
+            'team_id': row['team_id'],
+            'queued_agents': 0,
+            'total_queue_depth': 0,
+            'max_queue_depth': 0,
+            'action_types': Counter(),
+            'user_state': (user_states.get(row['team_id']) or {}).get('currentState')
+        })
+        team['queued_agents'] += 1
+        team['total_queue_depth'] += row['queue_depth']
+        team['max_queue_depth'] = max(team['max_queue_depth'], row['queue_depth'])
+        team['action_types'].update(row['action_types'])
+
+    for team in teams.values():
+        team['action_types'] = dict(team['action_types'])
+
+    return {
+        'agents': agents,
+        'teams': list(teams.values()),
+        'user_states': {team_id: state.get('currentState') for team_id, state in user_states.items()},
+        'overall_action_types': dict(Counter(get_action_type(action) for _, _, action in queue_actions)),
+        'dispatch_latency_s': _latency_summary(dispatch_latencies),
+        'response_latency_s': _latency_summary(response_latencies)
+    }
+
+if __name__ == "__main__":
+    data, _ = load_snapshot(find_snapshot_path(), lazy_prefixes=('new_agent_memory:',))
+    metrics = compute_queue_metrics(data)
+
+    with open('agent_queue_metrics.json', 'w', encoding='utf-8') as f:
+        json.dump(metrics, f, ensure_ascii=False, indent=2)
+
+    print(f"큐가 있는 agent {len(metrics['agents'])}명, 팀 {len(metrics['teams'])}개")
+    for row in metrics['agents']:
+        print(f"- {row['team_id']} / {row['agent_id']}: 대기 {row['queue_depth']}개 {row['action_types']}, "
+              f"평균 dispatch 지연 {row['mean_dispatch_latency_s']}초 (매칭 {row['matched_actions']}개), "
+              f"평균 response 지연 {row['mean_response_latency_s']}초 (응답 {row['responded_actions']}개)")
+    print(f"사용자 상태: {metrics['user_states']}")
+    print(f"전체 dispatch 지연 (chat → 큐 등록): {metrics['dispatch_latency_s']}")
+    print(f"전체 response 지연 (큐 등록 → agent chat): {metrics['response_latency_s']}")
+    print("agent_queue_metrics.json에 저장했습니다.")
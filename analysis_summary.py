@@ -0,0 +1,571 @@
+import json
+import re
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+
+ANALYSIS_SUMMARY_PATH = 'analysis_summary.json'
+SUMMARY_SCHEMA_VERSION = 1
+
+# analysis_summary.json 스키마 (tdv 대시보드가 structured_teams.json 대신 읽을 수 있도록 JS 쪽 키 이름을 그대로 사용)
+#
+# {
+#   "schemaVersion": 1,
+#   "createdAt": "2025-07-01T12:00:00",
+#   "source": "structured_teams.json",
+#   "teams": [{"team_id", "teamName", "participant", "displayNumber"}],  대시보드가 보여 주는 팀 (App.js와 같은 선택)
+#   "perTeam": {team_id: {                                                 팀 카드/상세 화면용 팀별 집계
+#       "teamKey": "team1"|"team2"|"team3",                                getTeamKey
+#       "ideaCount", "evaluationCount", "chatCount",
+#       "chatMessageCounts": {type: count},                               extractChatMessageCount (유형별)
+#       "roleCounts": {"ideaGeneration", "evaluation", "feedback", "request"}  extractRoleCounts
+#   }},
+#   "analysisData": {...},                  useAnalysisData(teams)의 반환값 (participantTeams는 팀 객체 대신 team_id 목록)
+#                                           통계 항목 {avg, min, max, stdev}는 JS toFixed(2)와 같은 문자열
+#   "centralizedActivityStats": {...},      calculateTeamActivityStats(teams)
+#   "statsSummary": {...},                  generateStatsSummary(centralizedActivityStats)
+#   "userActivityStats": {...},             calculateUserActivityStats(teams)
+#   "userCounts": {...},                    countAllUsers(teams)
+#   "userProfileCompleteness": {...}        calculateUserProfileCompleteness(teams)
+# }
+#
+# 계산은 tdv/src/utils/teamDataCalculator.js, tdv/src/hooks/useAnalysisData.js와 같은 규칙을 따른다
+# (팀 번호 결정, '나' 기준 사용자 활동 판정, 참가자 내 순번으로 사용자 활동을 참조하는 부분 등 포함).
+
+ROLE_KEYS = {
+    '아이디어 생성하기': 'ideaGeneration',
+    '아이디어 평가하기': 'evaluation',
+    '피드백하기': 'feedback',
+    '요청하기': 'request'
+}
+TEAM_KEYS = ('team1', 'team2', 'team3', 'total')
+USER_PROFILE_FIELDS = ['name', 'age', 'gender', 'nationality', 'major', 'education',
+                       'professional', 'skills', 'personality', 'workStyle', 'preferences', 'dislikes']
+AGENT_PROFILE_FIELDS = ['name', 'age', 'gender', 'personality', 'education', 'skills', 'professional',
+                        'preferences', 'dislikes', 'workStyle']
+ACTIVITY_NAMES = {'ideaGeneration': '아이디어 생성', 'evaluation': '평가', 'feedback': '피드백', 'request': '요청'}
+
+KOREAN_SYLLABLE_PATTERN = re.compile(r'[가-힣]')
+ENGLISH_SYLLABLE_PATTERN = re.compile(r'[aeiouyAEIOUY]+')
+
+def _parse(item):
+    """JSON 문자열이면 디코딩하고, records.py 레코드면 dict로 바꾸고, 이미 객체면 그대로 반환하는 함수 (실패 시 None)"""
+    if isinstance(item, str):
+        try:
+            return json.loads(item)
+        except ValueError:
+            return None
+    if hasattr(item, 'to_dict'):
+        return item.to_dict()
+    return item
+
+def _parse_members(team):
+    """team_info.members 문자열을 멤버 리스트로 디코딩하는 함수"""
+    try:
+        members = json.loads(team['team_info'].get('members') or '[]')
+    except (ValueError, TypeError):
+        return None
+    return members if isinstance(members, list) else None
+
+def _empty_team_lists():
+    return {key: [] for key in TEAM_KEYS}
+
+def _empty_activity():
+    return {'ideaGeneration': 0, 'evaluation': 0, 'feedback': 0, 'request': 0}
+
+def to_fixed(value, digits=2):
+    """JS Number.prototype.toFixed와 같은 결과(반올림 방향 포함)의 문자열을 만드는 함수"""
+    quantum = Decimal(1).scaleb(-digits)
+    return str(Decimal(value).quantize(quantum, rounding=ROUND_HALF_UP))
+
+class ParsedTeam:
+    """chat/ideas/members를 한 번만 디코딩해 두는 팀 뷰 (JS에서는 함수마다 다시 JSON.parse 하던 부분)"""
+    __slots__ = ('team', 'ideas', 'chat', 'members')
+
+    def __init__(self, team):
+        self.team = team
+        self.ideas = [idea for idea in (_parse(item) for item in team.get('ideas') or []) if isinstance(idea, dict)]
+        self.chat = [message for message in (_parse(item) for item in team.get('chat') or [])
+                     if isinstance(message, dict)]
+        self.members = _parse_members(team)
+
+def _idea_evaluations(idea):
+    evaluations = idea.get('evaluations')
+    if isinstance(evaluations, str):
+        evaluations = _parse(evaluations)
+    return evaluations if isinstance(evaluations, list) else []
+
+def get_team_key(team, team_index):
+    """팀 번호 키를 결정하는 함수 (teamDataCalculator.js getTeamKey와 동일: 팀 이름의 숫자가 순번보다 우선)"""
+    team_name = team['team_info'].get('teamName') or team['team_info'].get('name') or ''
+    team_key = ('team1', 'team2', 'team3')[team_index % 3]
+    if '1' in team_name:
+        team_key = 'team1'
+    elif '2' in team_name:
+        team_key = 'team2'
+    elif '3' in team_name:
+        team_key = 'team3'
+    return team_key
+
+def count_chat_messages(parsed_team):
+    """chat 메시지 유형별 개수를 세는 함수 (extractChatMessageCount를 모든 유형에 대해 한 번에 계산)"""
+    counts = {}
+    for message in parsed_team.chat:
+        message_type = message.get('type')
+        counts[message_type] = counts.get(message_type, 0) + 1
+    return counts
+
+def extract_role_counts(parsed_team):
+    """members의 역할별 개수를 세는 함수 (extractRoleCounts와 동일, 사용자 멤버 포함)"""
+    role_counts = _empty_activity()
+    for member in parsed_team.members or []:
+        for role in member.get('roles') or []:
+            if role in ROLE_KEYS:
+                role_counts[ROLE_KEYS[role]] += 1
+    return role_counts
+
+def calculate_team_activity_stats(parsed_teams):
+    """팀별 실제 활동(아이디어/평가/피드백 세션/요청) 수를 합산하는 함수 (calculateTeamActivityStats)"""
+    stats = {key: _empty_activity() for key in TEAM_KEYS}
+    for team_index, parsed_team in enumerate(parsed_teams):
+        team_key = get_team_key(parsed_team.team, team_index)
+        message_counts = count_chat_messages(parsed_team)
+        activity = {
+            'ideaGeneration': len(parsed_team.team.get('ideas') or []),
+            'evaluation': sum(len(_idea_evaluations(idea)) for idea in parsed_team.ideas),
+            'feedback': message_counts.get('feedback_session_summary', 0),
+            'request': message_counts.get('make_request', 0)
+        }
+        for name, count in activity.items():
+            stats['total'][name] += count
+            stats[team_key][name] += count
+    return stats
+
+def _user_request_content(payload):
+    content = payload.get('content') if isinstance(payload, dict) else None
+    return isinstance(content, (str, list)) and '요청' in content
+
+def calculate_user_activity_stats(parsed_teams):
+    """사용자('나')가 수행한 아이디어/평가/피드백/요청 수를 팀마다 모으는 함수 (calculateUserActivityStats)"""
+    user_stats = {
+        'userFeedbacks': _empty_team_lists(),
+        'userEvaluations': _empty_team_lists(),
+        'userIdeas': _empty_team_lists(),
+        'userRequests': _empty_team_lists()
+    }
+    for team_index, parsed_team in enumerate(parsed_teams):
+        team_key = get_team_key(parsed_team.team, team_index)
+
+        idea_count = sum(1 for idea in parsed_team.ideas
+                         if '나' in (idea.get('author'), idea.get('user_id'), idea.get('creator')))
+        evaluation_count = sum(1 for idea in parsed_team.ideas for evaluation in _idea_evaluations(idea)
+                               if isinstance(evaluation, dict) and evaluation.get('evaluator') == '나')
+
+        feedback_count = 0
+        request_count = 0
+        for message in parsed_team.chat:
+            payload = message.get('payload')
+            if message.get('sender') == '나' and message.get('type') == 'message':
+                feedback_count += 1
+            if message.get('type') == 'feedback_session_summary' and isinstance(payload, dict):
+                for session_message in payload.get('sessionMessages') or []:
+                    if session_message.get('sender') == '나' and session_message.get('type') == 'message':
+                        feedback_count += 1
+            if message.get('sender') == '나' and (message.get('type') in ('make_request', 'request')
+                                                  or _user_request_content(payload)):
+                request_count += 1
+
+        for name, count in (('userIdeas', idea_count), ('userEvaluations', evaluation_count),
+                            ('userFeedbacks', feedback_count), ('userRequests', request_count)):
+            user_stats[name]['total'].append(count)
+            user_stats[name][team_key].append(count)
+    return user_stats
+
+def count_all_users(parsed_teams):
+    """사용자 멤버(isUser) 수와 프로필 유무를 세는 함수 (countAllUsers)"""
+    counts = {'totalUsers': 0, 'usersWithProfile': 0, 'usersWithoutProfile': 0}
+    for parsed_team in parsed_teams:
+        for member in parsed_team.members or []:
+            if member.get('isUser') is True:
+                counts['totalUsers'] += 1
+                if member.get('userProfile'):
+                    counts['usersWithProfile'] += 1
+                else:
+                    counts['usersWithoutProfile'] += 1
+    return counts
+
+def _is_field_complete(value):
+    return value is not None and (value.strip() != '' if isinstance(value, str) else True)
+
+def calculate_user_profile_completeness(parsed_teams, user_counts=None):
+    """사용자 프로필 필드별 입력 수와 완성 비율을 계산하는 함수 (calculateUserProfileCompleteness)"""
+    if not parsed_teams:
+        return {'completedUsers': 0, 'totalUsers': 0, 'percentage': 0, 'fields': {}}
+    total_users = (user_counts or count_all_users(parsed_teams))['totalUsers']
+    field_counts = {field: 0 for field in USER_PROFILE_FIELDS}
+    completed_users = 0
+    for parsed_team in parsed_teams:
+        for member in parsed_team.members or []:
+            if member.get('isUser') is True and member.get('userProfile'):
+                completed = 0
+                for field in USER_PROFILE_FIELDS:
+                    if _is_field_complete(member['userProfile'].get(field)):
+                        field_counts[field] += 1
+                        completed += 1
+                if completed == len(USER_PROFILE_FIELDS):
+                    completed_users += 1
+    percentage = int(Decimal(completed_users * 100 / total_users).quantize(Decimal(1), rounding=ROUND_HALF_UP)) \
+        if total_users > 0 else 0
+    return {'completedUsers': completed_users, 'totalUsers': total_users, 'percentage': percentage,
+            'fields': field_counts}
+
+def generate_stats_summary(stats):
+    """활동 통계의 총합/최다 활동/팀 비교를 만드는 함수 (generateStatsSummary)"""
+    total_activities = sum(stats['total'].values())
+    most_active = ('ideaGeneration', 0)
+    for key, value in stats['total'].items():
+        if value > most_active[1]:
+            most_active = (key, value)
+    return {
+        'totalActivities': total_activities,
+        'mostActiveActivity': {'name': ACTIVITY_NAMES[most_active[0]], 'count': most_active[1]},
+        'averagePerTeam': int(Decimal(total_activities / 3).quantize(Decimal(1), rounding=ROUND_HALF_UP)),
+        'teamComparison': {key: sum(stats[key].values()) for key in ('team1', 'team2', 'team3')}
+    }
+
+def count_syllables(text):
+    """공유 멘탈 모델 길이(한글 음절 + 영어 모음 그룹 기준 음절)를 세는 함수 (useAnalysisData countSyllables)"""
+    if not text or not isinstance(text, str):
+        return 0
+    korean = len(KOREAN_SYLLABLE_PATTERN.findall(text))
+    english = 0
+    for word in KOREAN_SYLLABLE_PATTERN.sub('', text).split():
+        english += len(ENGLISH_SYLLABLE_PATTERN.findall(word)) or 1
+    return korean + english
+
+def levenshtein_distance(first, second):
+    """두 문자열의 편집 거리를 계산하는 함수 (이전 행만 유지하는 동적 계획법)"""
+    if len(first) < len(second):
+        first, second = second, first
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        current = [i]
+        for j, second_char in enumerate(second, 1):
+            if first_char == second_char:
+                current.append(previous[j - 1])
+            else:
+                current.append(min(previous[j - 1], current[j - 1], previous[j]) + 1)
+        previous = current
+    return previous[-1]
+
+def calculate_similarity(first, second):
+    """편집 거리 기반 문자열 유사도(0~1)를 계산하는 함수 (calculateSimilarity)"""
+    if not first or not second:
+        return 1 if first == second else 0
+    if first == second:
+        return 1
+    max_length = max(len(first), len(second))
+    return (max_length - levenshtein_distance(first, second)) / max_length
+
+def calculate_stats(values):
+    """평균/최소/최대/표준편차를 JS toFixed(2) 문자열로 계산하는 함수 (useAnalysisData calculateStats)"""
+    if not values:
+        return {'avg': 0, 'min': 0, 'max': 0, 'stdev': 0}
+    avg = sum(values) / len(values)
+    variance = sum((value - avg) ** 2 for value in values) / len(values)
+    return {'avg': to_fixed(avg), 'min': to_fixed(min(values)), 'max': to_fixed(max(values)),
+            'stdev': to_fixed(variance ** 0.5)}
+
+def _stats_for_all_teams(stats):
+    return {key: calculate_stats(stats[key]) for key in TEAM_KEYS}
+
+def group_participant_teams(parsed_teams):
+    """owner 이름별로 팀을 모아 생성 시간순으로 정렬하는 함수 (useAnalysisData participantTeams)"""
+    participant_teams = {}
+    for parsed_team in parsed_teams:
+        name = (parsed_team.team.get('owner_info') or {}).get('name')
+        if name:
+            participant_teams.setdefault(name, []).append(parsed_team)
+    for name in participant_teams:
+        participant_teams[name].sort(key=lambda parsed_team: parsed_team.team['team_info'].get('createdAt') or '')
+    return participant_teams
+
+def analyze_mental_model_changes(participant_teams):
+    """참가자별 공유 멘탈 모델의 팀 간 변화를 분석하는 함수 (analyzeParticipantMentalModelChanges)"""
+    participant_changes = {}
+    for name, teams in participant_teams.items():
+        if len(teams) < 2:
+            continue
+        mental_models = []
+        for index, parsed_team in enumerate(teams):
+            model = parsed_team.team['team_info'].get('sharedMentalModel') or ''
+            mental_models.append({'teamNumber': index + 1, 'model': model, 'length': count_syllables(model)})
+        changes = []
+        for previous, current in zip(mental_models, mental_models[1:]):
+            similarity = calculate_similarity(previous['model'], current['model'])
+            changes.append({
+                'fromTeam': previous['teamNumber'],
+                'toTeam': current['teamNumber'],
+                'similarity': similarity,
+                'isIdentical': similarity == 1,
+                'isSignificant': similarity < 0.7,
+                'lengthChange': current['length'] - previous['length'],
+                'prevLength': previous['length'],
+                'currLength': current['length'],
+                'prevModel': previous['model'],
+                'currModel': current['model']
+            })
+        participant_changes[name] = {
+            'totalTeams': len(teams),
+            'mentalModels': mental_models,
+            'changes': changes,
+            'hasAnyChanges': any(not change['isIdentical'] for change in changes),
+            'significantChanges': sum(1 for change in changes if change['isSignificant'])
+        }
+    return participant_changes
+
+def _parse_int_prefix(value):
+    """JS parseInt처럼 앞부분의 정수만 읽는 함수 (없으면 None)"""
+    match = re.match(r'\s*([+-]?\d+)', str(value))
+    return int(match.group(1)) if match else None
+
+def calculate_personality_data(participant_teams, user_counts):
+    """에이전트 프로필 필드 입력 수와 나이/성별/성격/학력/전공/직업/스킬 분포를 모으는 함수 (personalityData)"""
+    stats = {
+        'totalAgents': 0,
+        'totalUsers': user_counts['totalUsers'],
+        'profileCompleteness': {'completed': 0, 'total': 0},
+        'fieldStats': {field: 0 for field in ['name', 'age', 'gender', 'personality', 'education', 'skills',
+                                              'professional', 'preferences', 'dislikes', 'workStyle']},
+        'ageData': [],
+        'genderStats': {'male': 0, 'female': 0},
+        'personalityTypes': {},
+        'educationLevels': {},
+        'majorFields': {},
+        'professions': {},
+        'skills': {}
+    }
+    for teams in participant_teams.values():
+        for parsed_team in teams:
+            for agent in parsed_team.team.get('agents') or []:
+                stats['totalAgents'] += 1
+                stats['profileCompleteness']['total'] += 1
+                agent_info = agent['agent_info'] or {}
+
+                completed = 0
+                for field in AGENT_PROFILE_FIELDS:
+                    value = agent_info.get(field)
+                    if value and str(value).strip():
+                        stats['fieldStats'][field] += 1
+                        completed += 1
+                if completed >= len(AGENT_PROFILE_FIELDS) * 0.8:
+                    stats['profileCompleteness']['completed'] += 1
+
+                age = _parse_int_prefix(agent_info['age']) if agent_info.get('age') else None
+                if age is not None and age > 0:
+                    stats['ageData'].append(age)
+
+                gender = agent_info.get('gender')
+                if gender:
+                    # JS와 같이 '남' 또는 'male'을 포함하면 male ('female'도 'male'을 포함함)
+                    stats['genderStats']['male' if '남' in gender or 'male' in gender else 'female'] += 1
+
+                for field, target in (('personality', 'personalityTypes'), ('education', 'educationLevels'),
+                                      ('major', 'majorFields'), ('professional', 'professions')):
+                    value = agent_info.get(field)
+                    if isinstance(value, str) and value.strip():
+                        stats[target][value.strip()] = stats[target].get(value.strip(), 0) + 1
+
+                skills = agent_info.get('skills')
+                if isinstance(skills, str):
+                    skills = [skill.strip() for skill in skills.split(',')]
+                for skill in skills or []:
+                    if skill:
+                        stats['skills'][skill] = stats['skills'].get(skill, 0) + 1
+    return stats
+
+def build_analysis_data(parsed_teams, user_activity_stats, activity_stats, user_counts, profile_completeness):
+    """useAnalysisData(teams)와 같은 구조의 분석 결과를 만드는 함수"""
+    participant_teams = group_participant_teams(parsed_teams)
+    participant_names = list(participant_teams)
+
+    collected = {name: _empty_team_lists() for name in [
+        'teamSizes', 'ideas', 'newIdeas', 'updatedIdeas', 'ideaPerAgent', 'chats', 'sharedMentalModel',
+        'userPerAgentIdeas', 'userPerAgentEvaluations', 'userPerAgentFeedbacks', 'userPerAgentRequests',
+        'evaluationPerAgent', 'feedbackPerAgent', 'requestPerAgent']}
+    mental_model_details = _empty_team_lists()
+    roles = {key: {'generation': [], 'evaluation': [], 'feedback': [], 'request': []} for key in TEAM_KEYS}
+    feedback_role_analysis = {'hasRoleCount': 0, 'hasRoleAndDid': 0, 'hasRoleButDidnt': 0, 'noRoleButDid': 0}
+    request_role_analysis = {'hasRoleCount': 0, 'hasRoleAndDid': 0, 'hasRoleButDidnt': 0, 'noRoleButDid': 0}
+    role_names = {'generation': '아이디어 생성하기', 'evaluation': '아이디어 평가하기', 'feedback': '피드백하기',
+                  'request': '요청하기'}
+
+    for teams in participant_teams.values():
+        for index, parsed_team in enumerate(teams):
+            team = parsed_team.team
+            team_keys = ['total'] + ([('team1', 'team2', 'team3')[index]] if index < 3 else [])
+            agents = team.get('agents') or []
+            team_roles = {name: sum(1 for agent in agents if role in (agent['roles'] or []))
+                          for name, role in role_names.items()}
+
+            idea_count = len(team.get('ideas') or [])
+            new_idea_count = len({idea.get('id') for idea in parsed_team.ideas})
+            user_roles = next((member.get('roles') or [] for member in parsed_team.members or []
+                               if member.get('isUser') is True), [])
+
+            # JS와 같이 사용자 활동은 전체 팀 목록 기준 배열을 참가자 내 순번(index)으로 참조
+            def user_count(name):
+                values = user_activity_stats[name]['total']
+                return values[index] if index < len(values) else 0
+
+            user_counts_by_role = {
+                'userPerAgentIdeas': ('아이디어 생성하기', user_count('userIdeas')),
+                'userPerAgentEvaluations': ('아이디어 평가하기', user_count('userEvaluations')),
+                'userPerAgentFeedbacks': ('피드백하기', user_count('userFeedbacks')),
+                'userPerAgentRequests': ('요청하기', user_count('userRequests'))
+            }
+            for analysis, (name, role) in ((feedback_role_analysis, ('userPerAgentFeedbacks', '피드백하기')),
+                                           (request_role_analysis, ('userPerAgentRequests', '요청하기'))):
+                did = user_counts_by_role[name][1] > 0
+                if role in user_roles:
+                    analysis['hasRoleCount'] += 1
+                    analysis['hasRoleAndDid' if did else 'hasRoleButDidnt'] += 1
+                elif did:
+                    analysis['noRoleButDid'] += 1
+
+            message_counts = count_chat_messages(parsed_team)
+            evaluation_total = sum(1 for message in parsed_team.chat if message.get('type') == 'system'
+                                   and isinstance((message.get('payload') or {}).get('content'), str)
+                                   and '평가했습니다' in message['payload']['content'])
+            performances = {
+                'evaluationPerAgent': (team_roles['evaluation'], evaluation_total),
+                'feedbackPerAgent': (team_roles['feedback'], message_counts.get('feedback_session_summary', 0)),
+                'requestPerAgent': (team_roles['request'], message_counts.get('make_request', 0))
+            }
+
+            mental_model_length = count_syllables(team['team_info'].get('sharedMentalModel') or '')
+            participant_id = f"P{participant_names.index((team.get('owner_info') or {}).get('name')) + 1}"
+            values = {
+                'teamSizes': 1 + len(agents),
+                'ideas': idea_count,
+                'newIdeas': new_idea_count,
+                'updatedIdeas': len(parsed_team.ideas) - new_idea_count,
+                'ideaPerAgent': idea_count / team_roles['generation'] if team_roles['generation'] > 0 else 0,
+                'chats': len(team.get('chat') or []),
+                'sharedMentalModel': mental_model_length
+            }
+            for team_key in team_keys:
+                for name, value in values.items():
+                    collected[name][team_key].append(value)
+                for name, (role, count) in user_counts_by_role.items():
+                    if role in user_roles and count > 0:
+                        collected[name][team_key].append(count)
+                for name, (agent_count, total) in performances.items():
+                    if agent_count > 0:
+                        collected[name][team_key].append(total / agent_count)
+                for name, count in team_roles.items():
+                    roles[team_key][name].append(count)
+                mental_model_details[team_key].append({
+                    'length': mental_model_length,
+                    'participant': (team.get('owner_info') or {}).get('name'),
+                    'teamNumber': index + 1,
+                    'participantId': participant_id,
+                    'teamId': f"{participant_id}T{index + 1}"
+                })
+
+    empty_distribution = {'generation': 0, 'evaluation': 0, 'feedback': 0, 'request': 0, 'total': 0}
+    analysis_data = {
+        'participantTeams': {name: [parsed_team.team['team_id'] for parsed_team in teams]
+                             for name, teams in participant_teams.items()},
+        'totalTeams': len(parsed_teams),
+        'totalParticipants': len(participant_teams)
+    }
+    for name in ('teamSizes', 'ideas', 'newIdeas', 'updatedIdeas', 'ideaPerAgent', 'chats'):
+        analysis_data[name] = _stats_for_all_teams(collected[name])
+    analysis_data['roles'] = {key: {name: calculate_stats(values) for name, values in roles[key].items()}
+                              for key in TEAM_KEYS}
+    for name in ('userIdeas', 'userEvaluations', 'userFeedbacks', 'userRequests'):
+        analysis_data[name] = _stats_for_all_teams(user_activity_stats[name])
+    for name in ('userPerAgentIdeas', 'userPerAgentEvaluations', 'userPerAgentFeedbacks', 'userPerAgentRequests',
+                 'evaluationPerAgent', 'feedbackPerAgent', 'requestPerAgent'):
+        analysis_data[name] = _stats_for_all_teams(collected[name])
+    # JS 쪽에서도 채우지 않는 0 초기값 구조
+    analysis_data['roleDistribution'] = {key: {group: dict(empty_distribution)
+                                               for group in ('total', 'agents', 'users')} for key in TEAM_KEYS}
+    analysis_data['feedbackRoleAnalysis'] = feedback_role_analysis
+    analysis_data['requestRoleAnalysis'] = request_role_analysis
+    analysis_data['sharedMentalModel'] = _stats_for_all_teams(collected['sharedMentalModel'])
+    analysis_data['mentalModelDetails'] = mental_model_details
+    analysis_data['participantMentalModelChanges'] = analyze_mental_model_changes(participant_teams)
+    analysis_data['personalityData'] = calculate_personality_data(participant_teams, user_counts)
+    analysis_data['centralizedActivityStats'] = activity_stats
+    analysis_data['userProfileCompleteness'] = profile_completeness
+    return analysis_data
+
+def select_dashboard_teams(teams_list, max_participants=12, max_team_number=3):
+    """
+    tdv App.js와 같은 방식으로 대시보드에 표시할 팀을 고르는 함수
+    평가가 있는 팀만 owner 등장 순서로 번호를 매겨 P1~P12의 첫 3개 팀을 (displayNumber, team) 목록으로 반환한다.
+    """
+    owner_groups = {}
+    selected = []
+    for team in teams_list:
+        if not team.get('evaluations'):
+            continue
+        owner_name = (team.get('owner_info') or {}).get('name') or 'Unknown'
+        group = owner_groups.setdefault(owner_name, {'count': 0, 'participant_number': len(owner_groups) + 1})
+        group['count'] += 1
+        if group['participant_number'] <= max_participants and group['count'] <= max_team_number:
+            selected.append((f"P{group['participant_number']}_team#{group['count']}", team))
+    return selected
+
+def build_analysis_summary(teams_list, source='structured_teams.json'):
+    """structured_teams.json 형태의 팀 리스트로 analysis_summary.json 내용을 만드는 함수 (chat/ideas/members는 팀마다 한 번만 디코딩)"""
+    dashboard_teams = select_dashboard_teams(teams_list)
+    parsed_teams = [ParsedTeam(team) for _, team in dashboard_teams]
+
+    activity_stats = calculate_team_activity_stats(parsed_teams)
+    user_activity_stats = calculate_user_activity_stats(parsed_teams)
+    user_counts = count_all_users(parsed_teams)
+    profile_completeness = calculate_user_profile_completeness(parsed_teams, user_counts)
+
+    per_team = {}
+    for team_index, parsed_team in enumerate(parsed_teams):
+        team = parsed_team.team
+        per_team[team['team_id']] = {
+            'teamKey': get_team_key(team, team_index),
+            'ideaCount': len(team.get('ideas') or []),
+            'evaluationCount': sum(len(_idea_evaluations(idea)) for idea in parsed_team.ideas),
+            'chatCount': len(team.get('chat') or []),
+            'chatMessageCounts': count_chat_messages(parsed_team),
+            'roleCounts': extract_role_counts(parsed_team)
+        }
+
+    return {
+        'schemaVersion': SUMMARY_SCHEMA_VERSION,
+        'createdAt': datetime.now().isoformat(timespec='seconds'),
+        'source': source,
+        'teams': [{'team_id': team['team_id'], 'teamName': team['team_info'].get('teamName'),
+                   'participant': (team.get('owner_info') or {}).get('name'), 'displayNumber': display_number}
+                  for display_number, team in dashboard_teams],
+        'perTeam': per_team,
+        'analysisData': build_analysis_data(parsed_teams, user_activity_stats, activity_stats, user_counts,
+                                            profile_completeness),
+        'centralizedActivityStats': activity_stats,
+        'statsSummary': generate_stats_summary(activity_stats),
+        'userActivityStats': user_activity_stats,
+        'userCounts': user_counts,
+        'userProfileCompleteness': profile_completeness
+    }
+
+def write_analysis_summary(teams_list, path=ANALYSIS_SUMMARY_PATH):
+    """analysis_summary.json을 압축 형식으로 저장하고 요약 dict를 반환하는 함수"""
+    summary = build_analysis_summary(teams_list)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, separators=(',', ':'))
+    return summary
+
+if __name__ == "__main__":
+    with open('structured_teams.json', 'r', encoding='utf-8') as f:
+        teams_list = json.load(f)
+    summary = write_analysis_summary(teams_list)
+    print(f"{len(summary['teams'])}개 팀의 분석 요약을 {ANALYSIS_SUMMARY_PATH}에 저장했습니다.")
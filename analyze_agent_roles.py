@@ -1,10 +1,15 @@
+import argparse
 import json
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
 import pandas as pd
 import numpy as np
 from collections import defaultdict, Counter
 from typing import Dict, List, Tuple
 from scipy import stats
+from instrumentation import add_profile_arguments, configure_from_args, print_summary, span, write_report
+from team_index import build_owner_index, get_participant_teams
+from team_structure import build_structure_table
 
 def load_teams_data():
     """structured_teams.json 파일을 로드하는 함수"""
@@ -22,47 +27,15 @@ def get_unique_owners(teams):
         owners[owner_id] = owner_name
     return owners
 
-def filter_teams_by_participants(teams, selected_participants: List[str], max_teams_per_person: int = 3):
+def filter_teams_by_participants(teams, selected_participants: List[str], max_teams_per_person: int = 3, owner_index=None):
     """선택된 참가자들의 최대 3개 팀만 필터링하는 함수 (실제 에이전트 존재 확인)"""
-    filtered_teams = []
-    participant_counts = defaultdict(int)
-    
-    # 참가자 이름으로 매핑
-    name_to_id = {}
-    for team in teams:
-        owner_info = team.get('owner_info', {})
-        owner_id = owner_info.get('id', 'Unknown')
-        owner_name = owner_info.get('name', 'Unknown')
-        name_to_id[owner_name] = owner_id
+    # 에이전트가 실제로 존재하는 팀만으로 owner 인덱스 구성 (정렬 및 박유빈 예외 처리 포함)
+    if owner_index is None:
+        owner_index = build_owner_index(teams, require_agents=True)
     
-    # 참가자별로 팀들을 먼저 수집
-    teams_by_participant = defaultdict(list)
-    for team in teams:
-        owner_info = team.get('owner_info', {})
-        owner_name = owner_info.get('name', 'Unknown')
-        
-        if owner_name in selected_participants:
-            # 실제 에이전트가 존재하는지 확인
-            agents = team.get('agents', [])
-            if len(agents) > 0:  # 에이전트가 실제로 존재하는 팀만
-                teams_by_participant[owner_name].append(team)
-    
-    # 각 참가자별로 팀 정렬 및 선택
+    filtered_teams = []
     for participant_name in selected_participants:
-        participant_teams = teams_by_participant[participant_name]
-        if len(participant_teams) == 0:
-            continue
-            
-        # 생성 시간순으로 정렬
-        participant_teams.sort(key=lambda x: x.get('team_info', {}).get('createdAt', ''))
-        
-        # 박유빈의 경우 2번째 팀 제외
-        if participant_name == "박유빈" and len(participant_teams) >= 4:
-            selected_teams = [participant_teams[0]] + participant_teams[2:5]  # 1,3,4번째 팀
-        else:
-            selected_teams = participant_teams[:max_teams_per_person]
-        
-        filtered_teams.extend(selected_teams)
+        filtered_teams.extend(get_participant_teams(owner_index, participant_name, max_teams_per_person))
     
     return filtered_teams
 
@@ -95,8 +68,8 @@ def get_user_roles(team):
     
     return []
 
-def calculate_team_averages(teams_by_participant):
-    """참가자별 팀들의 평균 역할 수를 계산하는 함수 (사용자 역할 포함/제외 분석)"""
+def calculate_team_averages(teams_by_participant, structure_table=None):
+    """참가자별 팀들의 평균 역할 수를 계산하는 함수 (사용자 역할 포함/제외 분석, structure_table이 있으면 구조 지표 포함)"""
     results = {}
     role_types = ["아이디어 생성하기", "아이디어 평가하기", "피드백하기", "요청하기"]
     
@@ -136,7 +109,8 @@ def calculate_team_averages(teams_by_participant):
                     'user_roles': user_roles,
                     'roles_per_agent': roles_per_agent,
                     'role_assignment_counts': role_assignment_counts,
-                    'role_counts': role_counts
+                    'role_counts': role_counts,
+                    'structure': structure_table.get(team['team_id']) if structure_table else None
                 })
         
         results[participant] = participant_results
@@ -241,7 +215,8 @@ def visualize_role_changes(results):
             team_data[team_num].append(team['avg_roles_per_agent'])
     
     box_data = [team_data[i] for i in [1, 2, 3]]
-    bp = ax4.boxplot(box_data, labels=['Team 1', 'Team 2', 'Team 3'], patch_artist=True)
+    bp = ax4.boxplot(box_data, patch_artist=True)
+    ax4.set_xticklabels(['Team 1', 'Team 2', 'Team 3'])
     
     # 박스플롯 색상 설정
     colors_box = ['#FFE5E5', '#E5F9F6', '#E5F3FF']
@@ -575,6 +550,48 @@ def print_total_role_analysis(results):
     print("  .   p < 0.1   (경향성)")
     print("      p ≥ 0.1   (유의하지 않음)")
 
+def print_structure_analysis(results):
+    """관계 그래프 구조 지표(깊이, 통솔 범위, 밀도 등)의 팀 번호별 변화 추이 분석"""
+    print(f"\n🕸️ 조직 구조 지표 변화 추이:")
+    print("="*60)
+    
+    metric_names = {
+        'hierarchy_depth': '위계 깊이',
+        'max_span': '최대 통솔 범위',
+        'mean_span': '평균 통솔 범위',
+        'density': '연결 밀도',
+        'reciprocity': '상호성',
+        'leader_centrality': '리더 중심성',
+        'user_centrality': "'나' 중심성",
+        'user_is_hub': "'나' 허브 비율"
+    }
+    
+    # 참가자별로 팀 번호 → 지표 값 (대응 표본 검정을 위해 참가자 단위로 보관)
+    for metric, label in metric_names.items():
+        values_by_participant = {}
+        for participant, teams in results.items():
+            values = {team['team_number']: team['structure'][metric] for team in teams
+                      if team.get('structure') and team['structure'][metric] is not None}
+            if values:
+                values_by_participant[participant] = values
+        if not values_by_participant:
+            continue
+        
+        team_numbers = sorted({team_num for values in values_by_participant.values() for team_num in values})
+        averages = [np.mean([float(values[team_num]) for values in values_by_participant.values() if team_num in values])
+                    for team_num in team_numbers]
+        print(f"\n📌 {label}: " + " → ".join(f"Team {team_num} {avg:.2f}" for team_num, avg in zip(team_numbers, averages)))
+        
+        # Team 1 → 마지막 팀 대응 표본 t-검정 (두 팀 모두 값이 있는 참가자만)
+        if len(team_numbers) >= 2:
+            first, last = team_numbers[0], team_numbers[-1]
+            paired = [(float(values[first]), float(values[last])) for values in values_by_participant.values()
+                      if first in values and last in values]
+            if len(paired) > 1 and any(a != b for a, b in paired):
+                t_stat, p_value = stats.ttest_rel([b for _, b in paired], [a for a, _ in paired])
+                print(f"  Team {first} → {last}: 평균 변화 {np.mean([b - a for a, b in paired]):+.2f} "
+                      f"(참여자 {len(paired)}명, p={p_value:.3f}){get_significance_stars(p_value)}")
+
 def get_significance_stars(p_value):
     """p-value에 따른 유의성 표시를 반환하는 함수"""
     if p_value < 0.001:
@@ -588,8 +605,8 @@ def get_significance_stars(p_value):
     else:
         return ""
 
-def visualize_statistics(results):
-    """통계 결과를 그래프로 시각화하는 함수"""
+def visualize_statistics(results, show=True):
+    """통계 결과를 그래프로 시각화하는 함수 (show=False면 창을 띄우지 않고 그림 반환)"""
     fig, axes = plt.subplots(2, 3, figsize=(18, 12))
     fig.suptitle('에이전트 역할 할당 변화 통계 분석', fontsize=16, fontweight='bold')
     
@@ -748,16 +765,27 @@ def visualize_statistics(results):
     ax6.legend()
     
     plt.tight_layout()
-    plt.show()
+    if show:
+        plt.show()
+    return fig
+
+def save_report(results, report_path):
+    """역할 변화/통계 그림을 별도 창 대신 하나의 다중 페이지 PDF로 저장하는 함수"""
+    with PdfPages(report_path) as pdf:
+        for fig in (visualize_role_changes(results), visualize_statistics(results, show=False)):
+            pdf.savefig(fig, bbox_inches='tight')
+            plt.close(fig)
+    print(f"\n분석 리포트 저장 완료: {report_path}")
 
-def main():
-    """메인 실행 함수"""
+def main(report_path=None, all_participants=False):
+    """메인 실행 함수 (report_path를 지정하면 그림을 PDF 리포트로 저장, all_participants면 모든 참가자 분석)"""
     # 한글 폰트 설정
     plt.rcParams['font.family'] = ['Arial Unicode MS', 'AppleGothic', 'Malgun Gothic', 'DejaVu Sans']
     plt.rcParams['axes.unicode_minus'] = False
     
     # 데이터 로드
-    teams = load_teams_data()
+    with span('load'):
+        teams = load_teams_data()
     
     # 고유한 참가자 목록 확인
     owners = get_unique_owners(teams)
@@ -781,36 +809,56 @@ def main():
         "홍가영",    # 12
     ]
     
+    # 팀 필터링 (참가자별 최대 3개 팀, 팀 번호순으로 정렬된 owner 인덱스 사용)
+    owner_index = build_owner_index(teams, require_agents=True)
+    # 관계 그래프 구조 지표는 전체 팀에 대해 한 번에 계산 (팀 id → 지표 행)
+    structure_table = build_structure_table(teams, owner_index)
+    
+    # 합성 데이터 등 다른 참가자 집합은 인덱스에서 3개 팀을 모두 가진 참가자를 사용 (대응 표본 검정)
+    if all_participants:
+        selected_participants = [name for name, participant_teams in owner_index.items() if len(participant_teams) >= 3]
+    
     print(f"\n선택된 참가자: {selected_participants}")
     
-    # 팀 필터링 (참가자별 최대 3개 팀)
-    filtered_teams = filter_teams_by_participants(teams, selected_participants, max_teams_per_person=3)
+    filtered_teams = filter_teams_by_participants(teams, selected_participants, max_teams_per_person=3, owner_index=owner_index)
     
     # 참가자별로 팀 그룹화
-    teams_by_participant = defaultdict(list)
-    for team in filtered_teams:
-        owner_name = team.get('owner_info', {}).get('name', 'Unknown')
-        teams_by_participant[owner_name].append(team)
-    
-    # 팀 번호순으로 정렬
-    for participant in teams_by_participant:
-        teams_by_participant[participant] = sorted(
-            teams_by_participant[participant], 
-            key=lambda x: x.get('team_info', {}).get('createdAt', '')
-        )
+    teams_by_participant = {}
+    for participant in selected_participants:
+        participant_teams = get_participant_teams(owner_index, participant, max_teams=3)
+        if participant_teams:
+            teams_by_participant[participant] = participant_teams
     
     print(f"\n필터링된 팀 수: {len(filtered_teams)}개")
     for participant, teams in teams_by_participant.items():
         print(f"  - {participant}: {len(teams)}개 팀")
     
     # 역할 분석 수행
-    results = calculate_team_averages(teams_by_participant)
-    
-    # 전체 통계만 출력
-    print_overall_statistics(results)
+    with span('statistics'):
+        results = calculate_team_averages(teams_by_participant, structure_table)
+        
+        # 전체 통계만 출력
+        print_overall_statistics(results)
+        print_structure_analysis(results)
     
     # 통계 결과 그래프로 시각화
-    visualize_statistics(results)
+    with span('figures'):
+        if report_path:
+            save_report(results, report_path)
+        else:
+            visualize_statistics(results)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='참가자별 에이전트 역할 변화 분석')
+    parser.add_argument('--report', help='그래프 창 대신 저장할 다중 페이지 PDF 경로')
+    parser.add_argument('--all-participants', action='store_true',
+                        help='선택된 12명 대신 모든 참가자 분석 (합성 데이터셋 등)')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    configure_from_args(args)
+    main(report_path=args.report, all_participants=args.all_participants)
+    
+    print_summary()
+    report_path = write_report()
+    if report_path:
+        print(f"계측 리포트 저장: {report_path}")
@@ -1,7 +1,14 @@
+import argparse
 import json
 import csv
 import shutil
 import os
+from agent_memory import AGENT_LONG_TERM_PATH, load_snapshot_with_memory, write_long_term_by_team
+from analysis_summary import ANALYSIS_SUMMARY_PATH, write_analysis_summary
+from feedback_sessions import build_feedback_session_index
+from instrumentation import add_profile_arguments, configure_from_args, print_summary, span, write_report
+from records import Agent, ChatEvent, Idea, Member, Team, record_to_json
+from snapshot import find_snapshot_path
 
 def get_agent_info(data, agent_id):
     """특정 agent의 상세 정보를 가져오는 함수"""
@@ -44,16 +51,35 @@ def get_user_info(data, user_id):
         return user_info
     return None
 
-def analyze_redis_data():
+def analyze_redis_data(as_records=False, with_memory=False):
     """
-    redis.json에서 team 데이터를 분석하고 구조화된 데이터를 생성하는 함수
+    redis.json(없으면 redis.jsonl)에서 team 데이터를 분석하고 구조화된 데이터를 생성하는 함수
     team:team__* 패턴의 hash 데이터와 해당 팀의 idea, chat 데이터를 연결
+    as_records=True이면 팀/멤버/agent/chat/idea를 records.py의 slot 레코드로 만든다 (dict처럼 접근 가능)
+    with_memory=True이면 (teams, AgentMemoryStore)를 반환하여 agent 메모리를 필요할 때 읽을 수 있게 한다.
     """
-    with open('redis.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # agent 메모리(new_agent_memory:*)는 디코딩하지 않고 오프셋만 기록하며 로드
+    with span('load'):
+        data, memory_store = load_snapshot_with_memory(find_snapshot_path())
     
     teams = {}
     
+    # 피드백 세션을 teamId 기준으로 인덱싱 (원문 대신 세션별 지표만 보관)
+    with span('index'):
+        feedback_session_index = build_feedback_session_index(data)
+    
+    with span('team_assembly'):
+        _assemble_teams(data, teams, feedback_session_index, as_records)
+    
+    if with_memory:
+        return teams, memory_store
+    return teams
+
+def _assemble_teams(data, teams, feedback_session_index, as_records=False):
+    """snapshot의 team hash마다 agent/owner 정보, ideas, chat, 피드백 세션 지표를 모아 teams에 채우는 함수"""
+    # 레코드 모드에서는 여러 팀에 속한 agent의 레코드를 하나만 만들어 공유
+    agent_records = {}
+    
     # team:team_* 패턴의 키들을 찾아서 처리 (team__ 와 team_ 모두 포함)
     for key, value in data.items():
         if key.startswith('team:team_') and key.count(':') == 1:  # 기본 팀 정보 (team:team_xxx 형태만)
@@ -76,13 +102,19 @@ def analyze_redis_data():
                             # A, B, C, D, E 순서로 node_key 할당
                             node_key = chr(65 + agent_counter)  # 65는 'A'의 ASCII 코드
                             
-                            agent_data = {
-                                'agentId': agent_id,
-                                'node_key': node_key,
-                                'roles': member.get('roles', []),
-                                'isLeader': member.get('isLeader', False),
-                                'agent_info': agent_info
-                            }
+                            if as_records:
+                                if agent_info is not None and agent_id not in agent_records:
+                                    agent_records[agent_id] = Agent.from_dict(agent_info)
+                                agent_data = Member(agent_id, node_key, tuple(member.get('roles', [])),
+                                                    member.get('isLeader', False), agent_records.get(agent_id))
+                            else:
+                                agent_data = {
+                                    'agentId': agent_id,
+                                    'node_key': node_key,
+                                    'roles': member.get('roles', []),
+                                    'isLeader': member.get('isLeader', False),
+                                    'agent_info': agent_info
+                                }
                             agents.append(agent_data)
                             agent_counter += 1
                 
@@ -103,7 +135,8 @@ def analyze_redis_data():
                     'owner_info': owner_info,
                     'agents': agents,
                     'ideas': [],
-                    'chat': []
+                    'chat': [],
+                    'feedback_sessions': feedback_session_index.get(team_id, [])
                 }
                 
                 # 해당 팀의 ideas 데이터 찾기
@@ -115,8 +148,12 @@ def analyze_redis_data():
                 chat_key = f"team:{team_id}:chat"
                 if chat_key in data and data[chat_key]['type'] == 'list':
                     teams[team_id]['chat'] = data[chat_key]['value']
-    
-    return teams
+                
+                if as_records:
+                    team_data = teams[team_id]
+                    team_data['ideas'] = [Idea.from_json(idea) for idea in team_data['ideas']]
+                    team_data['chat'] = [ChatEvent.from_json(message) for message in team_data['chat']]
+                    teams[team_id] = Team.from_dict(team_data, team_id)
 
 
 def load_evaluation_data():
@@ -185,9 +222,8 @@ def map_evaluations_to_teams(teams_list, evaluations):
     
     return teams_list
 
-if __name__ == "__main__":
-    teams = analyze_redis_data()
-    
+def build_teams_list(teams):
+    """analyze_redis_data 결과를 createdAt 순으로 정렬된 팀 리스트로 변환하는 함수"""
     # 팀 데이터를 리스트 형태로 변환
     teams_list = []
     for team_id, team_data in teams.items():
@@ -201,6 +237,7 @@ if __name__ == "__main__":
             'agents': team_data['agents'],
             'ideas': team_data['ideas'],
             'chat': team_data['chat'],
+            'feedback_sessions': team_data['feedback_sessions'],
             'created_at': created_at
         }
         teams_list.append(team_entry)
@@ -212,20 +249,51 @@ if __name__ == "__main__":
     for team in teams_list:
         del team['created_at']
     
+    return teams_list
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='redis.json 분석 및 structured_teams.json 생성')
+    parser.add_argument('--records', action='store_true',
+                        help='팀 데이터를 slot 레코드로 로드 (큰 snapshot에서 메모리는 약 12%% 적지만 로드가 더 느림)')
+    parser.add_argument('--memory', action='store_true',
+                        help=f'팀별 agent longTerm relation/knowledge를 {AGENT_LONG_TERM_PATH}에 저장')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    configure_from_args(args)
+    
+    teams, memory_store = analyze_redis_data(as_records=args.records, with_memory=True)
+    with span('team_list'):
+        teams_list = build_teams_list(teams)
+    
     # 평가 데이터 로드 및 매핑
-    evaluations = load_evaluation_data()
-    teams_list = map_evaluations_to_teams(teams_list, evaluations)
+    with span('evaluation_mapping'):
+        evaluations = load_evaluation_data()
+        teams_list = map_evaluations_to_teams(teams_list, evaluations)
     
     # 최종 데이터 저장
-    with open('structured_teams.json', 'w', encoding='utf-8') as f:
-        json.dump(teams_list, f, ensure_ascii=False, indent=2)
+    with span('json_write'):
+        with open('structured_teams.json', 'w', encoding='utf-8') as f:
+            json.dump(teams_list, f, ensure_ascii=False, indent=2, default=record_to_json)
     
     print(f"총 {len(teams_list)}개 팀 데이터를 structured_teams.json에 저장했습니다.")
     
+    # agent 메모리는 요청했을 때만 longTerm 부분만 읽어 팀별로 저장
+    if args.memory:
+        with span('agent_memory'):
+            agent_count = write_long_term_by_team(memory_store, teams_list)
+        print(f"agent {agent_count}명의 longTerm 메모리를 {AGENT_LONG_TERM_PATH}에 저장했습니다.")
+    
+    # 대시보드 집계를 미리 계산하여 저장
+    with span('analysis_summary'):
+        summary = write_analysis_summary(teams_list)
+    print(f"대시보드 {len(summary['teams'])}개 팀의 분석 요약을 {ANALYSIS_SUMMARY_PATH}에 저장했습니다.")
+    
     # tdv 프로젝트가 있으면 복사
     if os.path.exists('tdv/src'):
-        shutil.copy2('structured_teams.json', 'tdv/src/structured_teams.json')
-        print("structured_teams.json을 tdv/src/에 복사했습니다.")
+        with span('tdv_copy'):
+            shutil.copy2('structured_teams.json', 'tdv/src/structured_teams.json')
+            shutil.copy2(ANALYSIS_SUMMARY_PATH, f"tdv/src/{ANALYSIS_SUMMARY_PATH}")
+        print(f"structured_teams.json, {ANALYSIS_SUMMARY_PATH}을 tdv/src/에 복사했습니다.")
     
     # 각 팀별 데이터 요약 출력
     for i, team in enumerate(teams_list, 1):
@@ -236,11 +304,17 @@ if __name__ == "__main__":
         chat_count = len(team['chat'])
         agents_count = len(team['agents'])
         eval_count = len(team['evaluations'])
-        print(f"- 팀 {i}: {team_id} ({team_name}) [소유자: {owner_name}]: agents {agents_count}개, ideas {ideas_count}개, chat {chat_count}개, 평가 {eval_count}개")
+        session_count = len(team['feedback_sessions'])
+        print(f"- 팀 {i}: {team_id} ({team_name}) [소유자: {owner_name}]: agents {agents_count}개, ideas {ideas_count}개, chat {chat_count}개, 평가 {eval_count}개, 피드백 세션 {session_count}개")
         
         # 각 팀의 agent 리스트 출력
         for agent in team['agents']:
             leader_mark = " (리더)" if agent['isLeader'] else ""
             agent_name = agent['agent_info'].get('name', 'Unknown') if agent['agent_info'] else 'Unknown'
             agent_professional = agent['agent_info'].get('professional', '') if agent['agent_info'] else ''
-            print(f"  └ {agent['agentId']}{leader_mark} ({agent_name} - {agent_professional}): {', '.join(agent['roles'])}")
\ No newline at end of file
+            print(f"  └ {agent['agentId']}{leader_mark} ({agent_name} - {agent_professional}): {', '.join(agent['roles'])}")
+    
+    print_summary()
+    report_path = write_report()
+    if report_path:
+        print(f"계측 리포트 저장: {report_path}")
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from team_structure import build_adjacency
+
+LAYOUT_CACHE_PATH = 'layout_cache.json'
+NODE_SPACING = 200.0      # 그래프 거리 1에 해당하는 이상적인 간격 (nodePositions 좌표 단위)
+LEVEL_GAP = 180.0         # SUPERVISOR 계층 사이 세로 간격
+MIN_DISTANCE = 50.0       # 이보다 가까운 좌표는 겹친 것으로 보고 다시 배치 (노드 반지름 25 x 2)
+HIERARCHY_WEIGHT = 4.0    # 세로 좌표를 계층 위치로 당기는 강도 (stress 가중치 합 대비)
+ITERATIONS = 200
+MARGIN = 50.0
+SEED = 0
+LAYOUT_VERSION = 1
+
+_layout_cache = None
+
+def load_layout_cache(cache_path=LAYOUT_CACHE_PATH):
+    """팀 fingerprint → 자동 배치 좌표 캐시를 (한 번만) 불러오는 함수"""
+    global _layout_cache
+    if _layout_cache is None:
+        _layout_cache = {}
+        if os.path.exists(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                _layout_cache = json.load(f)
+    return _layout_cache
+
+def save_layout_cache(cache_path=LAYOUT_CACHE_PATH):
+    """메모리 캐시를 파일로 저장하는 함수 (불러온 적이 없으면 아무것도 하지 않음)"""
+    if _layout_cache is not None:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(_layout_cache, f, ensure_ascii=False)
+
+def parse_node_positions(team):
+    """team_info.nodePositions 문자열을 {노드: (x, y)}로 파싱하는 함수 (잘못된 값은 무시)"""
+    try:
+        raw = json.loads((team.get('team_info') or {}).get('nodePositions') or '{}')
+    except json.JSONDecodeError:
+        return {}
+    positions = {}
+    for node, pos in (raw if isinstance(raw, dict) else {}).items():
+        try:
+            positions[node] = (float(pos['x']), float(pos['y']))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return positions
+
+def find_fixed_nodes(nodes, positions):
+    """
+    저장된 좌표 중 그대로 쓸 노드를 고르는 함수
+    좌표가 없는 노드와, 앞선 노드와 MIN_DISTANCE보다 가까이 겹친 노드는 자동 배치 대상이 된다.
+    (고정 여부 리스트, 좌표 리스트)를 반환한다.
+    """
+    fixed = []
+    coords = []
+    for node in nodes:
+        pos = positions.get(node)
+        overlaps = pos is not None and any(
+            is_fixed and np.hypot(pos[0] - other[0], pos[1] - other[1]) < MIN_DISTANCE
+            for is_fixed, other in zip(fixed, coords))
+        fixed.append(pos is not None and not overlaps)
+        coords.append(pos if pos is not None else (0.0, 0.0))
+    return fixed, coords
+
+def team_fingerprint(team, nodes):
+    """노드 목록, relationships, nodePositions, 레이아웃 설정으로 만든 팀 fingerprint"""
+    team_info = team.get('team_info') or {}
+    payload = json.dumps([LAYOUT_VERSION, NODE_SPACING, LEVEL_GAP, MIN_DISTANCE, HIERARCHY_WEIGHT, ITERATIONS, nodes,
+                          team_info.get('relationships'), team_info.get('nodePositions')], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def graph_distances(supervisor, peer, node_mask):
+    """팀별 무방향 최단 경로 길이를 batched Floyd-Warshall로 계산하는 함수 (연결되지 않은 쌍은 팀 최대 거리 + 1)"""
+    adjacency = supervisor | peer
+    adjacency = adjacency | adjacency.transpose(0, 2, 1)
+    size = adjacency.shape[1]
+    distances = np.where(adjacency, 1.0, np.inf)
+    distances[:, np.arange(size), np.arange(size)] = 0.0
+    for k in range(size):
+        distances = np.minimum(distances, distances[:, :, k, None] + distances[:, None, k, :])
+    pair_mask = node_mask[:, :, None] & node_mask[:, None, :]
+    finite = np.where(np.isfinite(distances) & pair_mask, distances, 0.0)
+    fallback = finite.max(axis=(1, 2)) + 1
+    return np.where(np.isfinite(distances), distances, fallback[:, None, None])
+
+def hierarchy_levels(supervisor):
+    """SUPERVISOR 간선 기준 각 노드의 계층(상사가 없으면 0, 부하는 상사 계층 + 1 중 최댓값)을 계산하는 함수"""
+    size = supervisor.shape[1]
+    levels = np.zeros(supervisor.shape[:2])
+    for _ in range(size):
+        # levels[j] = max_i (levels[i] + 1) for i → j
+        candidate = np.where(supervisor, levels[:, :, None] + 1, 0).max(axis=1)
+        updated = np.minimum(np.maximum(levels, candidate), size - 1)
+        if np.array_equal(updated, levels):
+            break
+        levels = updated
+    return levels
+
+def stress_layout(distances, levels, node_mask, hierarchical, initial, fixed, iterations=ITERATIONS):
+    """
+    여러 팀의 노드 좌표를 한 번에 최적화하는 함수 (stress majorization, Jacobi 방식 갱신)
+    각 노드를 w_ij = d_ij^-2로 가중한 '이웃 기준 이상 위치'의 평균으로 옮기며,
+    계층이 있고 전부 자동 배치하는 팀은 세로 좌표를 계층 목표 위치 쪽으로 함께 당긴다. 고정 노드는 움직이지 않는다.
+    """
+    size = distances.shape[1]
+    pair_mask = node_mask[:, :, None] & node_mask[:, None, :] & ~np.eye(size, dtype=bool)[None]
+    ideal = distances * NODE_SPACING
+    weights = np.where(pair_mask, 1.0 / np.maximum(ideal, 1e-9) ** 2, 0.0)
+    weight_sum = np.maximum(weights.sum(axis=2), 1e-12)
+    movable = node_mask & ~fixed
+
+    # 계층 목표 y: 위쪽(큰 y)이 상위 계층 (렌더링 축 기준).
+    # 저장 좌표가 일부 남아 있는 팀은 그 배치 방향을 알 수 없으므로 계층 대신 고정 노드와의 거리만 맞춤
+    target_y = (levels.max(axis=1, keepdims=True) - levels) * LEVEL_GAP
+    pull = np.where(hierarchical & ~(fixed & node_mask).any(axis=1), HIERARCHY_WEIGHT, 0.0)[:, None]
+
+    positions = initial.copy()
+    for _ in range(iterations):
+        delta = positions[:, :, None, :] - positions[:, None, :, :]
+        distance = np.maximum(np.linalg.norm(delta, axis=3), 1e-6)
+        proposal = positions[:, None, :, :] + ideal[..., None] * delta / distance[..., None]
+        updated = (weights[..., None] * proposal).sum(axis=2) / weight_sum[..., None]
+        updated[:, :, 1] = (updated[:, :, 1] + pull * target_y) / (1 + pull)
+        positions = np.where(movable[..., None], updated, positions)
+    return positions
+
+def compute_layouts(teams_list):
+    """
+    여러 팀의 좌표를 한 번의 배치 연산으로 채우거나 고치는 함수
+    팀마다 {노드: {'x', 'y'}} (전체 노드 포함)를 반환한다. 저장 좌표가 모두 유효한 팀도 그대로 돌려준다.
+    """
+    if not teams_list:
+        return []
+    supervisor, peer, node_mask, _, node_lists = build_adjacency(teams_list)
+    team_count, size = node_mask.shape
+    fixed = np.zeros((team_count, size), dtype=bool)
+    initial = np.zeros((team_count, size, 2))
+    rng = np.random.RandomState(SEED)
+    levels = hierarchy_levels(supervisor)
+    hierarchical = supervisor.any(axis=(1, 2))
+
+    for team_index, (team, nodes) in enumerate(zip(teams_list, node_lists)):
+        team_fixed, coords = find_fixed_nodes(nodes, parse_node_positions(team))
+        fixed[team_index, :len(nodes)] = team_fixed
+        initial[team_index, :len(nodes)] = coords
+        # 자동 배치 노드의 시작 위치: 고정 노드 중심(없으면 원점) 둘레의 원 + 약간의 흔들림
+        free = [i for i, is_fixed in enumerate(team_fixed) if not is_fixed]
+        center = np.mean([coords[i] for i, is_fixed in enumerate(team_fixed) if is_fixed], axis=0) \
+            if any(team_fixed) else np.zeros(2)
+        for order, node_index in enumerate(free):
+            angle = 2 * np.pi * order / max(len(free), 1)
+            initial[team_index, node_index] = center + NODE_SPACING * np.array([np.cos(angle), np.sin(angle)]) \
+                + rng.uniform(-1, 1, size=2)
+
+    positions = stress_layout(graph_distances(supervisor, peer, node_mask), levels, node_mask, hierarchical,
+                              initial, fixed)
+
+    layouts = []
+    for team_index, nodes in enumerate(node_lists):
+        team_positions = positions[team_index, :len(nodes)]
+        if not fixed[team_index, :len(nodes)].any():
+            # 전부 자동 배치한 팀은 기존 축 범위(-50~)에 맞게 여백만큼 옮김
+            team_positions = team_positions - team_positions.min(axis=0) + MARGIN
+        layouts.append({node: {'x': round(float(x), 2), 'y': round(float(y), 2)}
+                        for node, (x, y) in zip(nodes, team_positions)})
+    return layouts
+
+def needs_layout(team, nodes):
+    """저장 좌표가 없거나, 일부 노드에만 있거나, 겹치는 노드가 있으면 True"""
+    fixed, _ = find_fixed_nodes(nodes, parse_node_positions(team))
+    return not all(fixed)
+
+def prepare_layouts(teams_list):
+    """
+    자동 배치가 필요한 팀들 중 캐시에 없는 팀만 모아 한 번에 계산하고 캐시에 넣는 함수
+    {team_id: 좌표 dict}를 반환한다 (자동 배치가 필요 없는 팀은 포함하지 않음).
+    """
+    cache = load_layout_cache()
+    _, _, _, _, node_lists = build_adjacency(teams_list)
+    results = {}
+    missing = []
+    for team, nodes in zip(teams_list, node_lists):
+        if not needs_layout(team, nodes):
+            continue
+        fingerprint = team_fingerprint(team, nodes)
+        if fingerprint in cache:
+            results[team['team_id']] = cache[fingerprint]
+        else:
+            missing.append((team, fingerprint))
+    for (team, fingerprint), layout in zip(missing, compute_layouts([team for team, _ in missing])):
+        cache[fingerprint] = layout
+        results[team['team_id']] = layout
+    return results
+
+def repair_positions(team_data, positions, layouts=None):
+    """
+    build_team_layout에서 쓰는 좌표 보정 함수
+    좌표가 모두 유효하면 그대로 반환하고, 아니면 (캐시 또는 계산한) 자동 배치 좌표로 채운 dict를 반환한다.
+    여러 팀을 그릴 때는 prepare_layouts(teams) 결과를 layouts로 넘겨 팀마다 다시 계산하지 않고 조회만 한다.
+    """
+    if layouts is None:
+        layouts = prepare_layouts([team_data])
+    layout = layouts.get(team_data['team_id'])
+    return layout if layout is not None else positions
@@ -0,0 +1,111 @@
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+# 상위 디렉토리의 visualize_teams.py 모듈을 import
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from visualize_teams import draw_team_layout
+
+def make_synthetic_layout(node_count, edge_count, seed=0):
+    """노드/관계선 수를 지정한 가상 팀 레이아웃을 만드는 함수 (원형 배치, SUPERVISOR:PEER = 1:2)"""
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(0, 2 * np.pi, node_count, endpoint=False)
+    radius = max(200, node_count * 20)
+    xs = radius + radius * np.cos(angles)
+    ys = radius + radius * np.sin(angles)
+    
+    nodes = []
+    for i in range(node_count):
+        node_type = 'user' if i == 0 else 'agent'
+        nodes.append({
+            'id': '나' if i == 0 else f'N{i}',
+            'x': float(xs[i]),
+            'y': float(ys[i]),
+            'info': {
+                'name': f'Node {i}',
+                'type': node_type,
+                'professional': 'Owner' if i == 0 else 'Agent',
+                'isLeader': i == 1,
+                'has_generation': bool(i % 2),
+                'has_evaluation': bool(i % 3 == 0),
+                'has_feedback': False,
+                'actually_generated': True
+            },
+            'sub_label': '(생성, 평가)'
+        })
+    
+    edges = []
+    node_radius = 35
+    for k in range(edge_count):
+        i, j = rng.choice(node_count, size=2, replace=False)
+        x1, y1, x2, y2 = xs[i], ys[i], xs[j], ys[j]
+        distance = np.hypot(x2 - x1, y2 - y1)
+        unit_x, unit_y = (x2 - x1) / distance, (y2 - y1) / distance
+        edges.append({
+            'type': 'SUPERVISOR' if k % 3 == 0 else 'PEER',
+            'start': (float(x1 + unit_x * node_radius), float(y1 + unit_y * node_radius)),
+            'end': (float(x2 - unit_x * node_radius), float(y2 - unit_y * node_radius))
+        })
+    
+    return {
+        'title': f'Synthetic team ({node_count} nodes, {edge_count} edges)',
+        'nodes': nodes,
+        'edges': edges,
+        'xlim': (-50, float(xs.max()) + 100),
+        'ylim': (-100, float(ys.max()) + 50)
+    }
+
+def time_render(layout, draw_mode, dpi, repeats):
+    """레이아웃을 그리고 PNG로 저장하는 시간(최솟값)과 아티스트 수를 측정하는 함수"""
+    timings = []
+    artist_count = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fig, _ = draw_team_layout(layout, 'generation', draw_mode=draw_mode)
+        fig.savefig(io.BytesIO(), format='png', dpi=dpi, bbox_inches='tight')
+        timings.append(time.perf_counter() - start)
+        artist_count = len(fig.axes[0].get_children())
+        plt.close(fig)
+    return min(timings), artist_count
+
+def run_benchmark(sizes, dpi=100, repeats=3):
+    """노드/관계선 수별로 기존(artist) 방식과 컬렉션 방식의 렌더링 시간을 비교하는 함수"""
+    results = []
+    for node_count, edge_count in sizes:
+        layout = make_synthetic_layout(node_count, edge_count)
+        row = {'nodes': node_count, 'edges': edge_count}
+        for draw_mode in ('artist', 'collection'):
+            seconds, artist_count = time_render(layout, draw_mode, dpi, repeats)
+            row[f'{draw_mode}_seconds'] = seconds
+            row[f'{draw_mode}_artists'] = artist_count
+        row['speedup'] = row['artist_seconds'] / row['collection_seconds']
+        results.append(row)
+        print(f"nodes {node_count:4d}, edges {edge_count:5d}: "
+              f"artist {row['artist_seconds']:.3f}s ({row['artist_artists']} artists) / "
+              f"collection {row['collection_seconds']:.3f}s ({row['collection_artists']} artists) "
+              f"→ x{row['speedup']:.2f}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='팀 네트워크 그림 렌더링 시간 벤치마크 (노드/관계선 수 대비)')
+    parser.add_argument('--sizes', nargs='+', default=['5:10', '20:60', '50:300', '100:1000', '200:3000'],
+                        help='노드수:관계선수 목록')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    args = parser.parse_args()
+    
+    sizes = [tuple(int(value) for value in size.split(':')) for size in args.sizes]
+    results = run_benchmark(sizes, args.dpi, args.repeats)
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,261 @@
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+# 상위 디렉토리의 분석/시각화 모듈을 import
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from analyze_agent_roles import calculate_team_averages, print_overall_statistics
+from analyze_redis import analyze_redis_data, build_teams_list, load_evaluation_data, map_evaluations_to_teams
+from generate_synthetic_data import EVALUATION_CSV_NAME, iter_synthetic_entries, write_evaluation_csv
+from records import record_to_json
+from snapshot import SNAPSHOT_PATH, write_snapshot
+from team_index import build_owner_index, iter_numbered_teams
+from visualize_teams import create_team_network_visualization
+
+# 기본 데이터셋: 실제 snapshot과 같은 규모(40팀) + 확장 규모
+DEFAULT_TEAM_COUNTS = [40, 400]
+
+@contextlib.contextmanager
+def working_directory(path):
+    """분석 스크립트가 현재 폴더의 redis.json/CSV를 읽으므로 잠시 작업 폴더를 바꾸는 context manager"""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+def measure(function, setup=None, repeats=3, trace_memory=True):
+    """
+    단계 하나의 실행 시간(반복 중 최솟값, 초)과 최대 메모리 사용량(MB)을 측정하는 함수
+    setup이 있으면 매 실행 전에 호출하여 인자를 만들고 (측정 시간에서 제외), 메모리는 tracemalloc으로 한 번 더 실행해 측정한다.
+    """
+    timings = []
+    result = None
+    for _ in range(repeats):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        result = function(*args)
+        timings.append(time.perf_counter() - start)
+
+    peak_mb = None
+    if trace_memory:
+        args = setup() if setup else ()
+        tracemalloc.start()
+        function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = peak / 1024 / 1024
+    return min(timings), peak_mb, result
+
+def prepare_dataset(root, team_count, seed=0):
+    """합성 snapshot(redis.json)과 평가 CSV를 root/teams_<N> 폴더에 만드는 함수 (export 단계 측정 포함)"""
+    dataset_dir = os.path.join(root, f"teams_{team_count}")
+    os.makedirs(dataset_dir, exist_ok=True)
+
+    # export: Redis 서버 없이 측정할 수 있도록 snapshot 직렬화(dump_to_json.py의 저장 부분)만 측정
+    evaluation_rows = []
+    entries = list(iter_synthetic_entries(team_count, seed, evaluation_rows=evaluation_rows))
+    start = time.perf_counter()
+    write_snapshot(iter(entries), os.path.join(dataset_dir, SNAPSHOT_PATH))
+    export_seconds = time.perf_counter() - start
+    write_evaluation_csv(evaluation_rows, os.path.join(dataset_dir, EVALUATION_CSV_NAME))
+    return dataset_dir, export_seconds
+
+def count_messages(teams_list):
+    """팀 리스트의 chat 메시지 수를 세는 함수 (messages/s 처리량 계산용)"""
+    return sum(len(team['chat']) for team in teams_list)
+
+def render_teams(numbered_teams, dpi):
+    """팀 그래프를 그려 PNG로 직렬화하는 함수 (파일은 저장하지 않음)"""
+    for participant_name, team_number, team in numbered_teams:
+        fig = create_team_network_visualization(team, 0, team_number)
+        if fig is None:
+            continue
+        fig.savefig(io.BytesIO(), format='png', dpi=dpi, bbox_inches='tight')
+        plt.close(fig)
+
+def print_all_statistics(results):
+    """analyze_agent_roles.py의 통계 출력을 모두 실행하는 함수 (역할별/역할 수/전체 분석까지 이어서 출력, 출력은 버림)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        print_overall_statistics(results)
+
+def benchmark_dataset(dataset_dir, export_seconds, repeats=3, render_limit=30, dpi=100, trace_memory=True):
+    """
+    데이터셋 하나에 대해 파이프라인 단계별 시간/메모리/처리량을 측정하는 함수
+    analyze_redis.py 기본 경로(dict)를 기본 단계로 측정하고,
+    --records 경로(as_records=True, record_to_json 직렬화)도 '(records)' 단계로 함께 측정한다.
+    """
+    rows = []
+
+    with working_directory(dataset_dir):
+        seconds, peak_mb, teams = measure(analyze_redis_data, repeats=repeats, trace_memory=trace_memory)
+        record_seconds, record_peak_mb, record_teams = measure(lambda: analyze_redis_data(as_records=True),
+                                                               repeats=repeats, trace_memory=trace_memory)
+        teams_list = build_teams_list(teams)
+        team_count = len(teams_list)
+        message_count = count_messages(teams_list)
+
+        def add_row(stage, seconds, peak_mb, items=None, messages=None):
+            items = team_count if items is None else items
+            messages = message_count if messages is None else messages
+            rows.append({
+                'stage': stage,
+                'seconds': seconds,
+                'peak_mb': peak_mb,
+                'teams': items,
+                'messages': messages,
+                'teams_per_s': items / seconds if seconds > 0 else None,
+                'messages_per_s': messages / seconds if seconds > 0 else None
+            })
+
+        add_row('export', export_seconds, None)
+        add_row('analyze_redis_data', seconds, peak_mb)
+        add_row('analyze_redis_data (records)', record_seconds, record_peak_mb)
+
+        evaluations = load_evaluation_data()
+        seconds, peak_mb, mapped_teams = measure(map_evaluations_to_teams,
+                                                 setup=lambda: (copy.deepcopy(teams_list), evaluations),
+                                                 repeats=repeats, trace_memory=trace_memory)
+        add_row('map_evaluations_to_teams', seconds, peak_mb)
+        mapped_record_teams = map_evaluations_to_teams(build_teams_list(record_teams), evaluations)
+
+        def write_structured_teams(teams_to_write, default=None):
+            with open('structured_teams.json', 'w', encoding='utf-8') as f:
+                json.dump(teams_to_write, f, ensure_ascii=False, indent=2, default=default)
+
+        # 레코드 경로를 먼저 저장하고, 뒤 단계가 읽을 파일은 기본(dict) 경로 결과로 덮어씀
+        seconds, peak_mb, _ = measure(write_structured_teams, setup=lambda: (mapped_record_teams, record_to_json),
+                                      repeats=repeats, trace_memory=trace_memory)
+        add_row('write_structured_teams (records)', seconds, peak_mb)
+        seconds, peak_mb, _ = measure(write_structured_teams, setup=lambda: (mapped_teams,),
+                                      repeats=repeats, trace_memory=trace_memory)
+        add_row('write_structured_teams', seconds, peak_mb)
+
+        with open('structured_teams.json', 'r', encoding='utf-8') as f:
+            structured_teams = json.load(f)
+        owner_index = build_owner_index(structured_teams, require_agents=True)
+        # 대응 표본 검정을 위해 3개 팀을 모두 가진 참가자만 사용
+        teams_by_participant = {name: participant_teams[:3] for name, participant_teams in owner_index.items()
+                                if len(participant_teams) >= 3}
+        seconds, peak_mb, results = measure(calculate_team_averages, setup=lambda: (teams_by_participant,),
+                                            repeats=repeats, trace_memory=trace_memory)
+        add_row('calculate_team_averages', seconds, peak_mb)
+
+        seconds, peak_mb, _ = measure(print_all_statistics, setup=lambda: (results,),
+                                      repeats=repeats, trace_memory=trace_memory)
+        add_row('print_statistics', seconds, peak_mb)
+
+        # 렌더링은 팀 수에 선형이므로 앞쪽 render_limit개 팀만 측정
+        numbered_teams = list(iter_numbered_teams(build_owner_index(structured_teams)))[:render_limit]
+        seconds, peak_mb, _ = measure(render_teams, setup=lambda: (numbered_teams, dpi),
+                                      repeats=1, trace_memory=trace_memory)
+        add_row('create_team_network_visualization', seconds, peak_mb, items=len(numbered_teams),
+                messages=count_messages([team for _, _, team in numbered_teams]))
+
+    return rows
+
+def compare_with_baseline(current, baseline, tolerance=0.2, min_seconds=0.01):
+    """
+    현재 결과와 baseline 결과를 (데이터셋, 단계)별로 비교하는 함수
+    시간이 baseline보다 tolerance 비율 이상 늘어난 항목을 회귀로 표시하여 비교 행 목록을 반환한다.
+    baseline 시간이 min_seconds보다 짧은 단계는 측정 잡음이 커서 회귀로 판단하지 않는다.
+    """
+    baseline_rows = {(row['dataset'], row['stage']): row for row in baseline['results']}
+    comparisons = []
+    for row in current['results']:
+        base = baseline_rows.get((row['dataset'], row['stage']))
+        if base is None or not base['seconds']:
+            continue
+        ratio = row['seconds'] / base['seconds']
+        comparisons.append({
+            'dataset': row['dataset'],
+            'stage': row['stage'],
+            'baseline_seconds': base['seconds'],
+            'seconds': row['seconds'],
+            'ratio': ratio,
+            'regression': ratio > 1 + tolerance and base['seconds'] >= min_seconds
+        })
+    return comparisons
+
+def run_benchmarks(team_counts=DEFAULT_TEAM_COUNTS, repeats=3, render_limit=30, dpi=100, seed=0,
+                   trace_memory=True, work_dir=None):
+    """데이터셋 크기별로 전체 파이프라인 벤치마크를 실행하고 결과(JSON 직렬화 가능)를 반환하는 함수"""
+    results = []
+    with tempfile.TemporaryDirectory(dir=work_dir) as root:
+        for team_count in team_counts:
+            dataset_dir, export_seconds = prepare_dataset(root, team_count, seed)
+            for row in benchmark_dataset(dataset_dir, export_seconds, repeats, render_limit, dpi, trace_memory):
+                row['dataset'] = f"synthetic_{team_count}"
+                results.append(row)
+                peak = f"{row['peak_mb']:.1f}MB" if row['peak_mb'] is not None else '-'
+                print(f"[{row['dataset']}] {row['stage']:<36} {row['seconds']:8.3f}s  peak {peak:>9}  "
+                      f"{row['teams_per_s'] or 0:10.1f} teams/s  {row['messages_per_s'] or 0:12.1f} messages/s")
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'matplotlib': matplotlib.__version__,
+            'platform': platform.platform(),
+            'repeats': repeats,
+            'render_limit': render_limit,
+            'dpi': dpi,
+            'seed': seed
+        },
+        'results': results
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='파이프라인 단계별 벤치마크 (합성 데이터셋 크기별)')
+    parser.add_argument('--teams', type=int, nargs='+', default=DEFAULT_TEAM_COUNTS, help='데이터셋 팀 수 목록')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--render-limit', type=int, default=30, help='렌더링을 측정할 최대 팀 수')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='tracemalloc 최대 메모리 측정 생략')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    parser.add_argument('--baseline', help='비교할 baseline 결과 JSON 경로')
+    parser.add_argument('--save-baseline', help='이번 결과를 baseline으로 저장할 경로')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='회귀로 판단할 시간 증가 비율 (0.2 = 20%%)')
+    parser.add_argument('--min-seconds', type=float, default=0.01, help='회귀 판단에 사용할 최소 baseline 시간(초)')
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.teams, args.repeats, args.render_limit, args.dpi, args.seed,
+                            trace_memory=not args.no_memory)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        report['comparison'] = compare_with_baseline(report, baseline, args.tolerance, args.min_seconds)
+        print(f"\nbaseline 비교 ({args.baseline}):")
+        for row in report['comparison']:
+            mark = '  ← 회귀' if row['regression'] else ''
+            print(f"[{row['dataset']}] {row['stage']:<36} {row['baseline_seconds']:8.3f}s → {row['seconds']:8.3f}s "
+                  f"(x{row['ratio']:.2f}){mark}")
+        regressions = [row for row in report['comparison'] if row['regression']]
+
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f"결과 저장: {path}")
+
+    if regressions:
+        print(f"\n{len(regressions)}개 단계에서 성능 회귀가 감지되었습니다.")
+        sys.exit(1)
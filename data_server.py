@@ -0,0 +1,342 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from analysis_summary import ANALYSIS_SUMMARY_PATH, build_analysis_summary
+from team_index import build_owner_index, get_owner_name
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# 이보다 작은 응답은 gzip 이득보다 비용이 커서 압축하지 않음
+GZIP_MIN_BYTES = 1024
+RESPONSE_CACHE_SIZE = 256
+
+class BadRequest(ValueError):
+    """잘못된 쿼리 파라미터 (400 응답)"""
+
+class NotFound(LookupError):
+    """없는 경로나 팀 (404 응답)"""
+
+def _decode(item):
+    """chat/ideas 항목(JSON 문자열)을 디코딩하는 함수"""
+    return json.loads(item) if isinstance(item, str) else item
+
+class DatasetSnapshot:
+    """
+    한 번 로드한 structured_teams.json/analysis_summary.json과 그 dataset 버전
+    로드 후에는 바뀌지 않으므로, 요청 하나가 같은 버전의 데이터로 본문과 ETag를 함께 만들 수 있다.
+    """
+
+    def __init__(self, teams, summary, version):
+        self.teams = teams
+        self.teams_by_id = {team['team_id']: team for team in teams}
+        self.summary = summary
+        self.version = version
+
+        # 참가자별 팀 번호 (createdAt 순, 분석 스크립트와 같은 예외 규칙 적용)
+        self.team_numbers = {}
+        for owner_name, owner_teams in build_owner_index(teams).items():
+            for team_number, team in enumerate(owner_teams, 1):
+                self.team_numbers[team['team_id']] = team_number
+
+    def get_team(self, team_id):
+        team = self.teams_by_id.get(team_id)
+        if team is None:
+            raise NotFound(f"팀을 찾을 수 없습니다: {team_id}")
+        return team
+
+    def describe_team(self, team):
+        """목록용 팀 요약 (chat/ideas 본문 제외)"""
+        team_info = team.get('team_info', {})
+        return {
+            'team_id': team['team_id'],
+            'teamName': team_info.get('teamName'),
+            'topic': team_info.get('topic'),
+            'createdAt': team_info.get('createdAt'),
+            'owner': get_owner_name(team),
+            'teamNumber': self.team_numbers.get(team['team_id']),
+            'agentCount': len(team.get('agents', [])),
+            'ideaCount': len(team.get('ideas', [])),
+            'chatCount': len(team.get('chat', [])),
+            'evaluationCount': len(team.get('evaluations', [])),
+            'feedbackSessionCount': len(team.get('feedback_sessions', []))
+        }
+
+    def filter_teams(self, params):
+        """owner/team_id/team_number 쿼리로 팀을 거르는 함수 (같은 이름을 여러 번 주면 OR)"""
+        owners = set(params.get('owner', []))
+        team_ids = set(params.get('team_id', []))
+        team_numbers = {_parse_int(value, 'team_number') for value in params.get('team_number', [])}
+        teams = self.teams
+        if owners:
+            teams = [team for team in teams if get_owner_name(team) in owners]
+        if team_ids:
+            teams = [team for team in teams if team['team_id'] in team_ids]
+        if team_numbers:
+            teams = [team for team in teams if self.team_numbers.get(team['team_id']) in team_numbers]
+        return teams
+
+class TeamDataStore:
+    """
+    structured_teams.json(과 analysis_summary.json)을 메모리에 올려 두고 API 응답을 캐시하는 저장소
+    요청마다 파일 수정 시각을 확인해 바뀌었으면 새 DatasetSnapshot으로 바꾸며, 내용 해시를 dataset 버전(ETag)으로 사용한다.
+    """
+
+    def __init__(self, teams_path='structured_teams.json', summary_path=ANALYSIS_SUMMARY_PATH):
+        self.teams_path = teams_path
+        self.summary_path = summary_path
+        self.lock = threading.Lock()
+        self.loaded_stat = None
+        self.snapshot = None
+        self.cache = OrderedDict()
+
+    def refresh(self):
+        """파일이 바뀌었으면 다시 로드하고 현재 DatasetSnapshot을 반환하는 함수"""
+        stat = os.stat(self.teams_path)
+        summary_mtime = os.stat(self.summary_path).st_mtime_ns if os.path.exists(self.summary_path) else None
+        current = (stat.st_size, stat.st_mtime_ns, summary_mtime)
+        with self.lock:
+            if current != self.loaded_stat:
+                self.snapshot = self._load()
+                self.loaded_stat = current
+                self.cache.clear()
+            return self.snapshot
+
+    def _load(self):
+        with open(self.teams_path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw)
+        teams = json.loads(raw)
+
+        # 미리 계산된 요약이 있으면 사용하고, 없으면 로드한 팀으로 계산
+        summary = None
+        if os.path.exists(self.summary_path):
+            with open(self.summary_path, 'rb') as f:
+                summary_raw = f.read()
+            digest.update(summary_raw)
+            summary = json.loads(summary_raw)
+        if summary is None:
+            summary = build_analysis_summary(teams, source=self.teams_path)
+        return DatasetSnapshot(teams, summary, digest.hexdigest()[:16])
+
+    def get_cached(self, snapshot, key, build):
+        """
+        (dataset 버전, 요청 키)별 응답 본문(bytes)을 LRU 캐시에서 가져오거나 build()로 만드는 함수
+        build는 넘겨받은 snapshot으로 본문을 만들어야 하며, 캐시 키도 그 snapshot의 버전을 쓴다.
+        """
+        cache_key = (snapshot.version, key)
+        with self.lock:
+            if cache_key in self.cache:
+                self.cache.move_to_end(cache_key)
+                return self.cache[cache_key]
+        body = build()
+        with self.lock:
+            # 만드는 동안 다시 로드되었으면 지난 버전 본문은 캐시에 넣지 않음
+            if self.snapshot is snapshot:
+                self.cache[cache_key] = body
+                while len(self.cache) > RESPONSE_CACHE_SIZE:
+                    self.cache.popitem(last=False)
+        return body
+
+def _parse_int(value, name, minimum=None):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise BadRequest(f"{name}은 정수여야 합니다: {value}")
+    if minimum is not None and number < minimum:
+        raise BadRequest(f"{name}은 {minimum} 이상이어야 합니다: {value}")
+    return number
+
+def paginate(items, params):
+    """offset/limit 쿼리로 리스트를 잘라 {total, offset, limit, items} 형태로 반환하는 함수"""
+    offset = _parse_int(params.get('offset', ['0'])[-1], 'offset', minimum=0)
+    limit = min(_parse_int(params.get('limit', [str(DEFAULT_PAGE_SIZE)])[-1], 'limit', minimum=1), MAX_PAGE_SIZE)
+    return {'total': len(items), 'offset': offset, 'limit': limit, 'items': items[offset:offset + limit]}
+
+def resolve_route(snapshot, path):
+    """
+    경로에 해당하는 리소스가 있는지 확인하고, 쿼리로 응답 데이터를 만드는 함수를 반환하는 함수
+    없는 경로/팀/요약 항목이면 NotFound를 일으키므로, 본문을 만들기 전에 존재 여부를 판단할 수 있다.
+    GET /teams                          팀 요약 목록 (owner, team_id, team_number 필터, offset/limit)
+    GET /teams/<id>                     팀 정보/소유자/에이전트/피드백 세션 지표 (chat/ideas 본문 제외)
+    GET /teams/<id>/chat                chat 메시지 (type, sender 필터, offset/limit)
+    GET /teams/<id>/ideas               아이디어 (author 필터, offset/limit)
+    GET /teams/<id>/evaluations         설문 평가 행
+    GET /evaluations                    팀별 설문 평가 (owner, team_id, team_number 필터, offset/limit)
+    GET /summary                        analysis_summary.json 전체
+    GET /summary/<key>                  요약의 최상위 항목 하나 (예: /summary/analysisData)
+    """
+    parts = [unquote(part) for part in path.strip('/').split('/') if part]
+    if parts == ['teams']:
+        return lambda params: paginate([snapshot.describe_team(team) for team in snapshot.filter_teams(params)],
+                                       params)
+    if len(parts) == 2 and parts[0] == 'teams':
+        team = snapshot.get_team(parts[1])
+
+        def team_detail(params):
+            detail = snapshot.describe_team(team)
+            detail.update({key: team.get(key) for key in ('team_info', 'owner_info', 'agents', 'feedback_sessions')})
+            return detail
+        return team_detail
+    if len(parts) == 3 and parts[0] == 'teams' and parts[2] in ('chat', 'ideas', 'evaluations'):
+        team = snapshot.get_team(parts[1])
+        if parts[2] == 'chat':
+            def team_chat(params):
+                messages = [_decode(message) for message in team.get('chat', [])]
+                for field in ('type', 'sender'):
+                    if field in params:
+                        values = set(params[field])
+                        messages = [message for message in messages if message.get(field) in values]
+                return paginate(messages, params)
+            return team_chat
+        if parts[2] == 'ideas':
+            def team_ideas(params):
+                ideas = [_decode(idea) for idea in team.get('ideas', [])]
+                if 'author' in params:
+                    authors = set(params['author'])
+                    ideas = [idea for idea in ideas if idea.get('author') in authors]
+                return paginate(ideas, params)
+            return team_ideas
+        return lambda params: {'team_id': team['team_id'], 'items': team.get('evaluations', [])}
+    if parts == ['evaluations']:
+        return lambda params: paginate([{'team_id': team['team_id'], 'owner': get_owner_name(team),
+                                         'teamNumber': snapshot.team_numbers.get(team['team_id']),
+                                         'evaluations': team.get('evaluations', [])}
+                                        for team in snapshot.filter_teams(params) if team.get('evaluations')],
+                                       params)
+    if parts == ['summary']:
+        return lambda params: snapshot.summary
+    if len(parts) == 2 and parts[0] == 'summary':
+        if parts[1] not in snapshot.summary:
+            raise NotFound(f"요약 항목을 찾을 수 없습니다: {parts[1]}")
+        return lambda params: snapshot.summary[parts[1]]
+    raise NotFound(f"경로를 찾을 수 없습니다: {path}")
+
+def route(snapshot, path, params):
+    """경로와 쿼리로 응답 데이터를 만드는 함수 (경로 목록은 resolve_route 참고)"""
+    return resolve_route(snapshot, path)(params)
+
+def accepts_gzip(header):
+    """Accept-Encoding 헤더에 gzip이 허용되어 있는지 확인하는 함수 (q=0 제외)"""
+    for part in (header or '').split(','):
+        name, _, quality = part.strip().partition(';')
+        if name.strip() in ('gzip', '*'):
+            return quality.strip().replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+def make_etag(version, key, encoding):
+    """dataset 버전과 요청 키로 ETag를 만드는 함수 (본문을 만들지 않고도 304 판단 가능)"""
+    digest = hashlib.sha256(f"{version}\n{key}".encode('utf-8')).hexdigest()[:20]
+    return f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+
+def etag_matches(header, etag):
+    """If-None-Match 헤더가 ETag와 일치하는지 확인하는 함수 (약한 비교, *, 여러 값 지원)"""
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(',')]
+    return '*' in candidates or any(value.removeprefix('W/') == etag for value in candidates)
+
+class DataRequestHandler(BaseHTTPRequestHandler):
+    """팀 데이터 API 요청 처리기 (server.store에 TeamDataStore가 있어야 함)"""
+    server_version = 'CrafTeamData/1.0'
+
+    def do_GET(self):
+        self._handle(send_body=True)
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def _handle(self, send_body):
+        store = self.server.store
+        url = urlsplit(self.path)
+        if url.path.rstrip('/') == '/health':
+            self._send(HTTPStatus.OK, b'{"status":"ok"}', send_body=send_body)
+            return
+        try:
+            snapshot = store.refresh()
+            params = parse_qs(url.query)
+            # 없는 리소스에 304를 주지 않도록 ETag 비교 전에 경로부터 확인 (본문은 아직 만들지 않음)
+            build = resolve_route(snapshot, url.path)
+            # 쿼리 순서가 달라도 같은 리소스로 보도록 정렬한 키 사용
+            key = url.path.rstrip('/') + '?' + '&'.join(f"{name}={value}" for name in sorted(params)
+                                                        for value in sorted(params[name]))
+            encoding = 'gzip' if accepts_gzip(self.headers.get('Accept-Encoding')) else None
+            etag = make_etag(snapshot.version, key, encoding)
+            if etag_matches(self.headers.get('If-None-Match'), etag):
+                self._send(HTTPStatus.NOT_MODIFIED, b'', etag=etag, send_body=False)
+                return
+
+            body = store.get_cached(snapshot, key, lambda: json.dumps(build(params), ensure_ascii=False,
+                                                                      separators=(',', ':')).encode('utf-8'))
+            if encoding and len(body) >= GZIP_MIN_BYTES:
+                plain = body
+                body = store.get_cached(snapshot, ('gzip', key), lambda: gzip.compress(plain, 6))
+            else:
+                encoding = None
+            self._send(HTTPStatus.OK, body, etag=etag, encoding=encoding, send_body=send_body)
+        except BadRequest as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e), send_body)
+        except NotFound as e:
+            self._send_error(HTTPStatus.NOT_FOUND, str(e), send_body)
+        except FileNotFoundError as e:
+            self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, f"데이터 파일이 없습니다: {e.filename}", send_body)
+
+    def _send_error(self, status, message, send_body):
+        body = json.dumps({'error': message}, ensure_ascii=False).encode('utf-8')
+        self._send(status, body, send_body=send_body)
+
+    def _send(self, status, body, etag=None, encoding=None, send_body=True):
+        self.send_response(status)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        if send_body and body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT, teams_path='structured_teams.json',
+                summary_path=ANALYSIS_SUMMARY_PATH, quiet=False):
+    """데이터 서버를 만드는 함수 (데이터는 첫 요청 시 로드)"""
+    server = ThreadingHTTPServer((host, port), DataRequestHandler)
+    server.store = TeamDataStore(teams_path, summary_path)
+    server.quiet = quiet
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='structured_teams.json 로컬 HTTP 데이터 서버')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--teams', default='structured_teams.json', help='팀 데이터 파일 경로')
+    parser.add_argument('--summary', default=ANALYSIS_SUMMARY_PATH, help='분석 요약 파일 경로 (없으면 계산)')
+    parser.add_argument('--quiet', action='store_true', help='요청 로그 출력 생략')
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.teams, args.summary, args.quiet)
+    snapshot = server.store.refresh()
+    print(f"{len(snapshot.teams)}개 팀 데이터 제공 중: http://{args.host}:{args.port}/teams")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,259 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+from scipy import stats
+
+from team_index import get_owner_name
+
+TEAMS_PATH = 'structured_teams.json'
+CACHE_PATH = 'evaluation_roles_cache.json'
+CACHE_VERSIONS = 8
+SLOTS = ['A', 'B', 'C', 'D', 'E', '나']
+ROLE_TYPES = ["아이디어 생성하기", "아이디어 평가하기", "피드백하기", "요청하기"]
+# (코드, 설문 문항) - 팀원별 6문항
+# 팀원 E의 '페르소나 적합' 컬럼은 설문지에서 '페르소나에 어울리게 행동' 문항과 같은 제목으로 잘못 만들어져,
+# DictReader로 읽으면 뒤 컬럼(행동)만 남는다. 따라서 E의 persona_fit은 결측으로 둔다.
+QUESTIONS = [
+    ('role_fit', '팀원에게 적절한 역할이 부여되었다.'),
+    ('role_performance', '이 팀원은 부여된 역할을 잘 수행하였다.'),
+    ('persona_fit', '이 팀원은 맡은 역할에 가장 적합한 페르소나를 지니고 있습니다.'),
+    ('persona_behavior', '이 팀원은 자신의 페르소나에 어울리게 행동했다.'),
+    ('contribution', '이 팀원은 팀 성과에 기여했다'),
+    ('necessity', '이 팀원은 팀에 필요한 존재이다')
+]
+LIKERT_SCORES = {'전혀 그렇지 않다': 1, '매우 그렇지 않다': 1, '그렇지 않다': 2, '보통': 3, '그렇다': 4, '매우 그렇다': 5}
+FEATURES = ROLE_TYPES + ['is_leader', 'is_user', 'role_count']
+# role_count는 역할 플래그의 합이라 회귀에는 넣지 않음
+REGRESSION_TERMS = ['intercept'] + ROLE_TYPES + ['is_leader', 'is_user']
+
+def rating_column(slot, question):
+    """팀원 slot의 문항 question에 해당하는 설문 컬럼명을 반환하는 함수"""
+    member = f"'{slot}'" if slot == '나' else slot
+    return f"팀원 {member}에 대해 답변해주세요. [{question}]"
+
+def slot_features(team):
+    """
+    팀의 slot(A~E, 나)별 역할 구성 벡터를 만드는 함수
+    agent는 node_key로, 사용자는 team_info.members의 isUser 항목으로 slot을 정한다.
+    (slot 수 x FEATURES) 배열과 slot 존재 여부 배열을 반환한다.
+    """
+    features = np.zeros((len(SLOTS), len(FEATURES)))
+    present = np.zeros(len(SLOTS), dtype=bool)
+    members = [(agent.get('node_key'), agent.get('roles') or [], agent.get('isLeader', False), False)
+               for agent in team.get('agents', [])]
+    try:
+        for member in json.loads((team.get('team_info') or {}).get('members', '[]')):
+            if member.get('isUser'):
+                members.append(('나', member.get('roles') or [], member.get('isLeader', False), True))
+    except json.JSONDecodeError:
+        pass
+
+    for node_key, roles, is_leader, is_user in members:
+        if node_key not in SLOTS:
+            continue
+        slot = SLOTS.index(node_key)
+        present[slot] = True
+        flags = [1.0 if role in roles else 0.0 for role in ROLE_TYPES]
+        features[slot] = flags + [float(bool(is_leader)), float(is_user), sum(flags)]
+    return features, present
+
+def build_matrices(teams_list):
+    """
+    평가 x slot x 문항 점수 텐서와 평가 x slot x 역할 구성 텐서를 만드는 함수
+    빈 응답이나 팀에 없는 slot은 nan이다. 평가별 (팀 id, 평가자) 목록도 함께 반환한다.
+    """
+    columns = [[rating_column(slot, question) for _, question in QUESTIONS] for slot in SLOTS]
+    ratings, features, evaluations = [], [], []
+    for team in teams_list:
+        if not team.get('evaluations'):
+            continue
+        team_features, present = slot_features(team)
+        for row in team['evaluations']:
+            scores = np.array([[LIKERT_SCORES.get((row.get(column) or '').strip(), np.nan) for column in slot_columns]
+                               for slot_columns in columns])
+            scores[~present] = np.nan
+            ratings.append(scores)
+            features.append(team_features)
+            evaluations.append((team['team_id'], get_owner_name(team), row.get('몇 번째 팀에 대한 평가인가요?')))
+    shape = (0, len(SLOTS))
+    ratings = np.array(ratings) if ratings else np.empty(shape + (len(QUESTIONS),))
+    features = np.array(features) if features else np.empty(shape + (len(FEATURES),))
+    return ratings, features, evaluations
+
+def _round(value, digits=4):
+    """nan이면 None, 아니면 반올림한 float을 반환하는 함수"""
+    return None if np.isnan(value) else round(float(value), digits)
+
+def correlate(x, y, confidence=0.95):
+    """
+    특징 행렬 x (n x K)와 결측이 있는 점수 행렬 y (n x Q)의 모든 Pearson 상관을 한 번에 계산하는 함수
+    문항마다 응답이 있는 관측만 쓰도록 가중 합으로 계산하고, Fisher z 신뢰구간과 양측 p-value를 함께 반환한다.
+    """
+    valid = ~np.isnan(y)
+    weights = valid.astype(float)
+    y0 = np.where(valid, y, 0.0)
+    n = weights.sum(axis=0)                                   # (Q,)
+    sum_x, sum_xx = x.T @ weights, (x * x).T @ weights        # (K, Q)
+    sum_y, sum_yy = y0.sum(axis=0), (y0 * y0).sum(axis=0)     # (Q,)
+    sum_xy = x.T @ y0                                         # (K, Q)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r = (n * sum_xy - sum_x * sum_y) / np.sqrt((n * sum_xx - sum_x ** 2) * (n * sum_yy - sum_y ** 2))
+        r = np.clip(r, -1.0, 1.0)
+        z = np.arctanh(np.clip(r, -0.999999, 0.999999))
+        half_width = stats.norm.ppf(0.5 + confidence / 2) / np.sqrt(n - 3)
+        ci_low, ci_high = np.tanh(z - half_width), np.tanh(z + half_width)
+        t_value = r * np.sqrt((n - 2) / np.maximum(1 - r ** 2, 1e-12))
+        p_value = 2 * stats.t.sf(np.abs(t_value), n - 2)
+    n = np.broadcast_to(n, r.shape)
+    return {'n': n, 'r': r, 'ci_low': np.where(n > 3, ci_low, np.nan), 'ci_high': np.where(n > 3, ci_high, np.nan),
+            'p': p_value}
+
+def regress(x, y, confidence=0.95):
+    """
+    문항별 OLS 회귀 y_q ~ x (절편 포함)를 한 번에 푸는 함수
+    문항마다 응답이 있는 관측으로 정규방정식 (Q x P x P)을 einsum으로 쌓아 pinv로 풀고,
+    계수, 표준오차, t 신뢰구간, p-value, R²를 반환한다.
+    """
+    valid = ~np.isnan(y)
+    weights = valid.astype(float)
+    y0 = np.where(valid, y, 0.0)
+    design = np.column_stack([np.ones(len(x)), x])
+    n = weights.sum(axis=0)
+    xtx = np.einsum('nq,np,nr->qpr', weights, design, design)
+    xty = np.einsum('nq,np->qp', y0, design)
+    xtx_inv = np.linalg.pinv(xtx)
+    beta = np.einsum('qpr,qr->qp', xtx_inv, xty)
+    residuals = (y0 - design @ beta.T) * weights
+    rank = np.linalg.matrix_rank(xtx)
+    df = n - rank
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sigma2 = (residuals ** 2).sum(axis=0) / df
+        se = np.sqrt(sigma2[:, None] * np.diagonal(xtx_inv, axis1=1, axis2=2))
+        t_value = beta / se
+        p_value = 2 * stats.t.sf(np.abs(t_value), df[:, None])
+        margin = stats.t.ppf(0.5 + confidence / 2, df)[:, None] * se
+        mean_y = y0.sum(axis=0) / n
+        total = (((y0 - mean_y) * weights) ** 2).sum(axis=0)
+        r2 = 1 - (residuals ** 2).sum(axis=0) / total
+    # 자유도가 없는 문항(응답이 거의 없는 문항)은 추정하지 않음
+    undetermined = df <= 0
+    beta, se, margin, p_value = (np.where(undetermined[:, None], np.nan, values) for values in (beta, se, margin, p_value))
+    r2 = np.where(undetermined, np.nan, r2)
+    return {'n': n, 'df': df, 'beta': beta, 'se': se, 'ci_low': beta - margin, 'ci_high': beta + margin,
+            'p': p_value, 'r2': r2}
+
+def dataset_version(teams_path):
+    """입력 파일 내용의 sha256 (캐시 키)"""
+    digest = hashlib.sha256()
+    with open(teams_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def analyze_evaluation_roles(teams_list, confidence=0.95):
+    """
+    평가 점수와 slot 역할 구성을 결합하여 상관/회귀 결과를 계산하는 함수
+    관측 단위는 (평가 1건, 팀에 존재하는 slot 1개)이다. 같은 평가자의 응답끼리 독립이 아니므로 신뢰구간은 참고용이다.
+    """
+    ratings, features, evaluations = build_matrices(teams_list)
+    present = ~np.isnan(ratings).all(axis=2)
+    y = ratings[present]                                      # (관측 수, Q)
+    x = features[present]                                     # (관측 수, K)
+    slot_index = np.nonzero(present)[1]
+
+    questions = [code for code, _ in QUESTIONS]
+    correlation = correlate(x, y, confidence)
+    correlations = []
+    for k, feature in enumerate(FEATURES):
+        for q, question in enumerate(questions):
+            correlations.append({'feature': feature, 'question': question, 'n': int(correlation['n'][k, q]),
+                                 'r': _round(correlation['r'][k, q]),
+                                 'ci_low': _round(correlation['ci_low'][k, q]),
+                                 'ci_high': _round(correlation['ci_high'][k, q]),
+                                 'p': _round(correlation['p'][k, q], 6)})
+
+    regression = regress(x[:, :len(REGRESSION_TERMS) - 1], y, confidence)
+    regressions = []
+    for q, question in enumerate(questions):
+        coefficients = [{'term': term, 'beta': _round(regression['beta'][q, p]), 'se': _round(regression['se'][q, p]),
+                         'ci_low': _round(regression['ci_low'][q, p]), 'ci_high': _round(regression['ci_high'][q, p]),
+                         'p': _round(regression['p'][q, p], 6)}
+                        for p, term in enumerate(REGRESSION_TERMS)]
+        regressions.append({'question': question, 'n': int(regression['n'][q]), 'df': int(regression['df'][q]),
+                            'r2': _round(regression['r2'][q]), 'coefficients': coefficients})
+
+    # slot별 문항 평균 (nan 무시)
+    with np.errstate(invalid='ignore'):
+        slot_counts = np.zeros((len(SLOTS), len(QUESTIONS)))
+        slot_sums = np.zeros((len(SLOTS), len(QUESTIONS)))
+        np.add.at(slot_counts, slot_index, ~np.isnan(y))
+        np.add.at(slot_sums, slot_index, np.nan_to_num(y))
+        slot_means = slot_sums / slot_counts
+    return {
+        'confidence': confidence,
+        'evaluations': len(evaluations),
+        'observations': int(len(y)),
+        'slots': SLOTS,
+        'questions': questions,
+        'features': FEATURES,
+        'slot_means': {slot: {question: _round(slot_means[s, q], 3) for q, question in enumerate(questions)}
+                       for s, slot in enumerate(SLOTS)},
+        'correlations': correlations,
+        'regressions': regressions
+    }
+
+def load_or_compute(teams_path=TEAMS_PATH, cache_path=CACHE_PATH, confidence=0.95, refresh=False):
+    """
+    데이터셋 버전(입력 sha256)과 신뢰수준별로 결과를 캐시하는 함수
+    캐시에 같은 버전이 있으면 다시 계산하지 않는다. (결과, 캐시 사용 여부)를 반환한다.
+    """
+    cache_key = f"{dataset_version(teams_path)}:{confidence}"
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    if not refresh and cache_key in cache:
+        return cache[cache_key], True
+
+    with open(teams_path, 'r', encoding='utf-8') as f:
+        teams_list = json.load(f)
+    result = analyze_evaluation_roles(teams_list, confidence)
+    cache.pop(cache_key, None)
+    cache[cache_key] = result
+    # 최근 버전 몇 개만 유지
+    cache = dict(list(cache.items())[-CACHE_VERSIONS:])
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False)
+    return result, False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='팀원 평가 점수와 역할 구성(역할/리더/사용자)의 상관·회귀 분석')
+    parser.add_argument('--teams', default=TEAMS_PATH)
+    parser.add_argument('--cache', default=CACHE_PATH)
+    parser.add_argument('--confidence', type=float, default=0.95, help='신뢰구간 수준')
+    parser.add_argument('--refresh', action='store_true', help='캐시를 무시하고 다시 계산')
+    parser.add_argument('--alpha', type=float, default=0.05, help='출력할 상관의 p-value 기준')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result, cached = load_or_compute(args.teams, args.cache, args.confidence, args.refresh)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"평가 {result['evaluations']}건, 관측(평가 x slot) {result['observations']}개 "
+          f"({'캐시' if cached else '계산'}, {elapsed_ms:.0f}ms)")
+    print(f"\n유의한 상관 (p < {args.alpha}):")
+    for row in sorted(result['correlations'], key=lambda row: row['p'] if row['p'] is not None else 1):
+        if row['p'] is not None and row['p'] < args.alpha:
+            print(f"- {row['feature']} x {row['question']}: r={row['r']} "
+                  f"[{row['ci_low']}, {row['ci_high']}] p={row['p']} (n={row['n']})")
+    print("\n회귀 (문항 ~ 역할 플래그 + 리더 + 사용자):")
+    for regression in result['regressions']:
+        if regression['r2'] is None:
+            print(f"- {regression['question']} (n={regression['n']}): 응답 부족")
+            continue
+        terms = ', '.join(f"{c['term']} {c['beta']:+.2f}" for c in regression['coefficients'] if c['beta'] is not None)
+        print(f"- {regression['question']} (n={regression['n']}, R²={regression['r2']}): {terms}")
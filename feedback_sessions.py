@@ -0,0 +1,167 @@
+import json
+import numpy as np
+
+FEEDBACK_SESSION_PREFIX = 'feedback_session:'
+
+# 세션 지표 테이블의 컬럼 (팀별로 붙는 행도 같은 키를 사용)
+SESSION_METRIC_COLUMNS = [
+    'session_id', 'team_id', 'status', 'created_at', 'duration_s',
+    'message_count', 'user_message_count', 'agent_message_count', 'participant_count',
+    'turns', 'mean_latency_s', 'median_latency_s', 'max_latency_s',
+    'initiated_by_user', 'ended_by'
+]
+
+def iter_feedback_sessions(data):
+    """snapshot에서 feedback_session:* 레코드를 하나씩 디코딩하여 돌려주는 함수 (만료되어 값이 없는 레코드는 건너뜀)"""
+    for key, value in data.items():
+        if not key.startswith(FEEDBACK_SESSION_PREFIX) or value['type'] != 'string':
+            continue
+        try:
+            yield json.loads(value['value'])
+        except json.JSONDecodeError:
+            continue
+
+def parse_timestamps_ms(timestamps):
+    """ISO 8601 시각 문자열 목록을 epoch 밀리초 int64 배열로 한 번에 변환하는 함수 (값이 없으면 -1)"""
+    values = np.array([timestamp.rstrip('Z') if timestamp else 'NaT' for timestamp in timestamps],
+                      dtype='datetime64[ms]')
+    epoch_ms = values.astype(np.int64)
+    epoch_ms[np.isnat(values)] = -1
+    return epoch_ms
+
+def _group_median(values, group_ids, group_count):
+    """그룹 ID별 중앙값을 정렬 한 번으로 계산하는 함수 (값이 없는 그룹은 nan)"""
+    medians = np.full(group_count, np.nan)
+    if len(values) == 0:
+        return medians
+    order = np.lexsort((values, group_ids))
+    sorted_values = values[order]
+    counts = np.bincount(group_ids, minlength=group_count)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    has_values = counts > 0
+    low = starts[has_values] + (counts[has_values] - 1) // 2
+    high = starts[has_values] + counts[has_values] // 2
+    medians[has_values] = (sorted_values[low] + sorted_values[high]) / 2
+    return medians
+
+def compute_session_metrics(sessions):
+    """
+    피드백 세션 목록(또는 iterator)의 지표를 한 번에 계산하는 함수
+    세션을 하나씩 읽으며 메시지를 (세션 번호, 시각, 발신자) 배열로 펼쳐 두고 원문은 보관하지 않는다.
+    지속 시간, 참가자별 발화 수, 응답 지연(발신자가 바뀌는 연속 메시지 간격), 사용자/에이전트 시작 여부를
+    NumPy 연산으로 계산하여 SESSION_METRIC_COLUMNS 컬럼의 테이블(컬럼명 → 리스트)로 반환한다.
+    """
+    session_ids, team_ids, statuses, ended_bys = [], [], [], []
+    created_at, ended_at = [], []
+    participant_counts, initiated_by_user = [], []
+    participant_names = []
+
+    # 메시지 펼치기 (system 메시지 제외)
+    message_sessions, message_timestamps, message_senders, message_is_user = [], [], [], []
+    sender_codes = {}
+
+    for session_number, session in enumerate(sessions):
+        participants = session.get('participants', [])
+        user_ids = {participant['id'] for participant in participants if participant.get('isUser')}
+        user_ids.add('나')
+
+        session_ids.append(session.get('id'))
+        team_ids.append(session.get('teamId'))
+        statuses.append(session.get('status'))
+        ended_bys.append(session.get('endedBy'))
+        created_at.append(session.get('createdAt'))
+        # 진행 중인 세션은 마지막 활동 시각까지를 지속 시간으로 계산
+        ended_at.append(session.get('endedAt') or session.get('lastActivityAt'))
+        participant_counts.append(len(participants))
+        initiated_by_user.append(session.get('initiatedBy') in user_ids)
+        participant_names.append({participant['id']: participant.get('name', participant['id'])
+                                  for participant in participants})
+
+        for message in session.get('messages', []):
+            if message.get('type') == 'system' or message.get('sender') == 'system':
+                continue
+            sender = message.get('sender')
+            message_sessions.append(session_number)
+            message_timestamps.append(message.get('timestamp'))
+            message_senders.append(sender_codes.setdefault(sender, len(sender_codes)))
+            message_is_user.append(sender in user_ids)
+
+    session_count = len(session_ids)
+    table = {column: [] for column in SESSION_METRIC_COLUMNS}
+    if session_count == 0:
+        return table
+
+    # 세션 지속 시간
+    created_ms = parse_timestamps_ms(created_at)
+    ended_ms = parse_timestamps_ms(ended_at)
+    durations = np.where((created_ms >= 0) & (ended_ms >= 0), (ended_ms - created_ms) / 1000, np.nan)
+
+    # 메시지 수 (전체/사용자/에이전트)
+    msg_session = np.array(message_sessions, dtype=np.int64)
+    msg_ts = parse_timestamps_ms(message_timestamps)
+    msg_sender = np.array(message_senders, dtype=np.int64)
+    msg_is_user = np.array(message_is_user, dtype=bool)
+    message_counts = np.bincount(msg_session, minlength=session_count)
+    user_counts = np.bincount(msg_session, weights=msg_is_user, minlength=session_count).astype(np.int64)
+
+    # 응답 지연: 같은 세션 안에서 발신자가 바뀌는 연속 메시지 사이의 간격
+    order = np.lexsort((msg_ts, msg_session))
+    sorted_session = msg_session[order]
+    sorted_ts = msg_ts[order]
+    sorted_sender = msg_sender[order]
+    is_response = ((sorted_session[1:] == sorted_session[:-1])
+                   & (sorted_sender[1:] != sorted_sender[:-1])
+                   & (sorted_ts[1:] >= 0) & (sorted_ts[:-1] >= 0))
+    latencies = (sorted_ts[1:] - sorted_ts[:-1])[is_response] / 1000
+    latency_sessions = sorted_session[1:][is_response]
+    latency_counts = np.bincount(latency_sessions, minlength=session_count)
+    latency_sums = np.bincount(latency_sessions, weights=latencies, minlength=session_count)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_latencies = np.where(latency_counts > 0, latency_sums / latency_counts, np.nan)
+    median_latencies = _group_median(latencies, latency_sessions, session_count)
+    max_latencies = np.full(session_count, np.nan)
+    if len(latencies):
+        np.fmax.at(max_latencies, latency_sessions, latencies)
+
+    # 참가자별 발화 수: (세션, 발신자) 쌍별 개수
+    sender_names = {code: sender for sender, code in sender_codes.items()}
+    pair_keys = msg_session * max(1, len(sender_codes)) + msg_sender
+    unique_pairs, pair_counts = np.unique(pair_keys, return_counts=True)
+    turns = [{} for _ in range(session_count)]
+    for pair_key, count in zip(unique_pairs.tolist(), pair_counts.tolist()):
+        session_number, sender_code = divmod(pair_key, max(1, len(sender_codes)))
+        sender = sender_names[sender_code]
+        name = participant_names[session_number].get(sender, sender)
+        turns[session_number][name] = count
+
+    def to_optional_float(value):
+        return None if np.isnan(value) else round(float(value), 3)
+
+    table['session_id'] = session_ids
+    table['team_id'] = team_ids
+    table['status'] = statuses
+    table['created_at'] = created_at
+    table['duration_s'] = [to_optional_float(value) for value in durations]
+    table['message_count'] = message_counts.tolist()
+    table['user_message_count'] = user_counts.tolist()
+    table['agent_message_count'] = (message_counts - user_counts).tolist()
+    table['participant_count'] = participant_counts
+    table['turns'] = turns
+    table['mean_latency_s'] = [to_optional_float(value) for value in mean_latencies]
+    table['median_latency_s'] = [to_optional_float(value) for value in median_latencies]
+    table['max_latency_s'] = [to_optional_float(value) for value in max_latencies]
+    table['initiated_by_user'] = initiated_by_user
+    table['ended_by'] = ended_bys
+    return table
+
+def index_sessions_by_team(table):
+    """세션 지표 테이블을 teamId → 세션 지표 행 목록(생성 시간순) 인덱스로 바꾸는 함수"""
+    index = {}
+    for row_number in np.argsort(np.array(table['created_at'], dtype=object).astype(str), kind='stable'):
+        row = {column: table[column][row_number] for column in SESSION_METRIC_COLUMNS if column != 'team_id'}
+        index.setdefault(table['team_id'][row_number], []).append(row)
+    return index
+
+def build_feedback_session_index(data):
+    """snapshot의 피드백 세션을 스트리밍 디코딩하여 지표를 계산하고 teamId로 인덱싱하는 함수"""
+    return index_sessions_by_team(compute_session_metrics(iter_feedback_sessions(data)))
@@ -0,0 +1,537 @@
+import argparse
+import csv
+import json
+import math
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+from snapshot import SNAPSHOT_JSONL_PATH, SNAPSHOT_PATH, write_snapshot
+
+EVALUATION_CSV_NAME = 'AI Team 인사 평가.csv'
+
+# 실험 참가자 이름 (analyze_agent_roles.py의 기본 참가자 목록과 같음), 이후는 조합으로 생성
+STUDY_PARTICIPANTS = ['김태완', '백선우', '송유택', '임현정', '서익준', '박유빈',
+                      '최대호', '한수지', '김윤영', '정영철', '남호연', '홍가영']
+SURNAMES = ['김', '이', '박', '최', '정', '강', '조', '윤', '장', '임', '한', '오', '서', '신', '권', '황']
+GIVEN_SYLLABLES = ['민', '서', '지', '현', '준', '우', '도', '하', '윤', '수', '영', '예', '은', '태', '유', '진',
+                   '호', '연', '재', '혜']
+
+# 실제 데이터처럼 2번째 팀이 평가 없이 하나 더 있는 참가자 (analyze_redis.py에서 제거됨)
+EXTRA_TEAM_PARTICIPANTS = {'박유빈'}
+
+ROLES = ['아이디어 생성하기', '아이디어 평가하기', '피드백하기', '요청하기']
+PROFESSIONALS = ['UX/UI 디자이너', '백엔드 개발자', '프론트엔드 개발자', '프로젝트 매니저', '연구원', '마케터',
+                 '데이터 분석가', '브랜드 디자이너']
+SKILLS = ['UI/UX 디자인', '데이터 분석', '기획 및 전략 수립', '문제 해결 분석', '디자인 씽킹 방법론', '사용자 리서치',
+          '프로토타이핑', '창의 기획', '브레인스토밍', '커뮤니케이션', '팀 리더십', '프레젠테이션']
+PERSONALITIES = ['보수적이고 자신만의 기준이 있는 편', '뻔하지 않은 것을 선호함', '외향적이고 적극적임', '꼼꼼하고 신중함']
+WORK_STYLES = ['정석적인 업무 방식을 선호', '명확한 근거를 기반으로 소통하는 것을 선호함', '빠르게 시도하고 고치는 편']
+TOPICS = ['광고주를 위한 대시보드 구성', '자기주도 학습 플랫폼', '시니어를 위한 금융 서비스', '반려동물 헬스케어 앱',
+          '친환경 배송 서비스', '사내 협업 도구 개선']
+IDEA_OBJECTS = ['성과 예측 대시보드', '맞춤형 학습 플랫폼', '음성 기반 도우미', '커뮤니티 기능', '자동 리포트 생성기',
+                '추천 엔진', '온보딩 가이드']
+IDEA_FEATURES = ['실시간 분석', 'AI 기반 예측', '사용자 맞춤 보고서', '알림 및 리마인더', '협업 공간', '데이터 시각화']
+
+# chat 메시지 유형 비율 (실제 snapshot: system 758, feedback_session_summary 432, make_request 136, give_feedback 18)
+CHAT_TYPE_WEIGHTS = [('system', 758), ('feedback_session_summary', 432), ('make_request', 136), ('give_feedback', 18)]
+SYSTEM_MESSAGES = [('새로운 아이디어를 생성했습니다.', 'generate', 316), ('아이디어를 평가했습니다.', 'evaluate', 355),
+                   ('나의 요청에 따라 새로운 아이디어를 생성했습니다.', 'generate', 32),
+                   ('기존 아이디어를 업데이트하여 새로운 아이디어를 생성했습니다.', 'generate', 21),
+                   ('요청받은 아이디어를 평가했습니다.', 'evaluate', 15)]
+REQUEST_TYPES = [('generate', 52), ('give_feedback', 35), ('evaluate_idea', 30), ('evaluate', 15)]
+MEMORY_ACTION_PLAN_FIELDS = ['idea_generation', 'idea_evaluation', 'feedback', 'request', 'response', 'planning']
+
+LIKERT_ANSWERS = ['매우 그렇지 않다', '그렇지 않다', '보통', '그렇다', '매우 그렇다']
+EVALUATION_ITEMS = ['팀원에게 적절한 역할이 부여되었다.', '이 팀원은 부여된 역할을 잘 수행하였다.',
+                    '이 팀원은 맡은 역할에 가장 적합한 페르소나를 지니고 있습니다.', '이 팀원은 자신의 페르소나에 어울리게 행동했다.',
+                    '이 팀원은 팀 성과에 기여했다', '이 팀원은 팀에 필요한 존재이다']
+
+ID_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-'
+START_TIME = datetime(2025, 7, 8, 5, 0, tzinfo=timezone.utc)
+
+def get_evaluation_columns():
+    """평가 CSV의 컬럼 목록을 만드는 함수 (설문지 원본처럼 팀원 E의 3번째 문항 제목이 4번째 문항과 같음)"""
+    columns = ['타임스탬프', '당신은 이름은?', '몇 번째 팀에 대한 평가인가요?',
+               '1.1 해당 팀의 규모 (인원 수) 는 적절했나요?', '1.2 그렇게 생각한 이유는 무엇인가요?',
+               '1.3 해당 팀의 구조 (조직도)는 적절히 설계되었나요? ', '1.4 그렇게 생각한 이유는 무엇인가요?',
+               '1.5 각 팀원들이 해당 조직도에 부합하여 업무를 수행했다고 생각하나요?', '1.6 그 이유는 무엇인가요?']
+    for member in ['A', 'B', 'C', 'D', 'E', "'나'"]:
+        items = list(EVALUATION_ITEMS)
+        if member == 'E':
+            items[2] = items[3]
+        columns.extend(f"팀원 {member}에 대해 답변해주세요. [{item}]" for item in items)
+        columns.append(f"팀원 {member}에 대한 한줄평을 작성해주세요.")
+    columns.extend(['3.1 해당 팀의 공유 멘탈 모델은 팀이 운영되는데 있어서 적절했나요? (또는 도움이 되었나요?)',
+                    '3.2 그렇게 생각한 이유는 무엇인가요?', '3.3 팀원들이 공유 멘탈 모델을 고려하여 행동했다고 느껴지나요?',
+                    '3.4 그렇게 생각한(느낀) 이유는 무엇인가요?',
+                    '4.1 이 팀은 주어진 시간동안 뛰어난 업무 성과를 냈나요? (아이디어를 냈나요?)',
+                    '4.2 그렇게 생각한 이유는 무엇인가요?', '4.3 이 팀의 팀워크 (또는 팀 케미스트리)를 보였다.',
+                    '4.4 그렇게 생각한 이유는 무엇인가요?'])
+    return columns
+
+def make_id(rng, prefix='', length=21):
+    """nanoid 형식의 임의 ID를 만드는 함수"""
+    return prefix + ''.join(rng.choice(ID_ALPHABET) for _ in range(length))
+
+def to_iso(time):
+    """datetime을 snapshot의 ISO 8601 문자열(밀리초, Z)로 바꾸는 함수"""
+    return time.strftime('%Y-%m-%dT%H:%M:%S.') + f"{time.microsecond // 1000:03d}Z"
+
+def to_form_timestamp(time):
+    """datetime을 설문 응답의 타임스탬프 형식(예: 2025. 7. 8 오후 2:32:52)으로 바꾸는 함수"""
+    local = time + timedelta(hours=9)
+    meridiem = '오전' if local.hour < 12 else '오후'
+    hour = local.hour % 12 or 12
+    return f"{local.year}. {local.month}. {local.day} {meridiem} {hour}:{local.minute:02d}:{local.second:02d}"
+
+def weighted_choice(rng, weighted_items):
+    """(값, 가중치) 목록에서 하나를 고르는 함수"""
+    values = [item[:-1] if len(item) > 2 else item[0] for item in weighted_items]
+    return rng.choices(values, weights=[item[-1] for item in weighted_items])[0]
+
+def make_participant_names(count):
+    """참가자 이름 목록을 만드는 함수 (실험 참가자 이름 다음에 성 + 두 글자 이름 조합, 모자라면 번호를 붙임)"""
+    names = list(STUDY_PARTICIPANTS[:count])
+    generated = (surname + first + second for first in GIVEN_SYLLABLES for second in GIVEN_SYLLABLES
+                 for surname in SURNAMES if first != second)
+    used = set(names) | {'임현승'}
+    suffix = 0
+    while len(names) < count:
+        name = next(generated, None)
+        if name is None:
+            suffix += 1
+            name = f"{STUDY_PARTICIPANTS[suffix % len(STUDY_PARTICIPANTS)]}{suffix}"
+        if name not in used:
+            used.add(name)
+            names.append(name)
+    return names
+
+def hash_record(value):
+    return {'type': 'hash', 'ttl': -1, 'value': value}
+
+def string_record(value, ttl=-1):
+    return {'type': 'string', 'ttl': ttl, 'value': value}
+
+def list_record(values):
+    return {'type': 'list', 'ttl': -1, 'value': values}
+
+def set_record(values):
+    return {'type': 'set', 'ttl': -1, 'value': values}
+
+def expired_record():
+    """TTL이 지나 덤프 시점에 값이 없었던 키의 레코드"""
+    return {'type': 'none', 'ttl': -2, 'value': '<unsupported>'}
+
+def make_persona(rng):
+    """사용자 프로필/agent 공통 페르소나 필드를 만드는 함수"""
+    return {
+        'education': rng.choice(['대졸', '석사', '박사', '']),
+        'professional': rng.choice(PROFESSIONALS),
+        'skills': ', '.join(rng.sample(SKILLS, rng.randint(3, 7))),
+        'personality': rng.choice(PERSONALITIES),
+        'workStyle': rng.choice(WORK_STYLES),
+        'preferences': rng.choice(['실용적인 디자인', '사용자 관점의 흐름', '명확한 목표 설정']),
+        'dislikes': rng.choice(['장황한 설명, 거짓말', '이유 없이 관습을 따르는 것', '불명확한 요청'])
+    }
+
+def make_agent(rng, agent_id, owner_email, created_at):
+    """agent:* hash 값을 만드는 함수"""
+    persona = make_persona(rng)
+    name = rng.choice(SURNAMES) + rng.choice(GIVEN_SYLLABLES) + rng.choice(GIVEN_SYLLABLES) + rng.choice(['봇', ''])
+    return {
+        'gender': rng.choice(['남자', '여자']),
+        'createdAt': to_iso(created_at),
+        'personaSummary': f"{name} is a {persona['professional']} who values {persona['preferences']}.",
+        'personality': persona['personality'],
+        'education': persona['education'],
+        'id': agent_id,
+        'preferences': persona['preferences'],
+        'professional': persona['professional'],
+        'dislikes': persona['dislikes'],
+        'value': '',
+        'nationality': '',
+        'workStyle': persona['workStyle'],
+        'age': str(rng.randint(23, 55)),
+        'skills': persona['skills'],
+        'major': '',
+        'name': name,
+        'updatedAt': to_iso(created_at),
+        'userId': owner_email
+    }
+
+def make_structure(rng, agent_ids):
+    """
+    팀 멤버 구조(members, relationships, nodePositions)를 만드는 함수
+    리더가 있으면 리더 → 나머지 SUPERVISOR 관계, 나머지 쌍은 일부 PEER 관계로 연결한다.
+    """
+    user_is_leader = rng.random() < 0.7
+    agent_leader = None if user_is_leader or rng.random() < 0.5 else rng.choice(agent_ids)
+
+    members = [{'agentId': None, 'roles': rng.sample(ROLES, rng.randint(1, 4)), 'isLeader': user_is_leader,
+                'isUser': True, 'userProfile': None}]
+    for agent_id in agent_ids:
+        members.append({'agentId': agent_id, 'roles': rng.sample(ROLES, rng.randint(1, 4)),
+                        'isLeader': agent_id == agent_leader, 'isUser': False})
+
+    leader = '나' if user_is_leader else agent_leader
+    node_ids = ['나'] + agent_ids
+    relationships = []
+    for i, source in enumerate(node_ids):
+        for target in node_ids[i + 1:]:
+            if leader in (source, target):
+                other = target if source == leader else source
+                relationships.append({'from': leader, 'to': other, 'type': 'SUPERVISOR'})
+            elif source == '나' or rng.random() < 0.5:
+                relationships.append({'from': source, 'to': target, 'type': 'PEER'})
+
+    # 나를 맨 위에 두고 원형으로 배치 (캔버스 800x500)
+    positions = {}
+    radius = 190
+    for i, node_key in enumerate(['나'] + [chr(65 + j) for j in range(len(agent_ids))]):
+        angle = -90 + 360 * i / len(node_ids)
+        positions[node_key] = {'x': 400 + radius * math.cos(math.radians(angle)),
+                               'y': 250 + radius * math.sin(math.radians(angle))}
+    return members, relationships, positions
+
+def make_idea(rng, idea_id, author, timestamp):
+    """ideas 리스트 항목 JSON을 만드는 함수"""
+    features = rng.sample(IDEA_FEATURES, 3)
+    obj = rng.choice(IDEA_OBJECTS)
+    return {
+        'id': idea_id,
+        'author': author,
+        'timestamp': to_iso(timestamp),
+        'content': {
+            'object': obj,
+            'function': f"{obj}를 통해 {features[0]} 기능을 제공하여 사용자의 의사결정을 지원",
+            'behavior': json.dumps({feature: f"{feature}을(를) 통해 사용자가 즉각적인 인사이트를 얻도록 지원"
+                                    for feature in features}, ensure_ascii=False),
+            'structure': json.dumps({'인터페이스': {feature: f"{feature} 영역" for feature in features}},
+                                    ensure_ascii=False)
+        },
+        'evaluations': []
+    }
+
+def make_evaluation(rng, evaluator, timestamp):
+    """아이디어 평가 항목을 만드는 함수"""
+    return {
+        'evaluator': evaluator,
+        'timestamp': to_iso(timestamp),
+        'scores': {'novelty': rng.randint(1, 7), 'completeness': rng.randint(1, 7), 'quality': rng.randint(1, 7)},
+        'comment': rng.choice(['구체적인 구현 방안이 더 필요합니다.', '사용자 관점에서 매우 유용해 보입니다.',
+                               '기존 서비스와의 차별점이 명확합니다.'])
+    }
+
+def make_feedback_session(rng, session_id, team_id, participants, start):
+    """feedback_session:* 값과 요약 chat payload를 만드는 함수"""
+    messages = [{'id': f"msg_{int(start.timestamp() * 1000)}_init", 'sender': 'system',
+                 'content': '피드백 세션이 시작되었습니다.', 'timestamp': to_iso(start), 'type': 'system'}]
+    time = start
+    for turn in range(rng.randint(2, 8)):
+        time += timedelta(seconds=rng.uniform(4, 20))
+        speaker = participants[turn % len(participants)]
+        messages.append({'id': make_id(rng, f"msg_{int(time.timestamp() * 1000)}_", 9), 'sender': speaker['id'],
+                         'content': f"{participants[(turn + 1) % len(participants)]['name']}, "
+                                    f"{rng.choice(IDEA_OBJECTS)} 아이디어에 대해 더 이야기해 볼까요?",
+                         'timestamp': to_iso(time), 'type': 'message'})
+    ended_at = time + timedelta(seconds=rng.uniform(2, 15))
+    initiator = participants[0]
+    session = {
+        'id': session_id,
+        'teamId': team_id,
+        'participants': [{'id': p['id'], 'name': p['name'], 'isUser': p['id'] == '나', 'joinedAt': to_iso(start)}
+                         for p in participants],
+        'messages': messages,
+        'status': 'completed',
+        'createdAt': to_iso(start),
+        'lastActivityAt': to_iso(time),
+        'feedbackContext': {'type': 'general_feedback', 'initiatedBy': 'user' if initiator['id'] == '나' else 'ai',
+                            'description': '일반적인 협업과 팀워크에 대한 피드백'},
+        'initiatedBy': initiator['id'],
+        'endedAt': to_iso(ended_at),
+        'endedBy': rng.choice(['ai', 'user'])
+    }
+    summary = {
+        'type': 'feedback_session_summary',
+        'sessionId': session_id,
+        'participants': [p['name'] for p in participants],
+        'summary': '피드백 세션에서 아이디어의 구체화 방향에 대해 논의했습니다.',
+        'keyInsights': [],
+        'messageCount': len(messages),
+        'duration': max(1, round((ended_at - start).total_seconds() / 60)),
+        'sessionMessages': messages,
+        'endedBy': session['endedBy']
+    }
+    return session, summary, ended_at
+
+def make_agent_memory(rng, agent_id, team_members, updated_at, knowledge_sentences=8):
+    """new_agent_memory:* 값을 만드는 함수"""
+    relation = {}
+    for member in team_members:
+        if member['id'] == agent_id:
+            continue
+        relation[member['id']] = {
+            'agentInfo': {'id': member['id'], 'name': member['name'], 'professional': member.get('professional', '팀원'),
+                          'personality': '', 'skills': ''},
+            'relationship': rng.choice(['PEER', 'SUPERVISOR', 'NULL']),
+            'interactionHistory': [{'timestamp': to_iso(updated_at), 'actionItem': 'request',
+                                    'content': f"I made a request to {member['name']}."}],
+            'myOpinion': 'They contribute actively to the team.'
+        }
+    return {
+        'agentId': agent_id,
+        'shortTerm': {'actionHistory': None, 'requestList': [], 'currentChat': None},
+        'longTerm': {
+            'knowledge': ' '.join(f"Insight {i}: {rng.choice(IDEA_FEATURES)} improves {rng.choice(IDEA_OBJECTS)}."
+                                  for i in range(knowledge_sentences)),
+            'actionPlan': {field: f"Focus on {rng.choice(IDEA_FEATURES)} when doing {field}."
+                           for field in MEMORY_ACTION_PLAN_FIELDS},
+            'relation': relation
+        },
+        'lastMemoryUpdate': to_iso(updated_at)
+    }
+
+def make_queue(rng, team_id, agent_id, request_message):
+    """agent_queue:* 리스트를 make_request chat 메시지 하나에서 파생된 액션들로 만드는 함수"""
+    sent_at = datetime.strptime(request_message['timestamp'], '%Y-%m-%dT%H:%M:%S.%fZ').replace(tzinfo=timezone.utc)
+    payload = request_message['payload']
+    actions = [
+        {'id': make_id(rng, f"retro_{int(sent_at.timestamp() * 1000) + 135}_", 7), 'type': 'retrospective',
+         'requesterName': 'System',
+         'payload': {'message': 'Memory update retrospective',
+                     'memoryEvent': {'type': 'CHAT_MESSAGE_SENT',
+                                     'payload': {'teamId': team_id, 'senderId': '나', 'message': request_message}}},
+         'timestamp': to_iso(sent_at + timedelta(milliseconds=135)), 'teamId': team_id},
+        {'id': make_id(rng, f"retro_{int(sent_at.timestamp() * 1000) + 251}_", 7), 'type': 'retrospective',
+         'requesterName': 'System',
+         'payload': {'message': 'Memory update retrospective',
+                     'memoryEvent': {'type': 'REQUEST_MADE',
+                                     'payload': {'teamId': team_id, 'requesterId': '나', 'targetId': agent_id,
+                                                 'requestType': payload['requestType'],
+                                                 'content': payload['content']}}},
+         'timestamp': to_iso(sent_at + timedelta(milliseconds=251)), 'teamId': team_id}
+    ]
+    if payload['requestType'] == 'generate':
+        actions.append({'id': make_id(rng, f"action-{int(sent_at.timestamp() * 1000) + 463}-", 9),
+                        'type': 'generate_idea', 'requesterName': '나', 'payload': {'message': payload['content']},
+                        'timestamp': to_iso(sent_at + timedelta(milliseconds=463)), 'teamId': team_id})
+    return [json.dumps(action, ensure_ascii=False, separators=(',', ':')) for action in actions]
+
+def iter_team_entries(rng, team_id, owner, created_at, chat_length, memory_sentences):
+    """
+    팀 하나의 snapshot 항목 (key, 레코드)을 만드는 함수
+    team hash, agent hash, chat/ideas 리스트, 피드백 세션, agent 메모리/상태, 큐를 돌려준 뒤 평가 CSV용 팀 요약을 반환한다.
+    """
+    agent_ids = [make_id(rng, 'agent_') for _ in range(rng.choice([2, 3, 3, 4, 4, 5]))]
+    agents = {agent_id: make_agent(rng, agent_id, owner['email'], created_at) for agent_id in agent_ids}
+    for agent_id, agent in agents.items():
+        yield f"agent:{agent_id}", hash_record(agent)
+        owner['agents'].append(agent_id)
+
+    members, relationships, positions = make_structure(rng, agent_ids)
+    members[0]['userProfile'] = dict(make_persona(rng), name=owner['name'])
+    topic = rng.choice(TOPICS)
+    yield f"team:{team_id}", hash_record({
+        'id': team_id,
+        'teamName': f"{topic.split()[-1]}팀{len(owner['teams']) + 1}",
+        'topic': topic,
+        'createdAt': to_iso(created_at),
+        'nodePositions': json.dumps(positions, separators=(',', ':')),
+        'relationships': json.dumps(relationships, ensure_ascii=False, separators=(',', ':')),
+        'members': json.dumps(members, ensure_ascii=False, separators=(',', ':')),
+        'ownerId': owner['id'],
+        'sharedMentalModel': f"{topic}에 대한 목표를 공유하고, 서로의 제안을 존중하며 적극적으로 의견을 냅니다."
+    })
+    owner['teams'].append(team_id)
+
+    team_members = [{'id': '나', 'name': '나'}] + [
+        {'id': agent_id, 'name': agent['name'], 'professional': agent['professional']}
+        for agent_id, agent in agents.items()]
+    chat = []
+    ideas = []
+    time = created_at + timedelta(minutes=1)
+    active_sessions = []
+    queued = None
+    chat_types = [weighted_choice(rng, CHAT_TYPE_WEIGHTS) for _ in range(chat_length)]
+
+    for chat_id, chat_type in enumerate(chat_types, 1):
+        time += timedelta(seconds=rng.expovariate(1 / 40))
+        sender = rng.choice(agent_ids)
+        if chat_type == 'system':
+            content, action = weighted_choice(rng, SYSTEM_MESSAGES)
+            if action == 'generate' or not ideas:
+                ideas.append(make_idea(rng, len(ideas) + 1, sender, time))
+            else:
+                evaluator = '나' if rng.random() < 0.25 else sender
+                rng.choice(ideas)['evaluations'].append(make_evaluation(rng, evaluator, time))
+            message = {'id': chat_id, 'timestamp': to_iso(time), 'sender': sender, 'type': 'system',
+                       'payload': {'content': content}}
+        elif chat_type == 'make_request':
+            request_type = weighted_choice(rng, REQUEST_TYPES)
+            from_user = rng.random() < 0.57
+            target = rng.choice(agent_ids) if from_user else '나'
+            content = f"{rng.choice(IDEA_OBJECTS)} 아이디어를 {rng.choice(['발전시켜', '평가해', '검토해'])} 주세요"
+            message = {'id': chat_id, 'timestamp': to_iso(time), 'sender': '나' if from_user else sender,
+                       'type': 'make_request',
+                       'payload': {'type': 'make_request', 'content': content, 'mention': target,
+                                   'requestType': request_type}}
+            if from_user and queued is None and rng.random() < 0.05:
+                queued = (target, message)
+        elif chat_type == 'give_feedback':
+            message = {'id': chat_id, 'timestamp': to_iso(time), 'sender': 'system', 'type': 'give_feedback',
+                       'payload': {'content': f"{agents[sender]['name']}가 피드백을 요청했습니다. 피드백 탭이 자동으로 열렸습니다."}}
+        else:
+            session_id = make_id(rng, f"feedback_{int(time.timestamp() * 1000)}_", 9).lower()
+            participants = rng.sample(team_members, 2)
+            session, summary, ended_at = make_feedback_session(rng, session_id, team_id, participants, time)
+            # 실제 snapshot처럼 일부 세션은 만료되어 값이 없음
+            if rng.random() < 0.37:
+                yield f"feedback_session:{session_id}", expired_record()
+            else:
+                if rng.random() < 0.05:
+                    session['status'] = 'active'
+                    del session['endedAt'], session['endedBy']
+                    active_sessions.append(session_id)
+                yield f"feedback_session:{session_id}", string_record(
+                    json.dumps(session, ensure_ascii=False, separators=(',', ':')), ttl=rng.randint(1000, 600000))
+            time = ended_at
+            message = {'id': chat_id, 'timestamp': to_iso(time), 'sender': 'system', 'type': 'feedback_session_summary',
+                       'payload': summary}
+        chat.append(json.dumps(message, ensure_ascii=False))
+
+    yield f"team:{team_id}:chat", list_record(chat)
+    yield f"team:{team_id}:chat:counter", string_record(str(len(chat)))
+    yield f"team:{team_id}:ideas", list_record([json.dumps(idea, ensure_ascii=False, separators=(',', ':'))
+                                                for idea in ideas])
+    if active_sessions:
+        yield f"team:{team_id}:active_feedback_sessions", set_record(active_sessions)
+        yield f"team:{team_id}:user_state", string_record(json.dumps({
+            'currentState': 'feedback_session', 'taskType': 'feedback_session',
+            'taskDescription': '피드백 세션 진행 중', 'estimatedDuration': 600, 'trigger': 'user_request',
+            'sessionInfo': {'sessionId': active_sessions[-1], 'participants': []}, 'startTime': to_iso(time)
+        }, ensure_ascii=False), ttl=rng.randint(1000, 90000))
+    if queued is not None:
+        agent_id, message = queued
+        yield f"agent_queue:{team_id}:{agent_id}", list_record(make_queue(rng, team_id, agent_id, message))
+
+    for agent_id in agent_ids:
+        if rng.random() < 0.75:
+            memory = make_agent_memory(rng, agent_id, team_members, time, memory_sentences)
+            yield f"new_agent_memory:{agent_id}", string_record(json.dumps(memory, ensure_ascii=False,
+                                                                             separators=(',', ':')))
+        else:
+            yield f"new_agent_memory:{agent_id}", expired_record()
+        if rng.random() < 0.2:
+            yield f"agent_state:{team_id}:{agent_id}", expired_record()
+
+    return {'agent_count': len(agent_ids), 'finished_at': time}
+
+def make_evaluation_row(rng, columns, participant_name, team_number, agent_count, submitted_at):
+    """팀 하나에 대한 평가 설문 응답 행을 만드는 함수 (agent 수만큼 팀원 A~E 칸을 채움)"""
+    row = dict.fromkeys(columns, '')
+    row['타임스탬프'] = to_form_timestamp(submitted_at)
+    row['당신은 이름은?'] = participant_name
+    row['몇 번째 팀에 대한 평가인가요?'] = str(team_number)
+    for column in columns[3:9]:
+        if column.startswith('1.1'):
+            row[column] = rng.choice(['적절하다', '적절하다', '부족하다', '많다'])
+        elif column.startswith(('1.3', '1.5')):
+            row[column] = str(rng.choices(range(1, 6), weights=[1, 3, 2, 8, 4])[0])
+        else:
+            row[column] = '팀 구성과 역할 분담을 고려했을 때 그렇게 생각했습니다.'
+
+    # 팀원 블록: 칸 7개(문항 6 + 한줄평)씩, A~E 다음 '나'
+    member_blocks = [columns[9 + 7 * i: 16 + 7 * i] for i in range(6)]
+    filled = member_blocks[:agent_count] + ([member_blocks[5]] if rng.random() < 0.8 else [])
+    for block in filled:
+        for column in block[:6]:
+            row[column] = rng.choices(LIKERT_ANSWERS, weights=[1, 3, 6, 10, 5])[0]
+        row[block[6]] = rng.choice(['맡은 역할을 잘 수행했다.', '아이디어 생성에 크게 기여했다.', '역할이 다소 모호했다.'])
+
+    for column in columns[51:]:
+        if column[:3] in ('3.1', '3.3', '4.1', '4.3'):
+            row[column] = str(rng.choices(range(1, 6), weights=[1, 4, 3, 9, 3])[0])
+        else:
+            row[column] = '팀원들의 행동을 보고 그렇게 느꼈습니다.'
+    return [row[column] for column in columns]
+
+def iter_synthetic_entries(team_count, seed=0, teams_per_participant=3, chat_length=34, memory_sentences=8,
+                           evaluation_rows=None):
+    """
+    시드가 고정된 합성 snapshot 항목 (key, 레코드)을 참가자 단위로 만들어 돌려주는 함수
+    evaluation_rows에 리스트를 넘기면 평가 CSV 행을 함께 채운다.
+    """
+    rng = random.Random(seed)
+    columns = get_evaluation_columns()
+    participant_count = -(-team_count // teams_per_participant)
+    remaining = team_count
+
+    for participant_number, name in enumerate(make_participant_names(participant_count)):
+        if remaining <= 0:
+            break
+        email = f"participant{participant_number + 1}@example.com"
+        owner = {'id': make_id(rng, 'user_'), 'name': name, 'email': email, 'teams': [], 'agents': []}
+        joined_at = START_TIME + timedelta(hours=6 * participant_number)
+
+        owner_team_count = min(remaining, teams_per_participant + (1 if name in EXTRA_TEAM_PARTICIPANTS else 0))
+        remaining -= owner_team_count
+        created_at = joined_at
+        team_number = 0
+        for position in range(owner_team_count):
+            team_id = make_id(rng, 'team_')
+            length = max(3, int(rng.gauss(chat_length, chat_length / 3)))
+            summary = yield from iter_team_entries(rng, team_id, owner, created_at, length, memory_sentences)
+
+            # 추가 팀(2번째)은 평가하지 않음
+            is_extra_team = name in EXTRA_TEAM_PARTICIPANTS and position == 1 and owner_team_count > teams_per_participant
+            if evaluation_rows is not None and not is_extra_team:
+                team_number += 1
+                evaluation_rows.append(make_evaluation_row(rng, columns, name, team_number, summary['agent_count'],
+                                                           summary['finished_at'] + timedelta(minutes=5)))
+            created_at = summary['finished_at'] + timedelta(minutes=rng.randint(10, 60))
+
+        yield f"user:{owner['id']}", hash_record({'createdAt': to_iso(joined_at), 'email': email, 'id': owner['id'],
+                                                   'name': name, 'password': ''})
+        yield f"user:email:{email}", string_record(owner['id'])
+        yield f"user:{owner['id']}:teams", set_record(owner['teams'])
+        yield f"user:{email}:agents", set_record(owner['agents'])
+
+def write_evaluation_csv(rows, path=EVALUATION_CSV_NAME):
+    """평가 설문 응답 행을 CSV로 저장하는 함수"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(get_evaluation_columns())
+        writer.writerows(rows)
+
+def generate_synthetic_data(output_dir, team_count, seed=0, snapshot_format='json', teams_per_participant=3,
+                            chat_length=34, memory_sentences=8):
+    """output_dir에 합성 snapshot(redis.json 또는 redis.jsonl)과 평가 CSV를 저장하는 함수"""
+    os.makedirs(output_dir, exist_ok=True)
+    snapshot_name = SNAPSHOT_JSONL_PATH if snapshot_format == 'jsonl' else SNAPSHOT_PATH
+    snapshot_path = os.path.join(output_dir, snapshot_name)
+    evaluation_rows = []
+    entries = iter_synthetic_entries(team_count, seed, teams_per_participant, chat_length, memory_sentences,
+                                     evaluation_rows)
+    entry_count = write_snapshot(entries, snapshot_path)
+    write_evaluation_csv(evaluation_rows, os.path.join(output_dir, EVALUATION_CSV_NAME))
+    return snapshot_path, entry_count, len(evaluation_rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='snapshot 스키마와 같은 합성 데이터셋 생성')
+    parser.add_argument('--teams', type=int, default=40, help='생성할 팀 수')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드')
+    parser.add_argument('--format', choices=['json', 'jsonl'], default='json',
+                        help='snapshot 형식 (json: redis.json과 같은 형식, jsonl: 한 줄에 키 하나인 스트리밍 형식)')
+    parser.add_argument('--output-dir', default='synthetic_data', help='저장할 폴더')
+    parser.add_argument('--teams-per-participant', type=int, default=3, help='참가자당 팀 수')
+    parser.add_argument('--chat-length', type=int, default=34, help='팀당 평균 chat 메시지 수')
+    parser.add_argument('--memory-sentences', type=int, default=8, help='agent 메모리 knowledge 문장 수')
+    args = parser.parse_args()
+
+    snapshot_path, entry_count, row_count = generate_synthetic_data(
+        args.output_dir, args.teams, args.seed, args.format, args.teams_per_participant,
+        args.chat_length, args.memory_sentences)
+    print(f"{snapshot_path}에 {entry_count}개 키를 저장했습니다.")
+    print(f"{os.path.join(args.output_dir, EVALUATION_CSV_NAME)}에 평가 {row_count}개를 저장했습니다.")
+    print(f"분석 실행 예: cd {args.output_dir} && python ../analyze_redis.py")
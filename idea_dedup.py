@@ -0,0 +1,307 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+from feedback_sessions import parse_timestamps_ms
+from team_index import get_owner_name
+from text_index import flatten_json_text, normalize
+
+TEAMS_PATH = 'structured_teams.json'
+SIGNATURES_PATH = 'idea_signatures.npz'
+REPORT_PATH = 'idea_duplicates.json'
+NUM_PERM = 128
+BANDS = 32                  # 32 band x 4 row: 추정 Jaccard 약 0.42부터 후보가 됨
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.5
+SEED = 1
+HASH_PRIME = np.uint64(4294967311)   # 2^32보다 큰 첫 소수 (uint64 곱셈이 넘치지 않는 범위)
+MAX_HASH = np.uint64(0xFFFFFFFF)
+
+def idea_text(idea):
+    """아이디어 content의 object/function/behavior/structure를 한 텍스트로 합치는 함수"""
+    content = idea.get('content') or {}
+    parts = [content.get('object') or '', content.get('function') or '',
+             flatten_json_text(content.get('behavior')), flatten_json_text(content.get('structure'))]
+    return '\n'.join(part for part in parts if part)
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    """정규화한 텍스트의 문자 n-gram을 crc32로 해시한 고유 uint64 배열을 반환하는 함수"""
+    text = re.sub(r'\s+', ' ', normalize(text)).strip()
+    if not text:
+        return np.empty(0, dtype=np.uint64)
+    shingles = {text[i:i + size] for i in range(max(len(text) - size + 1, 1))}
+    return np.array(sorted(zlib.crc32(shingle.encode('utf-8')) for shingle in shingles), dtype=np.uint64)
+
+def make_permutations(num_perm=NUM_PERM, seed=SEED):
+    """MinHash용 (a, b) 해시 계수를 만드는 함수 (a*x + b mod p)"""
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+    b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+    return a, b
+
+def minhash_signature(hashes, permutations):
+    """shingle 해시 배열의 MinHash signature를 계산하는 함수 (shingle이 없으면 전부 MAX_HASH)"""
+    a, b = permutations
+    if len(hashes) == 0:
+        return np.full(len(a), MAX_HASH, dtype=np.uint64)
+    values = (a[:, None] * hashes[None, :] + b[:, None]) % HASH_PRIME
+    return values.min(axis=1)
+
+class SignatureStore:
+    """
+    아이디어별 MinHash signature 저장소 (idea_signatures.npz로 저장/불러오기)
+    내용 해시가 같은 아이디어는 signature를 다시 계산하지 않아, 새 아이디어만 증분으로 처리한다.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, bands=BANDS, seed=SEED):
+        self.num_perm = num_perm
+        self.bands = bands
+        self.seed = seed
+        self.permutations = make_permutations(num_perm, seed)
+        self.keys = []
+        self.meta = []          # (content_hash, team_id, author, timestamp)
+        self.signatures = np.empty((0, num_perm), dtype=np.uint64)
+
+    @classmethod
+    def load(cls, path=SIGNATURES_PATH, num_perm=NUM_PERM, bands=BANDS, seed=SEED):
+        """저장된 signature를 불러오는 함수 (파일이 없거나 파라미터가 다르면 빈 저장소)"""
+        store = cls(num_perm, bands, seed)
+        if not os.path.exists(path):
+            return store
+        with np.load(path, allow_pickle=False) as saved:
+            if tuple(saved['params']) != (num_perm, bands, seed):
+                return store
+            store.keys = saved['keys'].tolist()
+            store.meta = [tuple(row) for row in saved['meta'].tolist()]
+            store.signatures = saved['signatures']
+        return store
+
+    def save(self, path=SIGNATURES_PATH):
+        meta = np.array(self.meta, dtype=str).reshape(len(self.meta), 4)
+        np.savez_compressed(path, params=np.array([self.num_perm, self.bands, self.seed]),
+                            keys=np.array(self.keys, dtype=str), meta=meta, signatures=self.signatures)
+
+    def update(self, ideas):
+        """
+        (key, team_id, author, timestamp, text) 목록으로 저장소를 맞추는 함수
+        바뀌지 않은 아이디어는 저장된 signature를 재사용하고, 목록에 없는 아이디어는 뺀다.
+        {computed, reused, removed} 개수를 반환한다.
+        """
+        previous = {key: (index, self.meta[index][0]) for index, key in enumerate(self.keys)}
+        keys, meta, rows = [], [], []
+        computed = 0
+        for key, team_id, author, timestamp, text in ideas:
+            content_hash = hashlib.sha1(text.encode('utf-8')).hexdigest()
+            old = previous.get(key)
+            if old and old[1] == content_hash:
+                rows.append(self.signatures[old[0]])
+            else:
+                rows.append(minhash_signature(shingle_hashes(text), self.permutations))
+                computed += 1
+            keys.append(key)
+            meta.append((content_hash, team_id or '', author or '', timestamp or ''))
+        removed = len(set(previous) - set(keys))
+        self.keys, self.meta = keys, meta
+        self.signatures = np.vstack(rows) if rows else np.empty((0, self.num_perm), dtype=np.uint64)
+        return {'computed': computed, 'reused': len(keys) - computed, 'removed': removed}
+
+    def order_keys(self):
+        """아이디어마다 시간순 정렬 기준 (timestamp 밀리초, key)을 만드는 함수"""
+        timestamps = parse_timestamps_ms([meta[3] for meta in self.meta])
+        return [(timestamps[index], key) for index, key in enumerate(self.keys)]
+
+    def band_buckets(self, order=None):
+        """
+        signature를 band로 나누어 같은 band 값을 가진 아이디어 index 배열 목록(2개 이상인 버킷만)을 반환하는 함수
+        order(아이디어별 정렬 기준)를 주면 각 버킷 안의 index를 그 순서로 정렬한다.
+        """
+        rows = self.num_perm // self.bands
+        valid = np.flatnonzero(~(self.signatures == MAX_HASH).all(axis=1))
+        rank = np.zeros(len(self.keys), dtype=np.int64)
+        if order is not None:
+            rank[sorted(range(len(self.keys)), key=order.__getitem__)] = np.arange(len(self.keys))
+        buckets = []
+        for band in range(self.bands):
+            band_values = np.ascontiguousarray(self.signatures[valid, band * rows:(band + 1) * rows])
+            _, codes = np.unique(band_values.view(np.dtype((np.void, rows * 8))).ravel(), return_inverse=True)
+            # (band 값, 순서)로 정렬한 뒤 band 값이 바뀌는 위치에서 잘라 묶음
+            positions = np.lexsort((rank[valid], codes.ravel()))
+            boundaries = np.flatnonzero(np.diff(codes.ravel()[positions])) + 1
+            buckets.extend(group for group in np.split(valid[positions], boundaries) if len(group) > 1)
+        return buckets
+
+    def similar_links(self, order, threshold=SIMILARITY_THRESHOLD):
+        """
+        LSH 버킷마다 가장 이른 아이디어를 대표로 두고, 추정 Jaccard가 threshold 이상인
+        (아이디어, 대표, 유사도) 목록을 반환하는 함수
+        버킷 안의 모든 쌍 대신 대표와의 비교만 하므로 큰 버킷에서도 아이디어 수에 비례한 비용만 든다.
+        """
+        links = {}
+        for members in self.band_buckets(order):
+            representative, rest = members[0], members[1:]
+            similarities = (self.signatures[rest] == self.signatures[representative]).mean(axis=1)
+            for index in np.flatnonzero(similarities >= threshold):
+                links[(int(rest[index]), int(representative))] = float(similarities[index])
+        return [(i, j, similarity) for (i, j), similarity in sorted(links.items())]
+
+    def query(self, text, threshold=SIMILARITY_THRESHOLD):
+        """저장소에 넣지 않고 새 아이디어 텍스트와 비슷한 저장된 아이디어 (key, 유사도) 목록을 반환하는 함수"""
+        signature = minhash_signature(shingle_hashes(text), self.permutations)
+        if len(self.keys) == 0 or (signature == MAX_HASH).all():
+            return []
+        rows = self.num_perm // self.bands
+        band_matches = np.zeros(len(self.keys), dtype=bool)
+        for band in range(self.bands):
+            columns = slice(band * rows, (band + 1) * rows)
+            band_matches |= (self.signatures[:, columns] == signature[columns]).all(axis=1)
+        results = []
+        for index in np.flatnonzero(band_matches):
+            similarity = float(np.mean(self.signatures[index] == signature))
+            if similarity >= threshold:
+                results.append((self.keys[index], round(similarity, 3)))
+        return sorted(results, key=lambda item: -item[1])
+
+def collect_ideas(teams_list):
+    """팀 리스트에서 (key, team_id, author, timestamp, text) 목록과 key별 정보를 만드는 함수"""
+    ideas = []
+    info = {}
+    agent_names = {}
+    for team in teams_list:
+        for agent in team.get('agents', []):
+            agent_names[agent['agentId']] = (agent.get('agent_info') or {}).get('name')
+        for index, idea_json in enumerate(team.get('ideas', [])):
+            idea = json.loads(idea_json) if isinstance(idea_json, str) else idea_json
+            key = f"{team['team_id']}:{idea.get('id', index)}"
+            ideas.append((key, team['team_id'], idea.get('author'), idea.get('timestamp'), idea_text(idea)))
+            info[key] = {'team_id': team['team_id'], 'owner': get_owner_name(team), 'author': idea.get('author'),
+                         'object': (idea.get('content') or {}).get('object')}
+    return ideas, info, agent_names
+
+def _cluster(count, pairs):
+    """검증된 쌍으로 union-find 클러스터를 만드는 함수"""
+    parent = list(range(count))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j, _ in pairs:
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+    clusters = defaultdict(list)
+    for index in range(count):
+        clusters[find(index)].append(index)
+    return [members for members in clusters.values() if len(members) > 1]
+
+def _rate(novel, total):
+    return round(novel / total, 4) if total else None
+
+def analyze_duplicates(store, info, agent_names, threshold=SIMILARITY_THRESHOLD):
+    """
+    저장소 전체에서 근사 중복 아이디어를 찾아 팀별/agent별 새로움·중복 비율을 계산하는 함수
+    LSH 버킷 대표와 비슷한 아이디어를 union-find로 묶고, 클러스터 안에서 시간순으로 더 이른 아이디어가 있으면
+    중복으로 본다. 이른 아이디어가 같은 팀/다른 팀/같은 작성자인지에 따라 팀 내 중복/팀 간 중복/반복으로 나눈다.
+    """
+    order_key = store.order_keys()
+    links = store.similar_links(order_key, threshold)
+    clustered = sorted(_cluster(len(store.keys), links), key=lambda members: (-len(members), members[0]))
+    for members in clustered:
+        members.sort(key=lambda index: order_key[index])
+
+    team_stats = defaultdict(lambda: {'ideas': 0, 'within_team_duplicates': 0, 'cross_team_duplicates': 0})
+    agent_stats = defaultdict(lambda: {'ideas': 0, 'duplicates': 0, 'self_repeats': 0})
+    for index in range(len(store.keys)):
+        team_id, author = store.meta[index][1], store.meta[index][2]
+        team_stats[team_id]['ideas'] += 1
+        agent_stats[(team_id, author)]['ideas'] += 1
+
+    duplicate_count = 0
+    for members in clustered:
+        seen_teams, seen_authors = set(), set()
+        for position, index in enumerate(members):
+            team_id, author = store.meta[index][1], store.meta[index][2]
+            if position > 0:
+                duplicate_count += 1
+                agent_stats[(team_id, author)]['duplicates'] += 1
+                if team_id in seen_teams:
+                    team_stats[team_id]['within_team_duplicates'] += 1
+                else:
+                    team_stats[team_id]['cross_team_duplicates'] += 1
+                if (team_id, author) in seen_authors:
+                    agent_stats[(team_id, author)]['self_repeats'] += 1
+            seen_teams.add(team_id)
+            seen_authors.add((team_id, author))
+
+    owners = {value['team_id']: value['owner'] for value in info.values()}
+    teams = []
+    for team_id, row in sorted(team_stats.items()):
+        duplicates = row['within_team_duplicates'] + row['cross_team_duplicates']
+        teams.append({'team_id': team_id, 'owner': owners.get(team_id),
+                      **row, 'novelty_rate': _rate(row['ideas'] - duplicates, row['ideas'])})
+    agents = []
+    for (team_id, author), row in sorted(agent_stats.items()):
+        agents.append({'team_id': team_id, 'author': author, 'name': agent_names.get(author), **row,
+                       'novelty_rate': _rate(row['ideas'] - row['duplicates'], row['ideas'])})
+
+    clusters = []
+    for members in clustered:
+        clusters.append({'size': len(members), 'teams': len({store.meta[index][1] for index in members}),
+                         'ideas': [{'key': store.keys[index], **info.get(store.keys[index], {})} for index in members]})
+
+    total = len(store.keys)
+    return {
+        'params': {'num_perm': store.num_perm, 'bands': store.bands, 'shingle_size': SHINGLE_SIZE,
+                   'threshold': threshold},
+        'totals': {'ideas': total, 'duplicate_ideas': duplicate_count, 'similar_links': len(links),
+                   'clusters': len(clusters), 'novelty_rate': _rate(total - duplicate_count, total)},
+        'teams': teams,
+        'agents': agents,
+        'clusters': clusters
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='MinHash/LSH로 근사 중복 아이디어를 찾고 팀/agent별 새로움 비율을 계산')
+    parser.add_argument('--teams', default=TEAMS_PATH)
+    parser.add_argument('--signatures', default=SIGNATURES_PATH, help='signature 저장 경로 (증분 계산용)')
+    parser.add_argument('--threshold', type=float, default=SIMILARITY_THRESHOLD, help='추정 Jaccard 기준')
+    parser.add_argument('--bands', type=int, default=BANDS,
+                        help=f'LSH band 수 ({NUM_PERM}의 약수, 클수록 낮은 유사도까지 후보가 됨)')
+    parser.add_argument('--check', help='저장된 signature와 비교할 새 아이디어 텍스트 (저장소는 바꾸지 않음)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    store = SignatureStore.load(args.signatures, bands=args.bands)
+    if args.check:
+        matches = store.query(args.check, args.threshold)
+        for key, similarity in matches:
+            print(f"- {key}: {similarity}")
+        print(f"비슷한 아이디어 {len(matches)}개 ({(time.perf_counter() - start) * 1000:.1f}ms)")
+    else:
+        with open(args.teams, 'r', encoding='utf-8') as f:
+            teams_list = json.load(f)
+        ideas, info, agent_names = collect_ideas(teams_list)
+        counts = store.update(ideas)
+        store.save(args.signatures)
+        report = analyze_duplicates(store, info, agent_names, args.threshold)
+
+        with open(REPORT_PATH, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+        totals = report['totals']
+        print(f"signature 계산 {counts['computed']}개, 재사용 {counts['reused']}개, 삭제 {counts['removed']}개")
+        print(f"아이디어 {totals['ideas']}개 중 중복 {totals['duplicate_ideas']}개 "
+              f"(새로움 {totals['novelty_rate']}), 클러스터 {totals['clusters']}개")
+        for cluster in report['clusters'][:5]:
+            objects = ', '.join(sorted({idea['object'] or '' for idea in cluster['ideas']}))
+            print(f"- {cluster['size']}개 / {cluster['teams']}팀: {objects}")
+        print(f"{REPORT_PATH}에 저장했습니다. ({(time.perf_counter() - start) * 1000:.0f}ms)")
@@ -0,0 +1,195 @@
+import atexit
+import contextlib
+import cProfile
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+# 환경 변수: CRAFT_PROFILE=1 (구간 시간), CRAFT_PROFILE_MEMORY=1 (tracemalloc 최대 메모리),
+# CRAFT_PROFILE_CPROFILE=<폴더> (구간별 cProfile 덤프), CRAFT_PROFILE_REPORT=<경로> (리포트 파일)
+PROFILE_ENV = 'CRAFT_PROFILE'
+PROFILE_MEMORY_ENV = 'CRAFT_PROFILE_MEMORY'
+PROFILE_CPROFILE_ENV = 'CRAFT_PROFILE_CPROFILE'
+PROFILE_REPORT_ENV = 'CRAFT_PROFILE_REPORT'
+DEFAULT_REPORT_PATH = 'profile_report.json'
+
+# 비활성화 상태에서 span()이 돌려주는 재사용 가능한 빈 context manager
+_NULL_SPAN = contextlib.nullcontext()
+
+# 활성화되면 _Profiler 인스턴스, 아니면 None
+_profiler = None
+
+class _Profiler:
+    """구간(span) 기록을 모으는 프로파일러 상태"""
+
+    def __init__(self, memory=False, cprofile_dir=None, report_path=DEFAULT_REPORT_PATH):
+        self.memory = memory
+        self.cprofile_dir = cprofile_dir
+        self.report_path = report_path
+        self.spans = []
+        self.stack = []
+        self.started_at = time.perf_counter()
+        self.active_cprofile = None
+        self.written = False
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if cprofile_dir:
+            os.makedirs(cprofile_dir, exist_ok=True)
+
+    @contextlib.contextmanager
+    def span(self, name, attrs):
+        record = {
+            'name': name,
+            'path': '/'.join([span['name'] for span in self.stack] + [name]),
+            'depth': len(self.stack),
+            'start_s': time.perf_counter() - self.started_at,
+            'seconds': None,
+            'attrs': attrs
+        }
+        self.stack.append(record)
+
+        # 메모리: 구간마다 tracemalloc 최대값을 초기화하므로, 초기화 전 최대값을 바깥 구간에 넘겨 합침
+        start_memory = 0
+        if self.memory:
+            start_memory, peak = tracemalloc.get_traced_memory()
+            if len(self.stack) > 1:
+                parent = self.stack[-2]
+                parent['_peak'] = max(parent.get('_peak', 0), peak)
+            tracemalloc.reset_peak()
+
+        # cProfile은 동시에 하나만 켤 수 있으므로 가장 바깥의 프로파일 대상 구간에서만 사용
+        profile = None
+        if self.cprofile_dir and self.active_cprofile is None:
+            profile = cProfile.Profile()
+            self.active_cprofile = profile
+            profile.enable()
+
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+                self.active_cprofile = None
+                filename = f"{len(self.spans):04d}_{record['path'].replace('/', '__')}.prof"
+                profile_path = os.path.join(self.cprofile_dir, filename)
+                profile.dump_stats(profile_path)
+                record['profile'] = profile_path
+            if self.memory:
+                _, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, record.pop('_peak', 0))
+                # 구간 시작 시점 대비 최대 증가량
+                record['peak_mb'] = (peak - start_memory) / 1024 / 1024
+                if len(self.stack) > 1:
+                    parent = self.stack[-2]
+                    parent['_peak'] = max(parent.get('_peak', 0), peak)
+            self.stack.pop()
+            self.spans.append(record)
+
+    def build_report(self):
+        """구간 기록과 이름별 합계를 담은 리포트를 만드는 함수"""
+        summary = {}
+        for record in self.spans:
+            entry = summary.setdefault(record['name'], {'count': 0, 'total_s': 0.0, 'max_s': 0.0})
+            entry['count'] += 1
+            entry['total_s'] += record['seconds']
+            entry['max_s'] = max(entry['max_s'], record['seconds'])
+            if 'peak_mb' in record:
+                entry['max_peak_mb'] = max(entry.get('max_peak_mb', 0.0), record['peak_mb'])
+        return {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'argv': sys.argv,
+            'total_s': time.perf_counter() - self.started_at,
+            'memory': self.memory,
+            'cprofile_dir': self.cprofile_dir,
+            'summary': summary,
+            'spans': sorted(self.spans, key=lambda record: record['start_s'])
+        }
+
+def configure(enabled=True, memory=False, cprofile_dir=None, report_path=None):
+    """
+    계측을 켜거나 끄는 함수
+    켜면 span() 구간을 기록하고, 프로그램 종료 시(또는 write_report 호출 시) 리포트 JSON을 저장한다.
+    """
+    global _profiler
+    if not enabled:
+        _profiler = None
+        return None
+    _profiler = _Profiler(memory=memory, cprofile_dir=cprofile_dir,
+                          report_path=report_path or DEFAULT_REPORT_PATH)
+    atexit.register(_write_report_at_exit)
+    return _profiler
+
+def _env_enabled(name):
+    return os.environ.get(name, '').lower() not in ('', '0', 'false', 'no')
+
+def configure_from_env():
+    """CRAFT_PROFILE* 환경 변수로 계측을 설정하는 함수 (CRAFT_PROFILE이 없으면 아무것도 하지 않음)"""
+    cprofile_dir = os.environ.get(PROFILE_CPROFILE_ENV) or None
+    memory = _env_enabled(PROFILE_MEMORY_ENV)
+    if not (_env_enabled(PROFILE_ENV) or memory or cprofile_dir):
+        return None
+    return configure(True, memory=memory, cprofile_dir=cprofile_dir,
+                     report_path=os.environ.get(PROFILE_REPORT_ENV))
+
+def add_profile_arguments(parser):
+    """argparse parser에 계측 옵션(--profile, --profile-memory, --profile-cprofile, --profile-report)을 추가하는 함수"""
+    group = parser.add_argument_group('계측 (환경 변수 CRAFT_PROFILE=1로도 활성화)')
+    group.add_argument('--profile', action='store_true', help='단계별 구간 시간을 기록하여 리포트로 저장')
+    group.add_argument('--profile-memory', action='store_true', help='구간별 tracemalloc 최대 메모리도 기록')
+    group.add_argument('--profile-cprofile', metavar='DIR', help='구간별 cProfile 덤프(.prof)를 저장할 폴더')
+    group.add_argument('--profile-report', metavar='PATH', help=f'리포트 JSON 경로 (기본: {DEFAULT_REPORT_PATH})')
+
+def configure_from_args(args):
+    """add_profile_arguments로 추가한 옵션과 환경 변수를 합쳐 계측을 설정하는 함수"""
+    if args.profile or args.profile_memory or args.profile_cprofile:
+        return configure(True, memory=args.profile_memory or _env_enabled(PROFILE_MEMORY_ENV),
+                         cprofile_dir=args.profile_cprofile or os.environ.get(PROFILE_CPROFILE_ENV) or None,
+                         report_path=args.profile_report or os.environ.get(PROFILE_REPORT_ENV))
+    profiler = configure_from_env()
+    if profiler is not None and args.profile_report:
+        profiler.report_path = args.profile_report
+    return profiler
+
+def is_enabled():
+    """계측이 켜져 있는지 반환하는 함수"""
+    return _profiler is not None
+
+def span(name, **attrs):
+    """
+    이름 있는 구간을 측정하는 context manager를 반환하는 함수
+    계측이 꺼져 있으면 미리 만들어 둔 빈 context manager를 그대로 돌려주므로 추가 비용이 없다.
+    """
+    if _profiler is None:
+        return _NULL_SPAN
+    return _profiler.span(name, attrs)
+
+def write_report(path=None):
+    """기록된 구간을 리포트 JSON으로 저장하고 경로를 반환하는 함수 (계측이 꺼져 있으면 None)"""
+    if _profiler is None:
+        return None
+    report_path = path or _profiler.report_path
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(_profiler.build_report(), f, ensure_ascii=False, indent=2)
+    _profiler.written = True
+    return report_path
+
+def _write_report_at_exit():
+    """명시적으로 저장하지 않고 종료한 경우(예외 포함) 리포트를 저장하는 함수"""
+    if _profiler is not None and not _profiler.written and _profiler.spans:
+        path = write_report()
+        print(f"계측 리포트 저장: {path}")
+
+def print_summary():
+    """구간 이름별 합계 시간을 출력하는 함수"""
+    if _profiler is None:
+        return
+    report = _profiler.build_report()
+    print(f"\n[계측] 전체 {report['total_s']:.3f}초")
+    for name, entry in sorted(report['summary'].items(), key=lambda item: -item[1]['total_s']):
+        peak = f", 최대 메모리 {entry['max_peak_mb']:.1f}MB" if 'max_peak_mb' in entry else ''
+        print(f"  - {name}: {entry['total_s']:.3f}초 ({entry['count']}회, 최대 {entry['max_s']:.3f}초{peak})")
@@ -0,0 +1,321 @@
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from analysis_summary import ANALYSIS_SUMMARY_PATH, write_analysis_summary
+from analyze_redis import _assemble_teams, build_teams_list, load_evaluation_data, map_evaluations_to_teams
+from feedback_sessions import build_feedback_session_index
+from redis_standin import StandinRedis, dump_entries, simulate_activity
+
+LIVE_AGGREGATES_PATH = 'live_aggregates.json'
+EVALUATION_CSV_PATH = 'AI Team 인사 평가.csv'
+# team:*:chat / team:*:ideas 리스트에 대한 keyspace 알림 (K: keyspace 채널, l: 리스트 명령, g: del 등 일반 명령, h: hash)
+KEYSPACE_FLAGS = 'Klgh'
+KEYSPACE_PATTERN = '__keyspace@*__:team:*'
+EVENT_LIST_SUFFIXES = ('chat', 'ideas')
+
+def connect_redis(url):
+    """redis-py로 Redis에 연결하는 함수 (redis 패키지는 이 모드에서만 필요)"""
+    import redis
+    return redis.Redis.from_url(url)
+
+def _to_str(value):
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+def enable_keyspace_notifications(client):
+    """
+    keyspace 알림을 켜고 team:* 키 이벤트를 구독하는 함수
+    CONFIG가 막혀 있는 서버(관리형 Redis 등)나 pubsub이 없는 클라이언트면 None을 반환하고 polling만 사용한다.
+    """
+    try:
+        current = _to_str(client.config_get('notify-keyspace-events').get('notify-keyspace-events', '')) or ''
+        flags = ''.join(sorted(set(current) | set(KEYSPACE_FLAGS)))
+        if set(flags) != set(current):
+            client.config_set('notify-keyspace-events', flags)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(KEYSPACE_PATTERN)
+        return pubsub
+    except Exception as e:
+        print(f"keyspace 알림을 사용할 수 없어 polling으로 동작합니다: {e}")
+        return None
+
+def new_team_aggregate():
+    """팀별 누적 집계 초기값"""
+    return {'chat_count': 0, 'chat_types': {}, 'idea_count': 0, 'evaluation_count': 0, 'last_event_at': None}
+
+def apply_chat_message(aggregate, message_text):
+    """chat 메시지 하나를 팀 집계에 반영하는 함수"""
+    message = json.loads(message_text)
+    aggregate['chat_count'] += 1
+    message_type = message.get('type', 'unknown')
+    aggregate['chat_types'][message_type] = aggregate['chat_types'].get(message_type, 0) + 1
+    _touch(aggregate, message.get('timestamp'))
+
+def apply_idea(aggregate, idea_text):
+    """아이디어 하나를 팀 집계에 반영하는 함수"""
+    idea = json.loads(idea_text)
+    aggregate['idea_count'] += 1
+    aggregate['evaluation_count'] += len(idea.get('evaluations') or [])
+    _touch(aggregate, idea.get('timestamp'))
+
+def _touch(aggregate, timestamp):
+    if timestamp and (aggregate['last_event_at'] is None or timestamp > aggregate['last_event_at']):
+        aggregate['last_event_at'] = timestamp
+
+def build_team_aggregate(team):
+    """팀의 chat/ideas 전체로 집계를 새로 만드는 함수"""
+    aggregate = new_team_aggregate()
+    for message_text in team['chat']:
+        apply_chat_message(aggregate, message_text)
+    for idea_text in team['ideas']:
+        apply_idea(aggregate, idea_text)
+    return aggregate
+
+def _write_json_atomic(path, obj, **kwargs):
+    """임시 파일에 쓴 뒤 교체하여, 읽는 쪽(data_server 등)이 쓰는 도중의 파일을 보지 않게 저장하는 함수"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False, **kwargs)
+    os.replace(temp_path, path)
+
+class LiveIngestor:
+    """
+    Redis(또는 stand-in)의 team:*:chat / team:*:ideas 리스트에서 새로 추가된 항목만 가져와
+    메모리의 팀 데이터와 누적 집계에 반영하고, 최소 간격을 두고 결과 파일을 갱신하는 수집기
+    """
+
+    def __init__(self, client, min_publish_interval=5.0, resync_interval=60.0, use_keyspace=True,
+                 teams_path='structured_teams.json', summary_path=ANALYSIS_SUMMARY_PATH,
+                 aggregates_path=LIVE_AGGREGATES_PATH):
+        self.client = client
+        self.min_publish_interval = min_publish_interval
+        self.resync_interval = resync_interval
+        self.use_keyspace = use_keyspace
+        self.teams_path = teams_path
+        self.summary_path = summary_path
+        self.aggregates_path = aggregates_path
+        self.evaluations = load_evaluation_data() if os.path.exists(EVALUATION_CSV_PATH) else []
+
+        self.pubsub = None
+        self.started = False
+        self.teams = {}
+        self.aggregates = {}
+        self.offsets = {}
+        self.list_owners = {}
+        self.known_team_keys = set()
+        self.dirty = False
+        self.last_publish = 0.0
+        self.last_resync = 0.0
+        self.stats = {'events_applied': 0, 'tail_fetches': 0, 'full_fetches': 0, 'bootstraps': 0,
+                      'publishes': 0}
+
+    def bootstrap(self):
+        """전체 키를 한 번 읽어 팀 데이터/집계/리스트 오프셋을 초기화하는 함수 (새 팀이 생겼을 때도 사용)"""
+        data = dump_entries(self.client)
+        teams = {}
+        _assemble_teams(data, teams, build_feedback_session_index(data))
+        self.teams = teams
+        self.known_team_keys = {key for key in data if key.startswith('team:team_') and key.count(':') == 1}
+        self.offsets = {}
+        self.list_owners = {}
+        for team_id, team in teams.items():
+            for suffix in EVENT_LIST_SUFFIXES:
+                key = f"team:{team_id}:{suffix}"
+                self.offsets[key] = len(team[suffix])
+                self.list_owners[key] = (team_id, suffix)
+        self.aggregates = {team_id: build_team_aggregate(team) for team_id, team in teams.items()}
+        self.stats['bootstraps'] += 1
+        self.last_resync = time.monotonic()
+        self.dirty = True
+
+    def start(self):
+        """keyspace 알림 구독(가능하면)과 초기 로드를 수행하는 함수"""
+        # 구독을 먼저 시작해야 초기 로드 도중의 변경도 알림으로 받을 수 있음
+        if self.use_keyspace:
+            self.pubsub = enable_keyspace_notifications(self.client)
+        self.bootstrap()
+        self.started = True
+
+    def sync_list(self, key, full=False):
+        """리스트 하나를 동기화하는 함수 (길이가 늘었으면 꼬리만, 줄었거나 full이면 전체를 다시 읽음). 반영한 항목 수 반환"""
+        owner = self.list_owners.get(key)
+        if owner is None:
+            return 0
+        team_id, suffix = owner
+        team = self.teams[team_id]
+        length = self.client.llen(key)
+        known = self.offsets.get(key, 0)
+
+        if full or length < known:
+            items = [_to_str(item) for item in self.client.lrange(key, 0, -1)]
+            self.stats['full_fetches'] += 1
+            if items == team[suffix]:
+                return 0
+            team[suffix][:] = items
+            self.offsets[key] = len(items)
+            self.aggregates[team_id] = build_team_aggregate(team)
+            self.dirty = True
+            return len(items)
+
+        if length == known:
+            return 0
+        items = [_to_str(item) for item in self.client.lrange(key, known, length - 1)]
+        self.stats['tail_fetches'] += 1
+        apply = apply_chat_message if suffix == 'chat' else apply_idea
+        for item in items:
+            team[suffix].append(item)
+            apply(self.aggregates[team_id], item)
+        self.offsets[key] = known + len(items)
+        self.stats['events_applied'] += len(items)
+        self.dirty = True
+        return len(items)
+
+    def has_new_team(self):
+        """아직 모르는 team:team_* hash가 생겼는지 확인하는 함수"""
+        for raw_key in self.client.scan_iter(match='team:team_*'):
+            key = _to_str(raw_key)
+            if key.count(':') == 1 and key not in self.known_team_keys:
+                return True
+        return False
+
+    def poll_lists(self):
+        """알고 있는 모든 팀 리스트의 길이를 확인하여 새 항목을 가져오는 함수 (polling 모드)"""
+        return sum(self.sync_list(key) for key in list(self.list_owners))
+
+    def drain_notifications(self, timeout):
+        """
+        keyspace 알림을 timeout 동안 받아 해당 키만 동기화하는 함수
+        rpush는 꼬리만 가져오고, lset/del 등 제자리 변경은 리스트 전체를 다시 읽는다.
+        """
+        deadline = time.monotonic() + timeout
+        applied = 0
+        new_team = False
+        while True:
+            remaining = deadline - time.monotonic()
+            message = self.pubsub.get_message(ignore_subscribe_messages=True, timeout=max(remaining, 0.0))
+            if message is None:
+                if remaining <= 0:
+                    break
+                continue
+            if message.get('type') != 'pmessage':
+                continue
+            key = _to_str(message['channel']).split(':', 1)[1]
+            event = _to_str(message['data'])
+            if key in self.list_owners:
+                applied += self.sync_list(key, full=event not in ('rpush', 'rpushx'))
+            elif key.startswith('team:team_') and key.count(':') == 1 and key not in self.known_team_keys:
+                new_team = True
+        return applied, new_team
+
+    def step(self, poll_interval):
+        """한 주기: 새 항목 반영 → (필요하면) 전체 재동기화 → 최소 간격이 지났으면 결과 갱신"""
+        if self.pubsub is not None:
+            _, new_team = self.drain_notifications(poll_interval)
+        else:
+            self.poll_lists()
+            new_team = False
+            time.sleep(poll_interval)
+
+        # 주기적 재동기화: 새 팀 확인과 (알림이 없을 때 놓칠 수 있는) 제자리 변경 반영
+        if new_team or time.monotonic() - self.last_resync >= self.resync_interval:
+            if new_team or self.has_new_team():
+                self.bootstrap()
+            else:
+                for key in list(self.list_owners):
+                    self.sync_list(key, full=True)
+                self.last_resync = time.monotonic()
+        self.publish()
+
+    def build_live_aggregates(self):
+        """팀별/전체 누적 집계를 live_aggregates.json 형태로 만드는 함수"""
+        totals = new_team_aggregate()
+        for aggregate in self.aggregates.values():
+            for field in ('chat_count', 'idea_count', 'evaluation_count'):
+                totals[field] += aggregate[field]
+            for message_type, count in aggregate['chat_types'].items():
+                totals['chat_types'][message_type] = totals['chat_types'].get(message_type, 0) + count
+            _touch(totals, aggregate['last_event_at'])
+        return {
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+            'mode': 'keyspace' if self.pubsub is not None else 'polling',
+            'stats': dict(self.stats),
+            'totals': totals,
+            'teams': self.aggregates
+        }
+
+    def publish(self, force=False):
+        """변경이 있고 마지막 갱신 후 min_publish_interval이 지났으면 결과 파일을 갱신하는 함수 (갱신했으면 True)"""
+        if not self.dirty or (not force and time.monotonic() - self.last_publish < self.min_publish_interval):
+            return False
+        teams_list = map_evaluations_to_teams(build_teams_list(self.teams), self.evaluations)
+        _write_json_atomic(self.teams_path, teams_list, indent=2)
+        write_analysis_summary(teams_list, self.summary_path)
+        self.stats['publishes'] += 1
+        _write_json_atomic(self.aggregates_path, self.build_live_aggregates(), indent=2)
+        self.last_publish = time.monotonic()
+        self.dirty = False
+        return True
+
+    def run(self, poll_interval=1.0, duration=None, stop_event=None):
+        """duration초 동안(없으면 중단하거나 stop_event가 설정될 때까지) 수집하는 함수. 종료 시 남은 변경을 저장한다."""
+        if not self.started:
+            self.start()
+        self.publish(force=True)
+        started = time.monotonic()
+        try:
+            while (duration is None or time.monotonic() - started < duration) and not (stop_event and stop_event.is_set()):
+                before = self.stats['events_applied']
+                self.step(poll_interval)
+                if self.stats['events_applied'] != before:
+                    totals = self.build_live_aggregates()['totals']
+                    print(f"[{datetime.now():%H:%M:%S}] 누적 chat {totals['chat_count']}개, "
+                          f"ideas {totals['idea_count']}개 (새 항목 {self.stats['events_applied'] - before}개)")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.publish(force=True)
+            if self.pubsub is not None:
+                self.pubsub.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Redis의 새 chat/idea 항목을 실시간으로 반영하여 분석 결과 갱신')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--redis-url', default=os.environ.get('REDIS_URL'),
+                        help='Redis URL (기본: 환경 변수 REDIS_URL, 예: rediss://:PASSWORD@HOST:PORT/0)')
+    source.add_argument('--standin', metavar='SNAPSHOT', help='snapshot으로 채운 로컬 Redis stand-in 사용')
+    parser.add_argument('--simulate', type=float, default=0.0, metavar='FRACTION',
+                        help='stand-in에서 chat/ideas 뒤쪽 비율을 빼 두었다가 실시간으로 추가 (예: 0.3)')
+    parser.add_argument('--events-per-second', type=float, default=20.0, help='--simulate 추가 속도')
+    parser.add_argument('--poll-interval', type=float, default=1.0, help='확인 주기 (초)')
+    parser.add_argument('--publish-interval', type=float, default=5.0, help='결과 파일 최소 갱신 간격 (초)')
+    parser.add_argument('--resync-interval', type=float, default=60.0, help='새 팀/제자리 변경 재확인 간격 (초)')
+    parser.add_argument('--duration', type=float, help='수집 시간 (초, 기본: 중단할 때까지)')
+    parser.add_argument('--no-keyspace', action='store_true', help='keyspace 알림 없이 polling만 사용')
+    args = parser.parse_args()
+
+    simulator = None
+    stop_event = threading.Event()
+    if args.standin:
+        if args.simulate:
+            client, held_back = StandinRedis.from_snapshot(args.standin, tail_fraction=args.simulate)
+            simulator = threading.Thread(target=simulate_activity,
+                                         args=(client, held_back, args.events_per_second, 0, stop_event),
+                                         daemon=True)
+        else:
+            client = StandinRedis.from_snapshot(args.standin)
+    elif args.redis_url:
+        client = connect_redis(args.redis_url)
+    else:
+        parser.error('--redis-url(또는 REDIS_URL) 또는 --standin이 필요합니다.')
+
+    ingestor = LiveIngestor(client, args.publish_interval, args.resync_interval, not args.no_keyspace)
+    if simulator is not None:
+        # 초기 로드가 끝난 뒤부터 항목을 추가해야 꼬리 수집을 확인할 수 있음
+        ingestor.start()
+        simulator.start()
+    ingestor.run(args.poll_interval, args.duration)
+    stop_event.set()
+    print(f"수집 종료: {json.dumps(ingestor.stats, ensure_ascii=False)}")
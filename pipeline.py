@@ -0,0 +1,269 @@
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+PIPELINE_STATE_PATH = '.pipeline_state.json'
+PIPELINE_REPORT_PATH = 'pipeline_report.json'
+PIPELINE_LOG_DIR = 'pipeline_logs'
+
+# 단계 정의: 실행할 스크립트와 인자, 입력(데이터 파일과 스크립트), 출력, 선행 단계
+# 스크립트가 import하는 로컬 모듈은 get_stage_inputs에서 자동으로 입력에 더한다.
+# export는 Redis 서버에서 덤프하므로 입력 파일이 없고 --export를 주거나 redis.json이 없을 때만 실행한다.
+STAGES = {
+    'export': {
+        'command': ['dump_to_json.py'],
+        'inputs': ['dump_to_json.py'],
+        'outputs': ['redis.json'],
+        'deps': [],
+        'profile': False
+    },
+    'structure': {
+        'command': ['analyze_redis.py'],
+        'inputs': ['redis.json', 'AI Team 인사 평가.csv', 'analyze_redis.py'],
+        'outputs': ['structured_teams.json', 'analysis_summary.json'],
+        'deps': ['export'],
+        'profile': True
+    },
+    'roles': {
+        'command': ['analyze_agent_roles.py', '--report', 'agent_roles_report.pdf'],
+        'inputs': ['structured_teams.json', 'analyze_agent_roles.py'],
+        'outputs': ['agent_roles_report.pdf'],
+        'deps': ['structure'],
+        'profile': True
+    },
+    'render': {
+        'command': ['visualize_teams.py'],
+        'inputs': ['structured_teams.json', 'visualize_teams.py'],
+        'outputs': ['team_visualizations'],
+        'deps': ['structure'],
+        'profile': True
+    },
+    'timeline': {
+        'command': ['activity_timeline.py'],
+        'inputs': ['structured_teams.json', 'activity_timeline.py'],
+        'outputs': ['activity_timeline.json'],
+        'deps': ['structure'],
+        'profile': False
+    }
+}
+
+def load_state(state_path=PIPELINE_STATE_PATH):
+    """이전 실행의 단계별 입력 지문과 파일 해시 캐시를 로드하는 함수"""
+    if os.path.exists(state_path):
+        with open(state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {'stages': {}, 'files': {}}
+
+def save_state(state, state_path=PIPELINE_STATE_PATH):
+    """단계별 입력 지문을 저장하는 함수"""
+    with open(state_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+
+def hash_file(path, file_cache):
+    """파일 내용의 SHA-256을 계산하는 함수 (크기와 수정 시각이 같으면 이전 해시 재사용)"""
+    stat = os.stat(path)
+    cached = file_cache.get(path)
+    if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+        return cached['sha256']
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    file_cache[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest.hexdigest()}
+    return file_cache[path]['sha256']
+
+def local_imports(script_path):
+    """스크립트가 (함수 안 import까지 포함해) 직접 또는 간접적으로 import하는 현재 폴더의 .py 파일 목록을 구하는 함수"""
+    found = []
+    pending = [script_path]
+    while pending:
+        with open(pending.pop(), 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                path = f"{name.split('.')[0]}.py"
+                if path != script_path and path not in found and os.path.isfile(path):
+                    found.append(path)
+                    pending.append(path)
+    return sorted(found)
+
+def get_stage_inputs(stage):
+    """단계 입력 목록에 입력 스크립트들이 import하는 로컬 모듈을 더한 목록을 반환하는 함수"""
+    inputs = list(stage['inputs'])
+    for path in stage['inputs']:
+        if path.endswith('.py') and os.path.isfile(path):
+            inputs += [module for module in local_imports(path) if module not in inputs]
+    return inputs
+
+def get_input_fingerprint(stage, file_cache, command_args=()):
+    """단계 입력 파일(로컬 import 모듈 포함)들의 해시와 실행 인자를 합친 지문을 만드는 함수 (없는 입력은 'missing')"""
+    digest = hashlib.sha256()
+    for path in get_stage_inputs(stage):
+        file_hash = hash_file(path, file_cache) if os.path.isfile(path) else 'missing'
+        digest.update(f"{path}:{file_hash}\n".encode('utf-8'))
+    digest.update(json.dumps(list(command_args), ensure_ascii=False).encode('utf-8'))
+    return digest.hexdigest()
+
+def outputs_exist(stage):
+    """단계의 출력 파일/폴더가 모두 존재하는지 확인하는 함수"""
+    return all(os.path.exists(path) for path in stage['outputs'])
+
+def order_stages(selected):
+    """선택된 단계를 선행 단계 순서(위상 정렬)로 정렬하는 함수"""
+    ordered = []
+    visiting = set()
+
+    def visit(name):
+        if name in ordered:
+            return
+        if name in visiting:
+            raise ValueError(f"단계 의존 관계에 순환이 있습니다: {name}")
+        visiting.add(name)
+        for dep in STAGES[name]['deps']:
+            if dep in selected:
+                visit(dep)
+        visiting.discard(name)
+        ordered.append(name)
+
+    for name in STAGES:
+        if name in selected:
+            visit(name)
+    return ordered
+
+def build_command(name, profile=False):
+    """단계 실행 명령을 만드는 함수 (profile이면 단계별 계측 리포트를 로그 폴더에 저장하도록 옵션 추가)"""
+    stage = STAGES[name]
+    command = [sys.executable] + list(stage['command'])
+    if profile and stage['profile']:
+        command += ['--profile', '--profile-report', os.path.join(PIPELINE_LOG_DIR, f"{name}_profile.json")]
+    return command
+
+def run_stage(name, command):
+    """단계 하나를 하위 프로세스로 실행하고 (종료 코드, 실행 시간, 로그 경로)를 반환하는 함수"""
+    log_path = os.path.join(PIPELINE_LOG_DIR, f"{name}.log")
+    env = dict(os.environ, MPLBACKEND=os.environ.get('MPLBACKEND', 'Agg'))
+    start = time.perf_counter()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        result = subprocess.run(command, stdout=log, stderr=subprocess.STDOUT, env=env)
+    return result.returncode, time.perf_counter() - start, log_path
+
+def run_pipeline(selected=None, force=False, export=False, jobs=2, dry_run=False, profile=False,
+                 state_path=PIPELINE_STATE_PATH):
+    """
+    단계 그래프를 실행하는 함수
+    입력 지문이 이전 실행과 같고 출력이 있는 단계는 건너뛰고, 선행 단계가 끝난 단계들은 jobs개까지 동시에 실행한다.
+    export=True이면 export 단계는 입력 변경 여부와 관계없이 항상 다시 덤프한다.
+    단계별 상태(ran/skipped/failed/blocked)와 실행 시간 목록을 반환한다.
+    """
+    selected = set(selected or STAGES)
+    # export는 명시적으로 요청했거나 snapshot이 없을 때만 실행
+    if not export and os.path.exists('redis.json'):
+        selected.discard('export')
+    ordered = order_stages(selected)
+
+    os.makedirs(PIPELINE_LOG_DIR, exist_ok=True)
+    state = load_state(state_path)
+    results = {name: {'stage': name, 'status': 'pending', 'seconds': 0.0} for name in ordered}
+    done = set()
+    running = {}
+
+    def ready_stages():
+        return [name for name in ordered
+                if results[name]['status'] == 'pending'
+                and all(dep in done or dep not in selected for dep in STAGES[name]['deps'])]
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        while True:
+            for name in ready_stages():
+                # 선행 단계가 실패한 경우 실행하지 않음
+                if any(results.get(dep, {}).get('status') in ('failed', 'blocked') for dep in STAGES[name]['deps']):
+                    results[name]['status'] = 'blocked'
+                    done.add(name)
+                    continue
+
+                stage = STAGES[name]
+                command = build_command(name, profile)
+                # 계측 옵션은 결과에 영향이 없으므로 지문에서 제외
+                fingerprint = get_input_fingerprint(stage, state['files'], build_command(name)[1:])
+                previous = state['stages'].get(name, {})
+                # export의 입력은 덤프 스크립트뿐이라 지문이 바뀌지 않으므로, 요청된 export는 항상 실행
+                forced = force or (name == 'export' and export)
+                if not forced and previous.get('inputs') == fingerprint and outputs_exist(stage):
+                    results[name]['status'] = 'skipped'
+                    done.add(name)
+                    print(f"[{name}] 입력 변경 없음 - 건너뜀")
+                    continue
+                if dry_run:
+                    results[name]['status'] = 'would_run'
+                    done.add(name)
+                    print(f"[{name}] 실행 예정: {' '.join(command[1:])}")
+                    continue
+
+                print(f"[{name}] 실행: {' '.join(command[1:])}")
+                results[name]['status'] = 'running'
+                running[executor.submit(run_stage, name, command)] = (name, fingerprint)
+
+            if not running:
+                if not ready_stages():
+                    break
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, fingerprint = running.pop(future)
+                returncode, seconds, log_path = future.result()
+                results[name].update({'seconds': seconds, 'log': log_path, 'returncode': returncode})
+                if returncode == 0:
+                    results[name]['status'] = 'ran'
+                    state['stages'][name] = {'inputs': fingerprint,
+                                             'finished_at': datetime.now().isoformat(timespec='seconds'),
+                                             'seconds': seconds}
+                    print(f"[{name}] 완료 ({seconds:.2f}초)")
+                else:
+                    results[name]['status'] = 'failed'
+                    print(f"[{name}] 실패 (종료 코드 {returncode}, 로그: {log_path})")
+                done.add(name)
+            save_state(state, state_path)
+
+    save_state(state, state_path)
+    return [results[name] for name in ordered]
+
+def print_pipeline_report(results):
+    """단계별 상태와 실행 시간을 표로 출력하는 함수"""
+    print("\n단계별 실행 결과:")
+    for result in results:
+        print(f"  {result['stage']:<10} {result['status']:<10} {result['seconds']:8.2f}초")
+    print(f"  {'합계':<10} {'':<10} {sum(result['seconds'] for result in results):8.2f}초")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='export → structure → (roles, render) 파이프라인 실행')
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), help='실행할 단계 (기본: 전체)')
+    parser.add_argument('--force', action='store_true', help='입력 변경 여부와 관계없이 모든 단계 실행')
+    parser.add_argument('--export', action='store_true', help='Redis에서 redis.json을 다시 덤프')
+    parser.add_argument('--jobs', type=int, default=2, help='동시에 실행할 최대 단계 수')
+    parser.add_argument('--dry-run', action='store_true', help='실행하지 않고 실행될 단계만 출력')
+    parser.add_argument('--profile', action='store_true', help='각 단계의 계측 리포트를 pipeline_logs/에 저장')
+    args = parser.parse_args()
+
+    results = run_pipeline(args.stages, args.force, args.export, args.jobs, args.dry_run, args.profile)
+    print_pipeline_report(results)
+
+    with open(PIPELINE_REPORT_PATH, 'w', encoding='utf-8') as f:
+        json.dump({'created_at': datetime.now().isoformat(timespec='seconds'), 'stages': results},
+                  f, ensure_ascii=False, indent=2)
+
+    if any(result['status'] in ('failed', 'blocked') for result in results):
+        sys.exit(1)
@@ -0,0 +1,346 @@
+import json
+import sys
+from dataclasses import dataclass, field
+from typing import Optional
+
+# 원본 데이터(JS JSON.stringify)와 같은 압축 JSON 형식
+_COMPACT = {'ensure_ascii': False, 'separators': (',', ':')}
+
+# 필드 순서 튜플 공유 (같은 순서의 agent hash는 같은 튜플 객체를 사용)
+_FIELD_ORDERS = {}
+
+def intern_text(value):
+    """문자열이면 sys.intern으로 공유 객체를 반환하는 함수 (ID, 역할명, 발신자, 메시지 유형 등 반복되는 값)"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _shared_order(keys):
+    """필드 순서 튜플을 공유 객체로 반환하는 함수"""
+    keys = tuple(intern_text(key) for key in keys)
+    return _FIELD_ORDERS.setdefault(keys, keys)
+
+class _DictCompat:
+    """
+    기존 dict 형태 코드(team['agents'], agent['agentId'] 등)가 그대로 동작하도록 JSON 키로 속성을 읽고 쓰게 하는 mixin
+    각 레코드는 _KEYS에 JSON 키 → 속성명 대응을 정의한다.
+    """
+    __slots__ = ()
+    _KEYS = {}
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self._KEYS[key])
+        except KeyError:
+            extra = getattr(self, 'extra', None)
+            if extra and key in extra:
+                return extra[key]
+            raise
+
+    def __setitem__(self, key, value):
+        if key in self._KEYS:
+            setattr(self, self._KEYS[key], value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        return key in self._KEYS or key in (getattr(self, 'extra', None) or {})
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return list(self._KEYS) + list(getattr(self, 'extra', None) or {})
+
+@dataclass(slots=True)
+class Evaluation(_DictCompat):
+    """아이디어 평가 (ideas 리스트 항목의 evaluations)"""
+    evaluator: str
+    timestamp: str
+    novelty: Optional[int]
+    completeness: Optional[int]
+    quality: Optional[int]
+    comment: str = ''
+    extra: Optional[dict] = None
+
+    _KEYS = {'evaluator': 'evaluator', 'timestamp': 'timestamp', 'comment': 'comment'}
+
+    @property
+    def scores(self):
+        return {'novelty': self.novelty, 'completeness': self.completeness, 'quality': self.quality}
+
+    def __getitem__(self, key):
+        if key == 'scores':
+            return self.scores
+        return _DictCompat.__getitem__(self, key)
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        scores = data.pop('scores', None) or {}
+        record = cls(intern_text(data.pop('evaluator', None)), data.pop('timestamp', None),
+                     scores.get('novelty'), scores.get('completeness'), scores.get('quality'),
+                     data.pop('comment', ''))
+        if data:
+            record.extra = data
+        return record
+
+    def to_dict(self):
+        result = {'evaluator': self.evaluator, 'timestamp': self.timestamp, 'scores': self.scores,
+                  'comment': self.comment}
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+@dataclass(slots=True)
+class Idea(_DictCompat):
+    """아이디어 (team:*:ideas 리스트 항목). behavior/structure는 원본처럼 JSON 문자열로 보관"""
+    id: int
+    author: str
+    timestamp: str
+    object: str
+    function: str
+    behavior: str
+    structure: str
+    evaluations: list = field(default_factory=list)
+    extra: Optional[dict] = None
+
+    _KEYS = {'id': 'id', 'author': 'author', 'timestamp': 'timestamp', 'evaluations': 'evaluations'}
+
+    @property
+    def content(self):
+        return {'object': self.object, 'function': self.function, 'behavior': self.behavior,
+                'structure': self.structure}
+
+    def __getitem__(self, key):
+        if key == 'content':
+            return self.content
+        return _DictCompat.__getitem__(self, key)
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        content = data.pop('content', None) or {}
+        record = cls(data.pop('id', None), intern_text(data.pop('author', None)), data.pop('timestamp', None),
+                     content.get('object'), content.get('function'), content.get('behavior'),
+                     content.get('structure'),
+                     [Evaluation.from_dict(evaluation) for evaluation in data.pop('evaluations', [])])
+        if data:
+            record.extra = data
+        return record
+
+    @classmethod
+    def from_json(cls, line):
+        return cls.from_dict(json.loads(line))
+
+    def to_dict(self):
+        result = {'id': self.id, 'author': self.author, 'timestamp': self.timestamp, 'content': self.content,
+                  'evaluations': [evaluation.to_dict() for evaluation in self.evaluations]}
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+    def to_json(self):
+        """structured_teams.json/redis.json과 같은 형식의 JSON 문자열로 변환하는 함수"""
+        return json.dumps(self.to_dict(), **_COMPACT)
+
+@dataclass(slots=True)
+class ChatEvent(_DictCompat):
+    """chat 메시지 (team:*:chat 리스트 항목). payload는 필요할 때만 디코딩하도록 압축 JSON 문자열로 보관"""
+    id: int
+    timestamp: str
+    sender: str
+    type: str
+    payload_json: str
+    extra: Optional[dict] = None
+
+    _KEYS = {'id': 'id', 'timestamp': 'timestamp', 'sender': 'sender', 'type': 'type'}
+
+    @property
+    def payload(self):
+        return json.loads(self.payload_json)
+
+    def __getitem__(self, key):
+        if key == 'payload':
+            return self.payload
+        return _DictCompat.__getitem__(self, key)
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        record = cls(data.pop('id', None), data.pop('timestamp', None), intern_text(data.pop('sender', None)),
+                     intern_text(data.pop('type', None)), json.dumps(data.pop('payload', None), **_COMPACT))
+        if data:
+            record.extra = data
+        return record
+
+    @classmethod
+    def from_json(cls, line):
+        return cls.from_dict(json.loads(line))
+
+    def to_dict(self):
+        result = {'id': self.id, 'timestamp': self.timestamp, 'sender': self.sender, 'type': self.type,
+                  'payload': self.payload}
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+    def to_json(self):
+        """원본과 같은 형식의 JSON 문자열로 변환하는 함수 (payload는 디코딩하지 않고 그대로 이어 붙임)"""
+        head = {'id': self.id, 'timestamp': self.timestamp, 'sender': self.sender, 'type': self.type}
+        text = json.dumps(head, **_COMPACT)[:-1] + ',"payload":' + self.payload_json
+        if self.extra:
+            text += ',' + json.dumps(self.extra, **_COMPACT)[1:-1]
+        return text + '}'
+
+# agent:* hash의 알려진 필드 (그 밖의 필드는 extra에 보관)
+AGENT_FIELDS = ('id', 'name', 'professional', 'age', 'gender', 'education', 'major', 'nationality', 'skills',
+                'personality', 'workStyle', 'preferences', 'dislikes', 'value', 'personaSummary', 'userId',
+                'createdAt', 'updatedAt')
+
+@dataclass(slots=True)
+class Agent(_DictCompat):
+    """agent 페르소나 (agent:* hash). 원본 hash의 필드 순서를 공유 튜플로 기억해 같은 순서로 되돌린다."""
+    id: Optional[str] = None
+    name: Optional[str] = None
+    professional: Optional[str] = None
+    age: Optional[str] = None
+    gender: Optional[str] = None
+    education: Optional[str] = None
+    major: Optional[str] = None
+    nationality: Optional[str] = None
+    skills: Optional[str] = None
+    personality: Optional[str] = None
+    workStyle: Optional[str] = None
+    preferences: Optional[str] = None
+    dislikes: Optional[str] = None
+    value: Optional[str] = None
+    personaSummary: Optional[str] = None
+    userId: Optional[str] = None
+    createdAt: Optional[str] = None
+    updatedAt: Optional[str] = None
+    field_order: tuple = ()
+    extra: Optional[dict] = None
+
+    _KEYS = {name: name for name in AGENT_FIELDS}
+
+    def __getitem__(self, key):
+        # hash에 없던 필드는 원본 dict처럼 KeyError
+        if key in self._KEYS and key not in self.field_order:
+            raise KeyError(key)
+        return _DictCompat.__getitem__(self, key)
+
+    def __contains__(self, key):
+        return key in self.field_order
+
+    def keys(self):
+        return list(self.field_order)
+
+    @classmethod
+    def from_dict(cls, data):
+        record = cls(field_order=_shared_order(data))
+        extra = {}
+        for key, value in data.items():
+            if key in cls._KEYS:
+                setattr(record, key, intern_text(value) if key in ('id', 'userId', 'professional') else value)
+            else:
+                extra[key] = value
+        if extra:
+            record.extra = extra
+        return record
+
+    def to_dict(self):
+        extra = self.extra or {}
+        return {key: (getattr(self, key) if key in self._KEYS else extra[key]) for key in self.field_order}
+
+@dataclass(slots=True)
+class Member(_DictCompat):
+    """팀의 agent 멤버 (structured_teams.json의 agents 항목)"""
+    agent_id: str
+    node_key: str
+    roles: tuple
+    is_leader: bool
+    agent: Optional[Agent] = None
+
+    _KEYS = {'agentId': 'agent_id', 'node_key': 'node_key', 'roles': 'roles', 'isLeader': 'is_leader',
+             'agent_info': 'agent'}
+
+    @classmethod
+    def from_dict(cls, data):
+        agent_info = data.get('agent_info')
+        return cls(intern_text(data['agentId']), intern_text(data['node_key']),
+                   tuple(intern_text(role) for role in data.get('roles', [])), bool(data.get('isLeader', False)),
+                   Agent.from_dict(agent_info) if agent_info is not None else None)
+
+    def to_dict(self):
+        return {'agentId': self.agent_id, 'node_key': self.node_key, 'roles': list(self.roles),
+                'isLeader': self.is_leader, 'agent_info': self.agent.to_dict() if self.agent else None}
+
+@dataclass(slots=True)
+class Team(_DictCompat):
+    """팀 (analyze_redis_data 결과 / structured_teams.json 항목)"""
+    team_id: str
+    team_info: dict
+    owner_info: Optional[dict]
+    agents: list = field(default_factory=list)
+    ideas: list = field(default_factory=list)
+    chat: list = field(default_factory=list)
+    feedback_sessions: list = field(default_factory=list)
+    evaluations: Optional[list] = None
+    extra: Optional[dict] = None
+
+    _KEYS = {'team_id': 'team_id', 'team_info': 'team_info', 'owner_info': 'owner_info', 'agents': 'agents',
+             'ideas': 'ideas', 'chat': 'chat', 'feedback_sessions': 'feedback_sessions', 'evaluations': 'evaluations'}
+
+    @classmethod
+    def from_dict(cls, data, team_id=None):
+        """structured_teams.json 항목(또는 analyze_redis_data의 팀 dict)을 레코드로 변환하는 함수"""
+        data = dict(data)
+        record = cls(
+            intern_text(data.pop('team_id', team_id)),
+            data.pop('team_info', {}),
+            data.pop('owner_info', None),
+            [member if isinstance(member, Member) else Member.from_dict(member) for member in data.pop('agents', [])],
+            [Idea.from_json(idea) if isinstance(idea, str) else idea for idea in data.pop('ideas', [])],
+            [ChatEvent.from_json(message) if isinstance(message, str) else message for message in data.pop('chat', [])],
+            data.pop('feedback_sessions', []),
+            data.pop('evaluations', None)
+        )
+        if data:
+            record.extra = data
+        return record
+
+    def to_dict(self):
+        """structured_teams.json 항목과 같은 형태(chat/ideas는 JSON 문자열)의 dict로 변환하는 함수"""
+        result = {'team_id': self.team_id, 'team_info': self.team_info, 'owner_info': self.owner_info,
+                  'agents': [member.to_dict() for member in self.agents],
+                  'ideas': [idea.to_json() for idea in self.ideas],
+                  'chat': [message.to_json() for message in self.chat],
+                  'feedback_sessions': self.feedback_sessions}
+        if self.evaluations is not None:
+            result['evaluations'] = self.evaluations
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+def record_to_json(value):
+    """
+    json.dump(default=...)에 넘기는 변환 함수
+    레코드가 섞인 팀 데이터를 기존 structured_teams.json과 같은 모양으로 저장한다 (chat/ideas는 JSON 문자열).
+    """
+    if isinstance(value, (ChatEvent, Idea)):
+        return value.to_json()
+    if isinstance(value, (Team, Member, Agent, Evaluation)):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def teams_from_json(teams_list):
+    """structured_teams.json의 팀 리스트를 Team 레코드 리스트로 변환하는 함수"""
+    return [Team.from_dict(team) for team in teams_list]
+
+def teams_to_json(teams):
+    """Team 레코드 리스트를 structured_teams.json 형태의 리스트로 변환하는 함수"""
+    return [team.to_dict() for team in teams]
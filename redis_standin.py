@@ -0,0 +1,285 @@
+import fnmatch
+import json
+import queue
+import random
+import threading
+import time
+
+from snapshot import load_snapshot
+
+class StandinRedis:
+    """
+    로컬 테스트용 Redis 대체 객체 (redis-py 클라이언트 중 이 저장소에서 쓰는 명령만 구현)
+    redis-py와 같이 bytes를 반환하며, config_set('notify-keyspace-events', 'Kl' 등)을 켜면
+    쓰기 명령마다 __keyspace@0__:<key> 채널로 이벤트를 발행한다.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.store = {}
+        self.ttls = {}
+        self.notify_flags = ''
+        self.subscribers = []
+
+    @classmethod
+    def from_snapshot(cls, path, tail_fraction=None):
+        """
+        redis.json(또는 redis.jsonl) snapshot으로 채운 stand-in을 만드는 함수
+        tail_fraction을 주면 team:*:chat / team:*:ideas 리스트의 뒤쪽 비율만큼을 빼 두고
+        (stand-in, {key: 빠진 항목 리스트})를 반환한다 (simulate_activity로 나중에 추가하는 용도).
+        """
+        standin = cls()
+        held_back = {}
+        data, _ = load_snapshot(path)
+        for key, entry in data.items():
+            value = entry['value']
+            if entry['type'] == 'list' and tail_fraction and _is_event_list(key):
+                split = len(value) - int(len(value) * tail_fraction)
+                value, held_back[key] = value[:split], value[split:]
+            standin._load_entry(key, entry['type'], value, entry.get('ttl', -1))
+        return (standin, held_back) if tail_fraction else standin
+
+    def _load_entry(self, key, value_type, value, ttl=-1):
+        if value_type == 'string':
+            self.store[key] = ('string', _to_bytes(value))
+        elif value_type == 'hash':
+            self.store[key] = ('hash', {_to_bytes(k): _to_bytes(v) for k, v in value.items()})
+        elif value_type == 'list':
+            self.store[key] = ('list', [_to_bytes(item) for item in value])
+        elif value_type == 'set':
+            self.store[key] = ('set', {_to_bytes(item) for item in value})
+        elif value_type == 'zset':
+            self.store[key] = ('zset', {_to_bytes(member): score for score, member in value})
+        else:
+            return
+        self.ttls[key] = ttl
+
+    # 읽기 명령
+
+    def scan_iter(self, match=None, count=None):
+        pattern = _to_str(match) if match is not None else None
+        with self.lock:
+            keys = list(self.store)
+        for key in keys:
+            if pattern is None or fnmatch.fnmatchcase(key, pattern):
+                yield key.encode('utf-8')
+
+    def exists(self, key):
+        return int(_to_str(key) in self.store)
+
+    def type(self, key):
+        with self.lock:
+            entry = self.store.get(_to_str(key))
+        return (entry[0] if entry else 'none').encode('utf-8')
+
+    def ttl(self, key):
+        key = _to_str(key)
+        return self.ttls.get(key, -1) if key in self.store else -2
+
+    def get(self, key):
+        return self._value(key, 'string')
+
+    def hgetall(self, key):
+        return dict(self._value(key, 'hash') or {})
+
+    def hget(self, key, field):
+        return (self._value(key, 'hash') or {}).get(_to_bytes(field))
+
+    def llen(self, key):
+        return len(self._value(key, 'list') or [])
+
+    def lrange(self, key, start, end):
+        items = self._value(key, 'list') or []
+        length = len(items)
+        start = max(start + length, 0) if start < 0 else start
+        end = end + length if end < 0 else min(end, length - 1)
+        return list(items[start:end + 1])
+
+    def smembers(self, key):
+        return set(self._value(key, 'set') or set())
+
+    def zrange(self, key, start, end, withscores=False):
+        members = sorted((self._value(key, 'zset') or {}).items(), key=lambda item: (item[1], item[0]))
+        end = len(members) if end == -1 else end + 1
+        members = members[start:end]
+        return [(member, score) for member, score in members] if withscores else [member for member, _ in members]
+
+    def _value(self, key, expected_type):
+        with self.lock:
+            entry = self.store.get(_to_str(key))
+            if entry is None:
+                return None
+            if entry[0] != expected_type:
+                raise TypeError(f"WRONGTYPE {_to_str(key)}: {entry[0]} (expected {expected_type})")
+            return entry[1]
+
+    # 쓰기 명령
+
+    def set(self, key, value):
+        key = _to_str(key)
+        with self.lock:
+            self.store[key] = ('string', _to_bytes(value))
+            self.ttls[key] = -1
+        self._notify(key, 'set', '$')
+        return True
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        key = _to_str(key)
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+        with self.lock:
+            entry = self.store.setdefault(key, ('hash', {}))
+            added = 0
+            for name, item in items.items():
+                added += _to_bytes(name) not in entry[1]
+                entry[1][_to_bytes(name)] = _to_bytes(item)
+            self.ttls.setdefault(key, -1)
+        self._notify(key, 'hset', 'h')
+        return added
+
+    def rpush(self, key, *values):
+        key = _to_str(key)
+        with self.lock:
+            entry = self.store.setdefault(key, ('list', []))
+            entry[1].extend(_to_bytes(value) for value in values)
+            self.ttls.setdefault(key, -1)
+            length = len(entry[1])
+        self._notify(key, 'rpush', 'l')
+        return length
+
+    def lset(self, key, index, value):
+        key = _to_str(key)
+        with self.lock:
+            self.store[key][1][index] = _to_bytes(value)
+        self._notify(key, 'lset', 'l')
+        return True
+
+    def delete(self, *keys):
+        removed = 0
+        for key in map(_to_str, keys):
+            with self.lock:
+                removed += self.store.pop(key, None) is not None
+                self.ttls.pop(key, None)
+            self._notify(key, 'del', 'g')
+        return removed
+
+    # keyspace 알림
+
+    def config_set(self, name, value):
+        if name == 'notify-keyspace-events':
+            self.notify_flags = value
+        return True
+
+    def config_get(self, name):
+        return {name: self.notify_flags} if name == 'notify-keyspace-events' else {}
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        subscriber = _StandinPubSub(self)
+        with self.lock:
+            self.subscribers.append(subscriber)
+        return subscriber
+
+    def _notify(self, key, event, type_flag):
+        flags = self.notify_flags
+        # 'K'(keyspace 채널)와 명령 유형 플래그(또는 전체 'A')가 모두 켜져 있어야 발행
+        if 'K' not in flags or not (type_flag in flags or 'A' in flags):
+            return
+        channel = f"__keyspace@0__:{key}"
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            subscriber._publish(channel, event)
+
+class _StandinPubSub:
+    """StandinRedis.pubsub()이 반환하는 구독 객체 (psubscribe/get_message/close만 구현)"""
+
+    def __init__(self, standin):
+        self.standin = standin
+        self.patterns = []
+        self.messages = queue.Queue()
+
+    def psubscribe(self, *patterns):
+        self.patterns.extend(_to_str(pattern) for pattern in patterns)
+
+    def _publish(self, channel, event):
+        for pattern in self.patterns:
+            if fnmatch.fnmatchcase(channel, pattern):
+                self.messages.put({'type': 'pmessage', 'pattern': pattern.encode('utf-8'),
+                                   'channel': channel.encode('utf-8'), 'data': event.encode('utf-8')})
+                return
+
+    def get_message(self, ignore_subscribe_messages=True, timeout=0.0):
+        try:
+            return self.messages.get(timeout=timeout) if timeout else self.messages.get_nowait()
+        except queue.Empty:
+            return None
+
+    def close(self):
+        with self.standin.lock:
+            if self in self.standin.subscribers:
+                self.standin.subscribers.remove(self)
+
+def _is_event_list(key):
+    return key.startswith('team:') and (key.endswith(':chat') or key.endswith(':ideas'))
+
+def _to_bytes(value):
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode('utf-8')
+
+def _to_str(value):
+    return value.decode('utf-8') if isinstance(value, bytes) else str(value)
+
+def simulate_activity(standin, held_back, events_per_second=20.0, seed=0, stop_event=None):
+    """
+    빼 둔 chat/ideas 항목을 원래 순서대로 stand-in 리스트에 RPUSH하여 진행 중인 세션을 흉내 내는 함수
+    키 사이의 순서는 무작위로 섞되 같은 키 안의 순서는 유지한다. 추가한 항목 수를 반환한다.
+    """
+    rng = random.Random(seed)
+    pending = {key: list(items) for key, items in held_back.items() if items}
+    pushed = 0
+    while pending and not (stop_event and stop_event.is_set()):
+        key = rng.choice(sorted(pending))
+        standin.rpush(key, pending[key].pop(0))
+        pushed += 1
+        if not pending[key]:
+            del pending[key]
+        if events_per_second:
+            time.sleep(1.0 / events_per_second)
+    return pushed
+
+def dump_entries(client, match=None):
+    """클라이언트(Redis 또는 stand-in)의 키를 snapshot 형식 {key: {type, ttl, value}}으로 읽는 함수 (dump_to_json.py와 같은 변환)"""
+    out = {}
+    for raw_key in client.scan_iter(match=match):
+        key = _to_str(raw_key)
+        rtype = _to_str(client.type(key))
+        ttl = client.ttl(key)
+        if rtype == "string":
+            val = _to_str(client.get(key))
+        elif rtype == "hash":
+            val = {_to_str(k): _to_str(v) for k, v in client.hgetall(key).items()}
+        elif rtype == "list":
+            val = [_to_str(x) for x in client.lrange(key, 0, -1)]
+        elif rtype == "set":
+            val = [_to_str(x) for x in client.smembers(key)]
+        elif rtype == "zset":
+            val = [[s, _to_str(m)] for m, s in client.zrange(key, 0, -1, withscores=True)]
+        else:
+            val = "<unsupported>"
+        out[key] = {"type": rtype, "ttl": ttl, "value": val}
+    return out
+
+if __name__ == "__main__":
+    # 간단한 확인: snapshot을 올리고 키 유형별 개수를 출력
+    import argparse
+    from collections import Counter
+    from snapshot import find_snapshot_path
+
+    parser = argparse.ArgumentParser(description='snapshot으로 Redis stand-in을 채워 키 유형별 개수를 출력')
+    parser.add_argument('--snapshot', default=None, help='snapshot 경로 (기본: redis.json 또는 redis.jsonl)')
+    args = parser.parse_args()
+    standin = StandinRedis.from_snapshot(args.snapshot or find_snapshot_path())
+    counts = Counter(_to_str(standin.type(key)) for key in standin.scan_iter())
+    print(json.dumps(dict(counts), ensure_ascii=False))
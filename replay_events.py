@@ -0,0 +1,262 @@
+import argparse
+import heapq
+import itertools
+import json
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+
+from agent_queues import AGENT_QUEUE_PREFIX
+from feedback_sessions import FEEDBACK_SESSION_PREFIX
+from live_ingest import LiveIngestor
+from redis_standin import StandinRedis
+from snapshot import find_snapshot_path, load_snapshot
+
+# 같은 시각의 이벤트는 원본 저장 순서와 비슷하게 chat → ideas → 피드백 세션 → agent 큐 순으로 내보냄
+SOURCE_ORDER = {'chat': 0, 'ideas': 1, 'feedback_session': 2, 'agent_queue': 3}
+SOURCE_NAMES = {order: name for name, order in SOURCE_ORDER.items()}
+
+def parse_time_ms(timestamp):
+    """ISO 8601 시각 문자열을 epoch 밀리초로 변환하는 함수 (없거나 잘못된 값은 None)"""
+    if not timestamp:
+        return None
+    try:
+        return int(datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp() * 1000)
+    except (TypeError, ValueError):
+        return None
+
+def _sorted_stream(events):
+    """(시각, 출처 순서, 순번, ...) 이벤트 목록을 시간순으로 정렬해 돌려주는 함수 (같은 시각은 원래 순서 유지)"""
+    return iter(sorted(events, key=lambda event: event[:3]))
+
+def iter_list_events(key, items, source, sequence):
+    """chat/ideas/agent 큐 리스트의 항목을 (시각, 출처, 순번, key, 'rpush', 항목) 이벤트로 만드는 함수"""
+    events = []
+    for item in items:
+        try:
+            timestamp = parse_time_ms(json.loads(item).get('timestamp'))
+        except (ValueError, AttributeError):
+            timestamp = None
+        if timestamp is not None:
+            events.append((timestamp, SOURCE_ORDER[source], next(sequence), key, 'rpush', item))
+    return _sorted_stream(events)
+
+def iter_feedback_session_events(key, raw_session, sequence):
+    """
+    피드백 세션의 메시지마다 (시각, 출처, 순번, key, 'set', 그 시점까지의 세션 JSON) 이벤트를 만드는 함수
+    세션은 string 키 하나에 통째로 저장되므로 메시지가 추가될 때마다 키를 다시 쓰는 방식으로 재생한다.
+    """
+    try:
+        session = json.loads(raw_session)
+    except ValueError:
+        return iter(())
+    messages = session.get('messages') or []
+    events = []
+    for index, message in enumerate(messages):
+        timestamp = parse_time_ms(message.get('timestamp'))
+        if timestamp is None:
+            continue
+        partial = dict(session, messages=messages[:index + 1])
+        # 마지막 메시지 전까지는 진행 중인 세션으로 보이도록 상태 표시
+        if index + 1 < len(messages) and 'status' in session:
+            partial['status'] = 'active'
+        events.append((timestamp, SOURCE_ORDER['feedback_session'], next(sequence), key, 'set',
+                       json.dumps(partial, ensure_ascii=False, separators=(',', ':'))))
+    return _sorted_stream(events)
+
+def build_event_stream(data):
+    """
+    snapshot의 시각이 있는 이벤트(chat, ideas, 피드백 세션 메시지, agent 큐 액션)를
+    출처별로 정렬한 뒤 heapq.merge로 하나의 시간순 스트림으로 합치는 함수 ((스트림, 이벤트 key 집합) 반환)
+    """
+    sequence = itertools.count()
+    streams = []
+    event_keys = set()
+    for key, value in data.items():
+        if value['type'] == 'list' and key.startswith('team:') and key.endswith(':chat'):
+            streams.append(iter_list_events(key, value['value'], 'chat', sequence))
+        elif value['type'] == 'list' and key.startswith('team:') and key.endswith(':ideas'):
+            streams.append(iter_list_events(key, value['value'], 'ideas', sequence))
+        elif value['type'] == 'list' and key.startswith(AGENT_QUEUE_PREFIX):
+            streams.append(iter_list_events(key, value['value'], 'agent_queue', sequence))
+        elif value['type'] == 'string' and key.startswith(FEEDBACK_SESSION_PREFIX):
+            streams.append(iter_feedback_session_events(key, value['value'], sequence))
+        else:
+            continue
+        event_keys.add(key)
+    return heapq.merge(*streams), event_keys
+
+class MemorySink:
+    """이벤트를 메모리에서 세기만 하는 대상 (재생 엔진 자체의 처리량 측정용, callback으로 임의 처리 연결 가능)"""
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.counts = Counter()
+
+    def apply(self, event):
+        self.counts[SOURCE_NAMES[event[1]]] += 1
+        if self.callback is not None:
+            self.callback(event)
+
+class StandinTarget:
+    """Redis stand-in에 이벤트를 쓰는 대상 (이벤트 key는 비운 상태에서 시작)"""
+
+    def __init__(self, standin, event_keys):
+        self.standin = standin
+        self.standin.delete(*event_keys)
+
+    def apply(self, event):
+        _, _, _, key, op, value = event
+        if op == 'rpush':
+            self.standin.rpush(key, value)
+        else:
+            self.standin.set(key, value)
+
+def make_standin_target(data, event_keys):
+    """snapshot 전체를 올린 stand-in에서 이벤트 key만 비워 재생 대상을 만드는 함수"""
+    standin = StandinRedis()
+    for key, entry in data.items():
+        standin._load_entry(key, entry['type'], entry['value'], entry.get('ttl', -1))
+    return StandinTarget(standin, event_keys)
+
+def replay(events, apply, speed=60.0, max_gap_s=None, limit=None, clock=time.perf_counter, sleep=time.sleep):
+    """
+    시간순 이벤트를 speed배 빠르기로 apply에 전달하는 함수
+    speed가 0이면 기다리지 않고 최대한 빠르게 보내며, max_gap_s를 주면 그보다 긴 (원래 시간 기준) 공백을 줄인다.
+    내보낸 수, 걸린 시간, 처리율, 예정 시각 대비 지연(초) 통계를 반환한다.
+    """
+    lateness = []
+    first_ms = previous_ms = None
+    skipped_ms = 0
+    count = 0
+    start = clock()
+    for event in events:
+        if limit is not None and count >= limit:
+            break
+        timestamp = event[0]
+        if first_ms is None:
+            first_ms = previous_ms = timestamp
+        gap = timestamp - previous_ms
+        if max_gap_s is not None and gap > max_gap_s * 1000:
+            skipped_ms += gap - max_gap_s * 1000
+        previous_ms = timestamp
+
+        due = (timestamp - first_ms - skipped_ms) / 1000 / speed if speed else 0.0
+        if speed:
+            wait = due - (clock() - start)
+            if wait > 0:
+                sleep(wait)
+        apply(event)
+        lateness.append(clock() - start - due)
+        count += 1
+
+    wall_s = clock() - start
+    lateness = np.array(lateness) if lateness else np.zeros(1)
+    return {
+        'events': count,
+        'wall_s': wall_s,
+        'events_per_s': count / wall_s if wall_s > 0 else None,
+        'simulated_span_s': (previous_ms - first_ms) / 1000 if first_ms is not None else 0.0,
+        'compressed_gap_s': skipped_ms / 1000,
+        'speed': speed,
+        'lateness_p50_s': float(np.percentile(lateness, 50)),
+        'lateness_p99_s': float(np.percentile(lateness, 99)),
+        'lateness_max_s': float(lateness.max())
+    }
+
+def run_with_ingest(target, events, speed, max_gap_s, limit, poll_interval=0.2, use_keyspace=True,
+                    catch_up_timeout=30.0):
+    """
+    stand-in에 재생하는 동안 live_ingest.LiveIngestor를 함께 돌려 수집 처리량과 재생 종료 후 따라잡는 시간을 측정하는 함수
+    결과 파일은 임시 폴더에 쓴다.
+    """
+    pushed = Counter()
+
+    def apply(event):
+        target.apply(event)
+        if event[4] == 'rpush' and event[3].startswith('team:'):
+            pushed['team_lists'] += 1
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        ingestor = LiveIngestor(target.standin, min_publish_interval=1.0, use_keyspace=use_keyspace,
+                                teams_path=f"{output_dir}/structured_teams.json",
+                                summary_path=f"{output_dir}/analysis_summary.json",
+                                aggregates_path=f"{output_dir}/live_aggregates.json")
+        ingestor.start()
+        stop_event = threading.Event()
+        thread = threading.Thread(target=ingestor.run, args=(poll_interval, None, stop_event), daemon=True)
+        thread.start()
+
+        report = replay(events, apply, speed, max_gap_s, limit)
+        # 팀 리스트 이벤트는 모두 수집 대상 (제외된 소유자의 팀은 수집하지 않으므로 그만큼은 기다리지 않음)
+        expected = pushed['team_lists'] - _excluded_events(ingestor, target.standin, pushed)
+        catch_up_start = time.perf_counter()
+        while ingestor.stats['events_applied'] < expected and time.perf_counter() - catch_up_start < catch_up_timeout:
+            time.sleep(0.01)
+        catch_up_s = time.perf_counter() - catch_up_start
+        stop_event.set()
+        thread.join()
+
+    report['ingest'] = dict(ingestor.stats, expected_events=expected, catch_up_s=catch_up_s,
+                            mode='keyspace' if ingestor.pubsub is not None else 'polling')
+    return report
+
+def _excluded_events(ingestor, standin, pushed):
+    """수집기가 추적하지 않는 팀 리스트(제외된 소유자)에 들어간 항목 수를 세는 함수"""
+    excluded = 0
+    for raw_key in standin.scan_iter(match='team:*'):
+        key = raw_key.decode('utf-8')
+        if (key.endswith(':chat') or key.endswith(':ideas')) and key not in ingestor.list_owners:
+            excluded += standin.llen(key)
+    return excluded
+
+def print_report(report):
+    """재생 결과를 출력하는 함수"""
+    print(f"이벤트 {report['events']}개를 {report['wall_s']:.2f}초에 재생 "
+          f"({report['events_per_s'] or 0:.1f} events/s, 원래 {report['simulated_span_s'] / 3600:.1f}시간 분량, "
+          f"압축한 공백 {report['compressed_gap_s'] / 3600:.1f}시간)")
+    print(f"예정 시각 대비 지연: p50 {report['lateness_p50_s'] * 1000:.2f}ms, "
+          f"p99 {report['lateness_p99_s'] * 1000:.2f}ms, 최대 {report['lateness_max_s'] * 1000:.2f}ms")
+    if 'counts' in report:
+        print(f"유형별: {json.dumps(report['counts'], ensure_ascii=False)}")
+    if 'ingest' in report:
+        ingest = report['ingest']
+        print(f"수집({ingest['mode']}): {ingest['events_applied']}/{ingest['expected_events']}개 반영, "
+              f"꼬리 조회 {ingest['tail_fetches']}회, 재생 종료 후 {ingest['catch_up_s'] * 1000:.1f}ms에 따라잡음, "
+              f"결과 갱신 {ingest['publishes']}회")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='snapshot의 시각 있는 이벤트를 시간순으로 합쳐 가속 재생')
+    parser.add_argument('--snapshot', help='snapshot 경로 (기본: redis.json 또는 redis.jsonl)')
+    parser.add_argument('--speed', type=float, default=60.0, help='재생 배속 (0이면 최대 속도)')
+    parser.add_argument('--max-gap', type=float, help='이보다 긴 공백(원래 시간 기준, 초)은 이 길이로 줄임')
+    parser.add_argument('--limit', type=int, help='재생할 최대 이벤트 수')
+    parser.add_argument('--target', choices=['memory', 'standin'], default='memory', help='이벤트를 보낼 대상')
+    parser.add_argument('--ingest', action='store_true', help='stand-in 대상에 live_ingest 수집기를 함께 실행')
+    parser.add_argument('--no-keyspace', action='store_true', help='--ingest에서 keyspace 알림 대신 polling 사용')
+    parser.add_argument('--json', help='결과를 저장할 JSON 경로')
+    args = parser.parse_args()
+
+    data, _ = load_snapshot(args.snapshot or find_snapshot_path())
+    events, event_keys = build_event_stream(data)
+
+    if args.target == 'memory':
+        sink = MemorySink()
+        report = replay(events, sink.apply, args.speed, args.max_gap, args.limit)
+        report['counts'] = dict(sink.counts)
+    else:
+        target = make_standin_target(data, event_keys)
+        if args.ingest:
+            report = run_with_ingest(target, events, args.speed, args.max_gap, args.limit,
+                                     use_keyspace=not args.no_keyspace)
+        else:
+            report = replay(events, target.apply, args.speed, args.max_gap, args.limit)
+
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
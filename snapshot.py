@@ -0,0 +1,141 @@
+import json
+import os
+from json.decoder import scanstring
+
+SNAPSHOT_PATH = 'redis.json'
+# 스트리밍용 형식: 한 줄에 {"key": ..., "type": ..., "ttl": ..., "value": ...} 항목 하나
+SNAPSHOT_JSONL_PATH = 'redis.jsonl'
+
+_WHITESPACE = ' \t\n\r'
+
+def _skip_whitespace(text, pos):
+    """공백 문자를 건너뛴 위치를 반환하는 함수"""
+    while pos < len(text) and text[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+def find_snapshot_path():
+    """현재 폴더의 snapshot 경로를 반환하는 함수 (redis.json이 없고 redis.jsonl이 있으면 redis.jsonl)"""
+    if not os.path.exists(SNAPSHOT_PATH) and os.path.exists(SNAPSHOT_JSONL_PATH):
+        return SNAPSHOT_JSONL_PATH
+    return SNAPSHOT_PATH
+
+def _iter_jsonl_entries(path, lazy_prefixes=()):
+    """redis.jsonl을 한 줄씩 읽어 (key, 레코드, 바이트 오프셋, 바이트 길이)를 돌려주는 함수 (오프셋은 줄 전체를 가리킴)"""
+    offset = 0
+    with open(path, 'rb') as f:
+        for raw_line in f:
+            line = raw_line.rstrip(b'\r\n')
+            line_offset = offset
+            offset += len(raw_line)
+            if not line.strip():
+                continue
+            text = line.decode('utf-8')
+            # lazy 키는 줄 맨 앞의 key만 읽고 나머지는 디코딩하지 않음
+            if text.startswith('{"key":'):
+                key, _ = scanstring(text, _skip_whitespace(text, len('{"key":')) + 1)
+                if key.startswith(lazy_prefixes):
+                    yield key, None, line_offset, len(line)
+                    continue
+            record = json.loads(text)
+            key = record.pop('key')
+            if key.startswith(lazy_prefixes):
+                record = None
+            yield key, record, line_offset, len(line)
+
+def iter_snapshot_entries(path=SNAPSHOT_PATH, lazy_prefixes=()):
+    """
+    redis.json의 최상위 항목을 앞에서부터 하나씩 디코딩하여 (key, 레코드, 바이트 오프셋, 바이트 길이)를 돌려주는 함수
+    lazy_prefixes로 시작하는 키는 레코드를 보관하지 않고 None을 돌려주며, 오프셋으로 나중에 해당 항목만 다시 읽을 수 있다.
+    경로가 .jsonl이면 한 줄에 항목 하나인 스트리밍 형식으로 읽는다.
+    """
+    if path.endswith('.jsonl'):
+        yield from _iter_jsonl_entries(path, lazy_prefixes)
+        return
+
+    with open(path, 'rb') as f:
+        raw = f.read()
+    text = raw.decode('utf-8')
+    del raw
+    decoder = json.JSONDecoder()
+
+    pos = _skip_whitespace(text, 0)
+    if text[pos] != '{':
+        raise ValueError(f"{path}: 최상위 JSON 객체가 아닙니다.")
+    pos += 1
+
+    # 문자 위치 → 바이트 위치 변환 (직전 위치부터의 구간만 인코딩)
+    char_pos = 0
+    byte_pos = 0
+
+    while True:
+        pos = _skip_whitespace(text, pos)
+        if text[pos] == '}':
+            break
+        key, pos = scanstring(text, pos + 1)
+        pos = _skip_whitespace(text, pos)
+        if text[pos] != ':':
+            raise ValueError(f"{path}: {pos}번째 문자에서 ':'가 필요합니다.")
+        value_start = _skip_whitespace(text, pos + 1)
+        record, pos = decoder.raw_decode(text, value_start)
+
+        byte_pos += len(text[char_pos:value_start].encode('utf-8'))
+        value_length = len(text[value_start:pos].encode('utf-8'))
+        char_pos = pos
+        entry_offset = byte_pos
+        byte_pos += value_length
+
+        if key.startswith(lazy_prefixes):
+            record = None
+        yield key, record, entry_offset, value_length
+
+        pos = _skip_whitespace(text, pos)
+        if text[pos] == ',':
+            pos += 1
+
+def load_snapshot(path=SNAPSHOT_PATH, lazy_prefixes=()):
+    """
+    redis.json을 로드하는 함수
+    lazy_prefixes로 시작하는 키(예: new_agent_memory:)는 data에 넣지 않고 key → (바이트 오프셋, 길이)만 기록하여 함께 반환한다.
+    """
+    data = {}
+    lazy_offsets = {}
+    for key, record, offset, length in iter_snapshot_entries(path, lazy_prefixes):
+        if record is None:
+            lazy_offsets[key] = (offset, length)
+        else:
+            data[key] = record
+    return data, lazy_offsets
+
+def read_snapshot_entry(path, offset, length):
+    """기록해 둔 바이트 오프셋으로 snapshot 항목 하나만 읽어 디코딩하는 함수"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        record = json.loads(f.read(length).decode('utf-8'))
+    # .jsonl 항목은 key를 함께 담고 있음
+    record.pop('key', None)
+    return record
+
+def write_snapshot(entries, path=SNAPSHOT_PATH):
+    """
+    (key, 레코드) iterator를 snapshot 파일로 스트리밍 저장하는 함수 (항목 전체를 메모리에 올리지 않음)
+    경로가 .jsonl이면 한 줄에 항목 하나, 아니면 redis.json과 같은 최상위 JSON 객체로 저장하며 저장한 항목 수를 반환한다.
+    """
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            for key, record in entries:
+                line = {'key': key, 'type': record['type'], 'ttl': record['ttl'], 'value': record['value']}
+                f.write(json.dumps(line, ensure_ascii=False, separators=(',', ':')))
+                f.write('\n')
+                count += 1
+        else:
+            f.write('{')
+            for key, record in entries:
+                f.write(',\n  ' if count else '\n  ')
+                f.write(json.dumps(key, ensure_ascii=False))
+                f.write(': ')
+                f.write(json.dumps(record, ensure_ascii=False))
+                count += 1
+            f.write('\n}\n')
+    return count
@@ -0,0 +1,53 @@
+from collections import defaultdict
+
+# 분석 및 시각화에서 제외하는 참가자 (연구자 본인)
+EXCLUDED_OWNERS = {'임현승'}
+
+def get_owner_name(team):
+    """팀의 소유자 이름을 가져오는 함수"""
+    return (team.get('owner_info') or {}).get('name', 'Unknown')
+
+def _apply_exclusion_rules(owner_name, owner_teams):
+    """참가자별 예외 규칙을 적용하는 함수 (박유빈의 경우 2번째 팀 제외)"""
+    if owner_name == "박유빈" and len(owner_teams) >= 4:
+        # 원래 순서: 1, 2(삭제), 3, 4
+        # 새 순서: 1, 3(->2), 4(->3)
+        return [owner_teams[0]] + owner_teams[2:]
+    return owner_teams
+
+def build_owner_index(teams, require_agents=False, excluded_owners=EXCLUDED_OWNERS):
+    """
+    owner 이름 → 팀 목록 인덱스를 한 번의 순회로 생성하는 함수
+    각 owner의 팀은 createdAt 순으로 정렬되고 예외 규칙이 적용된 상태로 저장되며,
+    리스트의 위치 + 1이 팀 번호(1, 2, 3...)가 된다.
+    """
+    buckets = defaultdict(list)
+    for team in teams:
+        owner_name = get_owner_name(team)
+        if owner_name in excluded_owners:
+            continue
+        # 실제 에이전트가 존재하는 팀만 사용하는 경우
+        if require_agents and len(team.get('agents', [])) == 0:
+            continue
+        buckets[owner_name].append(team)
+
+    owner_index = {}
+    for owner_name, owner_teams in buckets.items():
+        owner_teams.sort(key=lambda x: x.get('team_info', {}).get('createdAt', ''))
+        owner_index[owner_name] = _apply_exclusion_rules(owner_name, owner_teams)
+    return owner_index
+
+def get_participant_teams(owner_index, participant_name, max_teams=None):
+    """인덱스에서 참가자의 팀 목록을 팀 번호 순으로 가져오는 함수"""
+    participant_teams = owner_index.get(participant_name, [])
+    if max_teams is not None:
+        return participant_teams[:max_teams]
+    return participant_teams
+
+def iter_numbered_teams(owner_index, participants=None, max_teams=None):
+    """(참가자 이름, 팀 번호, 팀) 튜플을 순서대로 돌려주는 함수"""
+    if participants is None:
+        participants = owner_index.keys()
+    for participant_name in participants:
+        for team_number, team in enumerate(get_participant_teams(owner_index, participant_name, max_teams), 1):
+            yield participant_name, team_number, team
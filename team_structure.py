@@ -0,0 +1,170 @@
+import argparse
+import json
+
+import numpy as np
+
+from team_index import build_owner_index, get_owner_name, iter_numbered_teams
+
+STRUCTURE_PATH = 'team_structure.json'
+USER_NODE = '나'
+METRICS = ['nodes', 'supervisor_edges', 'peer_edges', 'density', 'reciprocity', 'hierarchy_depth', 'max_span',
+           'mean_span', 'leader_centrality', 'user_centrality', 'user_span', 'user_is_hub']
+
+def _team_nodes(team):
+    """
+    팀의 노드 목록('나' + agent node_key 순)과 agent ID/node_key → index, 리더 여부를 만드는 함수
+    """
+    nodes = [USER_NODE]
+    index = {USER_NODE: 0}
+    leaders = [False]
+    try:
+        members = json.loads((team.get('team_info') or {}).get('members', '[]'))
+        leaders[0] = any(member.get('isUser') and member.get('isLeader') for member in members)
+    except json.JSONDecodeError:
+        pass
+    for agent in team.get('agents', []):
+        node_key = agent.get('node_key') or agent['agentId']
+        index[agent['agentId']] = index[node_key] = len(nodes)
+        nodes.append(node_key)
+        leaders.append(bool(agent.get('isLeader', False)))
+    return nodes, index, leaders
+
+def build_adjacency(teams_list):
+    """
+    모든 팀의 relationships를 한 번 순회하여 (팀 x 노드 x 노드) 인접 배열로 만드는 함수
+    SUPERVISOR(상사 → 부하)와 PEER를 별도 bool 배열로 두고, 노드 수는 가장 큰 팀에 맞춰 패딩한다.
+    SUBORDINATE(부하 → 상사)는 방향을 뒤집어 SUPERVISOR에 넣고, 팀에 없는 agent나 모르는 유형의 관계는 버린다. (supervisor, peer, 노드 mask, 리더 mask, 팀별 노드 목록)을 반환한다.
+    """
+    parsed = [_team_nodes(team) for team in teams_list]
+    size = max((len(nodes) for nodes, _, _ in parsed), default=1)
+    supervisor = np.zeros((len(teams_list), size, size), dtype=bool)
+    peer = np.zeros_like(supervisor)
+    node_mask = np.zeros((len(teams_list), size), dtype=bool)
+    leader_mask = np.zeros_like(node_mask)
+
+    for team_index, (team, (nodes, index, leaders)) in enumerate(zip(teams_list, parsed)):
+        node_mask[team_index, :len(nodes)] = True
+        leader_mask[team_index, :len(nodes)] = leaders
+        try:
+            relationships = json.loads((team.get('team_info') or {}).get('relationships', '[]') or '[]')
+        except json.JSONDecodeError:
+            relationships = []
+        for relationship in relationships:
+            source, target = index.get(relationship.get('from')), index.get(relationship.get('to'))
+            if source is None or target is None or source == target:
+                continue
+            relationship_type = relationship.get('type')
+            if relationship_type == 'SUPERVISOR':
+                supervisor[team_index, source, target] = True
+            elif relationship_type == 'SUBORDINATE':
+                # 부하 → 상사 방향으로 저장된 관계이므로 뒤집어서 SUPERVISOR로 취급
+                supervisor[team_index, target, source] = True
+            elif relationship_type == 'PEER':
+                peer[team_index, source, target] = True
+    return supervisor, peer, node_mask, leader_mask, [nodes for nodes, _, _ in parsed]
+
+def compute_structure_metrics(supervisor, peer, node_mask, leader_mask):
+    """
+    인접 배열에서 팀별 구조 지표를 배치로 계산하는 함수 (팀 루프 없음)
+    - density: 무방향으로 연결된 노드 쌍 / 가능한 쌍
+    - reciprocity: 방향 간선 중 반대 방향 간선도 있는 비율
+    - hierarchy_depth: SUPERVISOR 사슬의 최장 길이 (간선 수, 0이면 수평 구조)
+    - max_span / mean_span: 부하가 있는 노드의 SUPERVISOR 출력 차수 최대/평균
+    - leader_centrality / user_centrality: 무방향 degree centrality (리더가 여럿이면 최댓값)
+    - user_span: '나'의 부하 수, user_is_hub: '나'의 degree가 팀 최대인지
+    """
+    team_count, size, _ = supervisor.shape
+    node_count = node_mask.sum(axis=1)
+    directed = supervisor | peer
+    undirected = directed | directed.transpose(0, 2, 1)
+    possible_pairs = node_count * (node_count - 1) / 2
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        density = np.triu(undirected, 1).sum(axis=(1, 2)) / possible_pairs
+        edge_count = directed.sum(axis=(1, 2))
+        reciprocity = np.where(edge_count > 0, (directed & directed.transpose(0, 2, 1)).sum(axis=(1, 2)) / edge_count,
+                               np.nan)
+
+        # 최장 SUPERVISOR 경로: 길이 k 경로 존재 여부를 행렬곱으로 반복 (순환이 있으면 노드 수에서 멈춤)
+        reach = supervisor.astype(np.int64)
+        step = supervisor.astype(np.int64)
+        depth = np.where(supervisor.any(axis=(1, 2)), 1, 0)
+        for length in range(2, size + 1):
+            reach = np.minimum(reach @ step, 1)
+            has_path = reach.any(axis=(1, 2))
+            if not has_path.any():
+                break
+            depth = np.where(has_path, length, depth)
+
+        span = supervisor.sum(axis=2)
+        supervisors = span > 0
+        max_span = span.max(axis=1)
+        mean_span = np.where(supervisors.any(axis=1), span.sum(axis=1) / supervisors.sum(axis=1), 0.0)
+
+        degree = undirected.sum(axis=2)
+        centrality = degree / np.maximum(node_count - 1, 1)[:, None]
+        leader_centrality = np.where(leader_mask.any(axis=1), np.where(leader_mask, centrality, -1).max(axis=1), np.nan)
+        user_centrality = centrality[:, 0]
+        user_is_hub = (degree[:, 0] > 0) & (degree[:, 0] == np.where(node_mask, degree, -1).max(axis=1))
+
+    return {
+        'nodes': node_count,
+        'supervisor_edges': supervisor.sum(axis=(1, 2)),
+        'peer_edges': peer.sum(axis=(1, 2)),
+        'density': density,
+        'reciprocity': reciprocity,
+        'hierarchy_depth': depth,
+        'max_span': max_span,
+        'mean_span': mean_span,
+        'leader_centrality': leader_centrality,
+        'user_centrality': user_centrality,
+        'user_span': span[:, 0],
+        'user_is_hub': user_is_hub
+    }
+
+def _to_python(value):
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (np.integer, int)):
+        return int(value)
+    return None if np.isnan(value) else round(float(value), 4)
+
+def build_structure_table(teams_list, owner_index=None):
+    """
+    팀 id → 구조 지표 행 테이블을 만드는 함수
+    행에는 참가자(owner)와 팀 번호(build_owner_index 기준 1, 2, 3...)가 함께 들어가므로
+    참가자별 팀 순서에 따른 구조 변화를 JSON을 다시 파싱하지 않고 비교할 수 있다.
+    """
+    if owner_index is None:
+        owner_index = build_owner_index(teams_list, require_agents=True)
+    team_numbers = {team['team_id']: team_number for _, team_number, team in iter_numbered_teams(owner_index)}
+    supervisor, peer, node_mask, leader_mask, nodes = build_adjacency(teams_list)
+    metrics = compute_structure_metrics(supervisor, peer, node_mask, leader_mask)
+
+    table = {}
+    for team_index, team in enumerate(teams_list):
+        row = {'team_id': team['team_id'], 'owner': get_owner_name(team),
+               'team_number': team_numbers.get(team['team_id']), 'node_keys': nodes[team_index]}
+        row.update({name: _to_python(metrics[name][team_index]) for name in METRICS})
+        table[team['team_id']] = row
+    return table
+
+def load_teams_data():
+    """structured_teams.json 파일을 로드하는 함수"""
+    with open('structured_teams.json', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='팀 관계 그래프(SUPERVISOR/PEER) 구조 지표 계산')
+    parser.add_argument('--output', default=STRUCTURE_PATH)
+    args = parser.parse_args()
+
+    table = build_structure_table(load_teams_data())
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(table, f, ensure_ascii=False, indent=2)
+
+    for row in sorted(table.values(), key=lambda row: (row['owner'], row['team_number'] or 0)):
+        print(f"- {row['owner']} 팀 {row['team_number']}: 노드 {row['nodes']}, 깊이 {row['hierarchy_depth']}, "
+              f"최대 통솔 {row['max_span']}, 밀도 {row['density']}, 리더 중심성 {row['leader_centrality']}, "
+              f"'나' 허브 {row['user_is_hub']}")
+    print(f"{args.output}에 저장했습니다. (팀 {len(table)}개)")
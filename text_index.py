@@ -0,0 +1,383 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import time
+import unicodedata
+
+from team_index import get_owner_name
+
+TEXT_INDEX_PATH = 'text_index.sqlite'
+TEAMS_PATH = 'structured_teams.json'
+IDEA_FIELDS = ('object', 'function', 'behavior', 'structure')
+PERSONA_FIELDS = ('personaSummary', 'skills')
+# 설문 자유 응답 컬럼 (이유 서술, 팀원 한줄평)
+SURVEY_TEXT_PATTERN = re.compile(r'이유|한줄평')
+TOKEN_PATTERN = re.compile(r'\w+')
+BM25_K1 = 1.2
+BM25_B = 0.75
+SNIPPET_RADIUS = 40
+TOKENIZER_VERSION = 2     # tokenize 규칙이 바뀌면 올려서 기존 색인을 다시 만들게 함
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    doc_key TEXT UNIQUE NOT NULL,
+    source TEXT NOT NULL,
+    field TEXT,
+    team_id TEXT,
+    owner TEXT,
+    agent_id TEXT,
+    author TEXT,
+    timestamp TEXT,
+    text TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    gram TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (gram, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+def normalize(text):
+    """NFKC 정규화 + 소문자 변환 (전각/반각, 대소문자 차이를 없앰)"""
+    return unicodedata.normalize('NFKC', text).lower()
+
+def tokenize(text, word_ends=False):
+    """
+    한글/영문이 섞인 텍스트를 문자 bigram으로 나누는 함수
+    공백/문장부호로 나눈 단어마다 연속한 두 글자를 토큰으로 쓰고, 한 글자 단어는 그대로 쓴다.
+    형태소 분석 없이도 조사가 붙은 한국어 단어('아이디어를')와 부분 문자열 검색이 가능하다.
+    word_ends이면 (색인용) 두 글자 이상 단어의 마지막 글자도 한 글자 토큰으로 넣어,
+    모든 글자가 어떤 토큰의 첫 글자가 되게 한다 (한 글자 검색어를 접두어 조회로 찾기 위함).
+    """
+    grams = []
+    for word in TOKEN_PATTERN.findall(normalize(text)):
+        if len(word) == 1:
+            grams.append(word)
+        else:
+            grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+            if word_ends:
+                grams.append(word[-1])
+    return grams
+
+def flatten_json_text(value):
+    """behavior/structure처럼 JSON 문자열(또는 이미 디코딩된 dict/list)로 저장된 필드를 '키: 값' 줄 텍스트로 바꾸는 함수"""
+    if isinstance(value, str):
+        try:
+            parsed = json.loads(value)
+        except ValueError:
+            return value
+    else:
+        parsed = value
+    if parsed is None:
+        return ''
+    if isinstance(parsed, dict):
+        return '\n'.join(f"{key}: {item}" for key, item in parsed.items())
+    if isinstance(parsed, list):
+        return '\n'.join(str(item) for item in parsed)
+    return str(parsed)
+
+def _document(doc_key, source, text, field=None, team_id=None, owner=None, agent_id=None, author=None,
+              timestamp=None):
+    if isinstance(text, (list, tuple)):
+        text = '\n'.join(str(item) for item in text)
+    return {'doc_key': doc_key, 'source': source, 'field': field, 'team_id': team_id, 'owner': owner,
+            'agent_id': agent_id, 'author': author, 'timestamp': timestamp, 'text': text}
+
+def iter_documents(teams_list):
+    """
+    structured_teams.json 팀 리스트에서 색인할 문서를 만드는 함수
+    아이디어 필드, 아이디어 평가 코멘트, chat 내용(피드백 세션 요약 포함), 피드백 세션 메시지,
+    agent personaSummary/skills, 팀에 매핑된 설문 자유 응답을 문서 하나씩 돌려준다.
+    """
+    seen_agents = set()
+    for team in teams_list:
+        team_id = team['team_id']
+        owner = get_owner_name(team)
+
+        for index, idea_text in enumerate(team.get('ideas', [])):
+            idea = json.loads(idea_text) if isinstance(idea_text, str) else idea_text
+            content = idea.get('content') or {}
+            for field in IDEA_FIELDS:
+                text = content.get(field)
+                if field in ('behavior', 'structure'):
+                    text = flatten_json_text(text)
+                if text:
+                    yield _document(f"idea:{team_id}:{index}:{field}", 'idea', text, field, team_id, owner,
+                                    author=idea.get('author'), timestamp=idea.get('timestamp'))
+            for evaluation_index, evaluation in enumerate(idea.get('evaluations') or []):
+                if evaluation.get('comment'):
+                    yield _document(f"evaluation:{team_id}:{index}:{evaluation_index}", 'evaluation_comment',
+                                    evaluation['comment'], 'comment', team_id, owner,
+                                    author=evaluation.get('evaluator'), timestamp=evaluation.get('timestamp'))
+
+        for message_text in team.get('chat', []):
+            message = json.loads(message_text) if isinstance(message_text, str) else message_text
+            payload = message.get('payload') if isinstance(message.get('payload'), dict) else {}
+            message_key = f"chat:{team_id}:{message.get('id')}"
+            if message.get('type') == 'feedback_session_summary':
+                text = '\n'.join([payload.get('summary') or ''] + [str(item) for item in payload.get('keyInsights') or []])
+                if text.strip():
+                    yield _document(message_key, 'chat', text, 'summary', team_id, owner,
+                                    author=message.get('sender'), timestamp=message.get('timestamp'))
+                for session_message in payload.get('sessionMessages') or []:
+                    if session_message.get('type') == 'system' or not session_message.get('content'):
+                        continue
+                    yield _document(f"feedback:{payload.get('sessionId')}:{session_message.get('id')}",
+                                    'feedback_message', session_message['content'], 'content', team_id, owner,
+                                    author=session_message.get('sender'), timestamp=session_message.get('timestamp'))
+            elif isinstance(payload.get('content'), str) and payload['content']:
+                yield _document(message_key, 'chat', payload['content'], message.get('type'), team_id, owner,
+                                author=message.get('sender'), timestamp=message.get('timestamp'))
+
+        for agent in team.get('agents', []):
+            agent_info = agent['agent_info'] or {}
+            if agent['agentId'] in seen_agents:
+                continue
+            seen_agents.add(agent['agentId'])
+            for field in PERSONA_FIELDS:
+                if agent_info.get(field):
+                    yield _document(f"persona:{agent['agentId']}:{field}", 'persona', agent_info[field], field,
+                                    agent_id=agent['agentId'], author=agent_info.get('name'),
+                                    timestamp=agent_info.get('updatedAt'))
+
+        for evaluation_index, row in enumerate(team.get('evaluations', [])):
+            for column, answer in row.items():
+                if column and SURVEY_TEXT_PATTERN.search(column) and answer and answer.strip():
+                    yield _document(f"survey:{team_id}:{evaluation_index}:{column}", 'survey', answer.strip(),
+                                    column, team_id, owner, author=row.get('당신은 이름은?'),
+                                    timestamp=row.get('타임스탬프'))
+
+def connect(db_path=TEXT_INDEX_PATH):
+    """색인 DB에 연결하고 스키마를 만드는 함수"""
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+def _content_hash(document):
+    payload = json.dumps([TOKENIZER_VERSION] + [document[key] for key in ('source', 'field', 'team_id', 'owner', 'agent_id', 'author',
+                                                    'timestamp', 'text')], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def _set_meta(conn, key, value):
+    conn.execute("INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                 (key, str(value)))
+
+def _get_meta(conn, key, default=None):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+def index_documents(conn, documents, remove_missing=True):
+    """
+    문서를 증분 색인하는 함수
+    doc_key별 내용 해시를 비교하여 새 문서는 추가, 바뀐 문서는 posting을 다시 만들고, 그대로인 문서는 건너뛴다.
+    remove_missing이면 이번 목록에 없는 문서를 삭제한다. {added, updated, removed, unchanged} 개수를 반환한다.
+    """
+    existing = {doc_key: (doc_id, content_hash)
+                for doc_id, doc_key, content_hash in conn.execute("SELECT id, doc_key, content_hash FROM documents")}
+    counts = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+    seen = set()
+    with conn:
+        for document in documents:
+            doc_key = document['doc_key']
+            if doc_key in seen:
+                continue
+            seen.add(doc_key)
+            content_hash = _content_hash(document)
+            previous = existing.get(doc_key)
+            if previous and previous[1] == content_hash:
+                counts['unchanged'] += 1
+                continue
+
+            grams = tokenize(document['text'], word_ends=True)
+            frequencies = {}
+            for gram in grams:
+                frequencies[gram] = frequencies.get(gram, 0) + 1
+            values = (document['source'], document['field'], document['team_id'], document['owner'],
+                      document['agent_id'], document['author'], document['timestamp'], document['text'],
+                      len(grams), content_hash)
+            if previous:
+                doc_id = previous[0]
+                conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+                conn.execute("UPDATE documents SET source = ?, field = ?, team_id = ?, owner = ?, agent_id = ?, "
+                             "author = ?, timestamp = ?, text = ?, length = ?, content_hash = ? WHERE id = ?",
+                             values + (doc_id,))
+                counts['updated'] += 1
+            else:
+                doc_id = conn.execute("INSERT INTO documents (doc_key, source, field, team_id, owner, agent_id, "
+                                      "author, timestamp, text, length, content_hash) "
+                                      "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (doc_key,) + values).lastrowid
+                counts['added'] += 1
+            conn.executemany("INSERT INTO postings (gram, doc_id, tf) VALUES (?, ?, ?)",
+                             [(gram, doc_id, tf) for gram, tf in frequencies.items()])
+
+        if remove_missing:
+            removed = [doc_id for doc_key, (doc_id, _) in existing.items() if doc_key not in seen]
+            for doc_id in removed:
+                conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+                conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+            counts['removed'] = len(removed)
+
+        document_count, total_length = conn.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM documents").fetchone()
+        _set_meta(conn, 'document_count', document_count)
+        _set_meta(conn, 'average_length', total_length / document_count if document_count else 0)
+    return counts
+
+def build_index(teams_path=TEAMS_PATH, db_path=TEXT_INDEX_PATH, force=False):
+    """
+    structured_teams.json으로 색인을 만들거나 갱신하는 함수
+    입력 파일 해시(와 tokenize 버전)가 지난번과 같으면 (force가 아닌 한) 아무것도 하지 않는다.
+    """
+    with open(teams_path, 'rb') as f:
+        raw = f.read()
+    source_hash = hashlib.sha256(f"{TOKENIZER_VERSION}:".encode('utf-8') + raw).hexdigest()
+    conn = connect(db_path)
+    try:
+        if not force and _get_meta(conn, 'source_hash') == source_hash:
+            return {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': int(_get_meta(conn, 'document_count', 0)),
+                    'skipped': True}
+        counts = index_documents(conn, iter_documents(json.loads(raw)))
+        with conn:
+            _set_meta(conn, 'source_hash', source_hash)
+        return counts
+    finally:
+        conn.close()
+
+def _snippet(text, terms):
+    """첫 번째로 일치한 검색어 주변 텍스트를 잘라 반환하는 함수"""
+    normalized = normalize(text)
+    positions = [normalized.find(term) for term in terms if normalized.find(term) >= 0]
+    start = min(positions) if positions else 0
+    begin = max(start - SNIPPET_RADIUS, 0)
+    end = min(start + SNIPPET_RADIUS * 2, len(text))
+    snippet = text[begin:end].replace('\n', ' ')
+    return ('…' if begin > 0 else '') + snippet + ('…' if end < len(text) else '')
+
+def _gram_postings(conn, gram):
+    """
+    토큰 하나의 {doc_id: tf}를 읽는 함수
+    한 글자 토큰은 그 글자로 시작하는 모든 토큰(bigram과 단어 끝 글자)을 범위 조회로 합쳐,
+    단어 안 어디에 있든 그 글자가 나온 횟수를 tf로 쓴다.
+    """
+    if len(gram) > 1:
+        return dict(conn.execute("SELECT doc_id, tf FROM postings WHERE gram = ?", (gram,)).fetchall())
+    upper = chr(min(ord(gram) + 1, sys.maxunicode))
+    return dict(conn.execute("SELECT doc_id, SUM(tf) FROM postings WHERE gram >= ? AND gram < ? GROUP BY doc_id",
+                             (gram, upper)).fetchall())
+
+def search(conn, query, limit=10, sources=None, team_id=None, owner=None, exact=True):
+    """
+    검색어의 모든 bigram(한 글자 검색어는 그 글자)을 포함하는 문서를 BM25로 순위를 매겨 반환하는 함수
+    exact이면 공백으로 나눈 검색어 각각이 (정규화한) 본문에 그대로 들어 있는 문서만 남긴다.
+    sources/team_id/owner로 출처(idea, evaluation_comment, chat, feedback_message, persona, survey)와 팀을 거를 수 있다.
+    """
+    terms = [term for term in normalize(query).split() if term]
+    grams = sorted(set(gram for term in terms for gram in tokenize(term)))
+    if not grams:
+        return []
+
+    document_count = int(_get_meta(conn, 'document_count', 0) or 0)
+    average_length = float(_get_meta(conn, 'average_length', 0) or 0) or 1.0
+    postings = {}
+    for gram in grams:
+        postings[gram] = _gram_postings(conn, gram)
+        if not postings[gram]:
+            return []
+
+    # 가장 적은 posting부터 교집합
+    ordered = sorted(grams, key=lambda gram: len(postings[gram]))
+    candidates = set(postings[ordered[0]])
+    for gram in ordered[1:]:
+        candidates &= postings[gram].keys()
+        if not candidates:
+            return []
+
+    lengths = {}
+    candidate_list = list(candidates)
+    for start in range(0, len(candidate_list), 900):
+        chunk = candidate_list[start:start + 900]
+        lengths.update(conn.execute(f"SELECT id, length FROM documents WHERE id IN ({','.join('?' * len(chunk))})",
+                                    chunk).fetchall())
+
+    scores = {}
+    for gram in grams:
+        df = len(postings[gram])
+        idf = math.log(1 + (document_count - df + 0.5) / (df + 0.5))
+        for doc_id in candidates:
+            tf = postings[gram][doc_id]
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc_id] / average_length)
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+    hits = []
+    columns = ('doc_key', 'source', 'field', 'team_id', 'owner', 'agent_id', 'author', 'timestamp', 'text')
+    for doc_id in sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id)):
+        row = conn.execute(f"SELECT {', '.join(columns)} FROM documents WHERE id = ?", (doc_id,)).fetchone()
+        document = dict(zip(columns, row))
+        if sources and document['source'] not in sources:
+            continue
+        if team_id and document['team_id'] != team_id:
+            continue
+        if owner and document['owner'] != owner:
+            continue
+        if exact and not all(term in normalize(document['text']) for term in terms):
+            continue
+        document['score'] = round(scores[doc_id], 4)
+        document['snippet'] = _snippet(document.pop('text'), terms)
+        hits.append(document)
+        if len(hits) >= limit:
+            break
+    return hits
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='아이디어/chat/피드백/페르소나/설문 응답 전문 검색 색인')
+    parser.add_argument('--db', default=TEXT_INDEX_PATH, help='색인 DB 경로')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='structured_teams.json으로 색인 생성/증분 갱신')
+    build_parser.add_argument('--teams', default=TEAMS_PATH)
+    build_parser.add_argument('--force', action='store_true', help='입력 해시가 같아도 문서 비교를 다시 수행')
+
+    search_parser = subparsers.add_parser('search', help='색인 검색')
+    search_parser.add_argument('query')
+    search_parser.add_argument('--limit', type=int, default=10)
+    search_parser.add_argument('--source', action='append',
+                               choices=['idea', 'evaluation_comment', 'chat', 'feedback_message', 'persona', 'survey'])
+    search_parser.add_argument('--team', help='team_id로 제한')
+    search_parser.add_argument('--owner', help='참가자 이름으로 제한')
+    search_parser.add_argument('--loose', action='store_true', help='검색어 원문 포함 확인 없이 bigram 일치만 사용')
+    search_parser.add_argument('--json', action='store_true', help='JSON으로 출력')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == 'build':
+        counts = build_index(args.teams, args.db, args.force)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if counts.get('skipped'):
+            print(f"입력 변경 없음 - 색인 유지 (문서 {counts['unchanged']}개, {elapsed_ms:.0f}ms)")
+        else:
+            print(f"색인 갱신: 추가 {counts['added']}, 변경 {counts['updated']}, 삭제 {counts['removed']}, "
+                  f"유지 {counts['unchanged']} ({elapsed_ms:.0f}ms)")
+    else:
+        if not os.path.exists(args.db):
+            sys.exit(f"색인이 없습니다: {args.db} (먼저 build 실행)")
+        conn = connect(args.db)
+        hits = search(conn, args.query, args.limit, args.source, args.team, args.owner, exact=not args.loose)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if args.json:
+            print(json.dumps({'query': args.query, 'elapsed_ms': elapsed_ms, 'hits': hits}, ensure_ascii=False, indent=2))
+        else:
+            for hit in hits:
+                context = ' / '.join(str(value) for value in (hit['owner'], hit['team_id'], hit['author'], hit['timestamp'])
+                                     if value)
+                print(f"[{hit['score']:.2f}] {hit['source']}:{hit['field']} ({context})\n    {hit['snippet']}")
+            print(f"{len(hits)}건 ({elapsed_ms:.1f}ms)")
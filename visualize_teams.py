@@ -1,9 +1,19 @@
+import argparse
+import hashlib
 import json
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib.patches import FancyBboxPatch
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.transforms import Affine2D
+from matplotlib.backends.backend_pdf import PdfPages
 import numpy as np
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from auto_layout import prepare_layouts, repair_positions, save_layout_cache
+from instrumentation import add_profile_arguments, configure_from_args, print_summary, span, write_report
+from team_index import build_owner_index, get_participant_teams, iter_numbered_teams
 
 def load_teams_data():
     """structured_teams.json 파일을 로드하는 함수"""
@@ -27,102 +37,94 @@ def parse_relationships(relationships_str):
     except json.JSONDecodeError:
         return []
 
-def get_node_info(node_id, team_data):
-    """노드 ID에 해당하는 정보를 가져오는 함수"""
-    if node_id == "나":
-        owner_info = team_data.get('owner_info', {})
-        
-        # team_info.members에서 사용자의 isLeader 정보 찾기
-        is_leader = False
-        team_info = team_data.get('team_info', {})
-        members_str = team_info.get('members', '[]')
-        try:
-            members = json.loads(members_str)
-            for member in members:
-                if member.get('isUser', False):
-                    is_leader = member.get('isLeader', False)
-                    break
-        except json.JSONDecodeError:
-            pass
-        
-        # 사용자의 역할에서 각 역할 확인 및 실제 생성 여부 확인
-        user_has_generation = False
-        user_has_evaluation = False
-        user_has_feedback = False
-        user_actually_generated = False
-        try:
-            members = json.loads(members_str)
-            for member in members:
-                if member.get('isUser', False):
-                    user_roles = member.get('roles', [])
-                    user_has_generation = "아이디어 생성하기" in user_roles
-                    user_has_evaluation = "아이디어 평가하기" in user_roles
-                    user_has_feedback = "피드백하기" in user_roles
-                    break
-        except json.JSONDecodeError:
-            pass
-        
-        # 실제 아이디어 생성 여부 확인 (ideas 필드에서 "나"가 author인 아이디어가 있는지)
-        ideas_str = team_info.get('ideas', '[]')
-        try:
-            ideas = json.loads(ideas_str)
-            for idea in ideas:
-                if idea.get('author') == '나':
-                    user_actually_generated = True
-                    break
-        except json.JSONDecodeError:
-            pass
+def _get_role_flags(roles):
+    """역할 목록에서 생성/평가/피드백 역할 여부를 확인하는 함수"""
+    return {
+        'has_generation': "아이디어 생성하기" in roles,
+        'has_evaluation': "아이디어 평가하기" in roles,
+        'has_feedback': "피드백하기" in roles
+    }
+
+def _build_user_node_info(team_data):
+    """사용자('나') 노드 정보를 만드는 함수 (members와 ideas JSON을 한 번씩만 파싱)"""
+    owner_info = team_data.get('owner_info', {})
+    team_info = team_data.get('team_info', {})
+    
+    # team_info.members에서 사용자의 isLeader 정보와 역할 찾기
+    is_leader = False
+    user_roles = []
+    try:
+        members = json.loads(team_info.get('members', '[]'))
+        for member in members:
+            if member.get('isUser', False):
+                is_leader = member.get('isLeader', False)
+                user_roles = member.get('roles', [])
+                break
+    except json.JSONDecodeError:
+        pass
+    
+    # 실제 아이디어 생성 여부 확인 (ideas 필드에서 "나"가 author인 아이디어가 있는지)
+    user_actually_generated = False
+    try:
+        ideas = json.loads(team_info.get('ideas', '[]'))
+        user_actually_generated = any(idea.get('author') == '나' for idea in ideas)
+    except json.JSONDecodeError:
+        pass
+    
+    node_info = {
+        'name': owner_info.get('name', '나'),
+        'type': 'user',
+        'professional': 'Owner',
+        'isLeader': is_leader
+    }
+    node_info.update(_get_role_flags(user_roles))
+    node_info['actually_generated'] = user_actually_generated
+    return node_info
+
+def build_node_table(team_data):
+    """
+    팀의 노드 테이블을 한 번에 만드는 함수
+    nodes: '나', node_key(A, B, C...), agent ID → 노드 정보 (이름, 유형, 직업, 리더 여부, 역할 여부, 실제 생성 여부)
+    node_keys: agent ID → node_key, roles: agent ID → 역할 목록
+    """
+    nodes = {'나': _build_user_node_info(team_data)}
+    node_keys = {}
+    roles_by_agent = {}
+    
+    for agent in team_data.get('agents', []):
+        agent_id = agent['agentId']
+        agent_info = agent.get('agent_info') or {}
+        roles = agent.get('roles', [])
         
-        return {
-            'name': owner_info.get('name', '나'),
-            'type': 'user',
-            'professional': 'Owner',
-            'isLeader': is_leader,
-            'has_generation': user_has_generation,
-            'has_evaluation': user_has_evaluation,
-            'has_feedback': user_has_feedback,
-            'actually_generated': user_actually_generated
+        node_info = {
+            'name': agent_info.get('name', 'Unknown'),
+            'type': 'agent',
+            'professional': agent_info.get('professional', 'Unknown'),
+            'isLeader': agent.get('isLeader', False),
+            'agentId': agent_id
         }
+        node_info.update(_get_role_flags(roles))
+        
+        # node_key 조회가 agent ID 조회보다 우선하도록 agent ID는 비어 있을 때만 등록
+        nodes.setdefault(agent_id, node_info)
+        node_key = agent.get('node_key')
+        if node_key is not None:
+            nodes[node_key] = node_info
+            node_keys[agent_id] = node_key
+        else:
+            node_keys[agent_id] = agent_id
+        roles_by_agent[agent_id] = roles
     
-    # A, B, C, D, E 형태의 node_key로 agent 찾기
-    for agent in team_data.get('agents', []):
-        if agent.get('node_key') == node_id:
-            agent_info = agent.get('agent_info', {})
-            # 에이전트의 각 역할 확인
-            roles = agent.get('roles', [])
-            has_generation = "아이디어 생성하기" in roles
-            has_evaluation = "아이디어 평가하기" in roles
-            has_feedback = "피드백하기" in roles
-            return {
-                'name': agent_info.get('name', 'Unknown'),
-                'type': 'agent',
-                'professional': agent_info.get('professional', 'Unknown'),
-                'isLeader': agent.get('isLeader', False),
-                'agentId': agent['agentId'],
-                'has_generation': has_generation,
-                'has_evaluation': has_evaluation,
-                'has_feedback': has_feedback
-            }
-    
-    # agent ID로도 찾기 (fallback)
-    for agent in team_data.get('agents', []):
-        if agent['agentId'] == node_id:
-            agent_info = agent.get('agent_info', {})
-            # 에이전트의 각 역할 확인
-            roles = agent.get('roles', [])
-            has_generation = "아이디어 생성하기" in roles
-            has_evaluation = "아이디어 평가하기" in roles
-            has_feedback = "피드백하기" in roles
-            return {
-                'name': agent_info.get('name', 'Unknown'),
-                'type': 'agent',
-                'professional': agent_info.get('professional', 'Unknown'),
-                'isLeader': agent.get('isLeader', False),
-                'agentId': agent['agentId'],
-                'has_generation': has_generation,
-                'has_evaluation': has_evaluation,
-                'has_feedback': has_feedback
-            }
+    return {'nodes': nodes, 'node_keys': node_keys, 'roles': roles_by_agent}
+
+def get_node_info(node_id, team_data, node_table=None):
+    """노드 ID('나', node_key 또는 agent ID)에 해당하는 정보를 가져오는 함수"""
+    if node_table is None:
+        node_table = build_node_table(team_data)
+    
+    node_info = node_table['nodes'].get(node_id)
+    if node_info is not None:
+        return node_info
     
     return {
         'name': node_id,
@@ -130,12 +132,11 @@ def get_node_info(node_id, team_data):
         'professional': 'Unknown'
     }
 
-def convert_agent_id_to_node_key(agent_id, team_data):
+def convert_agent_id_to_node_key(agent_id, team_data, node_table=None):
     """agent ID를 node_key(A, B, C, D, E)로 변환하는 함수"""
-    for agent in team_data.get('agents', []):
-        if agent['agentId'] == agent_id:
-            return agent.get('node_key', agent_id)
-    return agent_id
+    if node_table is None:
+        node_table = build_node_table(team_data)
+    return node_table['node_keys'].get(agent_id, agent_id)
 
 def get_role_based_color(node_info):
     """역할 기반 색상을 결정하는 함수"""
@@ -181,18 +182,87 @@ def get_role_based_color(node_info):
     else:
         return '#95A5A6'  # 회색 (알 수 없음)
 
-def create_team_network_visualization(team_data, team_index, team_number=None, use_role_colors=False):
-    """개별 팀의 네트워크 시각화를 생성하는 함수"""
+def get_generation_color(node_info):
+    """생성 능력 기반 색상을 결정하는 함수"""
+    if node_info['type'] == 'user':
+        # 사용자가 생성능력이 있지만 실제로 생성하지 않은 경우 빨간색
+        if node_info.get('has_generation', False) and not node_info.get('actually_generated', False):
+            return '#FF0000'  # 빨간색 (생성 능력 있지만 실제 생성 안함)
+        elif node_info.get('has_generation', False):
+            return '#0000FF'  # 파란색 (생성 능력 있고 실제 생성함)
+        else:
+            return '#FF0000'  # 빨간색 (생성 능력 없음)
+    elif node_info['type'] == 'agent':
+        if node_info.get('has_generation', False):
+            return '#0000FF'  # 파란색 (생성 능력 있음)
+        else:
+            return '#FF0000'  # 빨간색 (생성 능력 없음)
+    else:
+        return '#95A5A6'  # 회색 (알 수 없음)
+
+def get_relationship_legend_elements():
+    """리더/관계선 공통 범례 항목을 만드는 함수"""
+    return [
+        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#0000FF', 
+                  markersize=10, markeredgecolor='#FFD700', markeredgewidth=3, label='Leader'),
+        patches.FancyArrowPatch((0, 0), (0.3, 0), arrowstyle='->', color='black', linewidth=3, label='Supervisor (→)'),
+        plt.Line2D([0], [0], color='#34495E', linewidth=2, label='Peer (—)')
+    ]
+
+def get_generation_legend_elements():
+    """생성 능력 기반 색상 범례 항목을 만드는 함수"""
+    return [
+        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#0000FF', 
+                  markersize=10, label='생성 능력 있고 실제 생성함'),
+        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#FF0000', 
+                  markersize=10, label='생성 능력 없거나 실제 생성 안함'),
+    ] + get_relationship_legend_elements()
+
+def get_role_based_legend_elements():
+    """역할 기반 색상 범례 항목을 만드는 함수"""
+    return [
+        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#0000FF', 
+                  markersize=10, label='생성 역할'),
+        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#FF0000', 
+                  markersize=10, label='평가/피드백 역할'),
+        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#8A2BE2', 
+                  markersize=10, label='생성 + 평가/피드백'),
+        plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#95A5A6', 
+                  markersize=10, label='역할 없음'),
+    ] + get_relationship_legend_elements()
+
+# 색상 체계 등록: 새로운 색상 체계는 색상 함수, 범례 함수, 출력 폴더를 추가하면 된다
+COLOR_SCHEMES = {
+    'generation': {
+        'color': get_generation_color,
+        'legend': get_generation_legend_elements,
+        'output_dir': 'team_visualizations',
+        'label': '시각화'
+    },
+    'role': {
+        'color': get_role_based_color,
+        'legend': get_role_based_legend_elements,
+        'output_dir': 'role_based_visualizations',
+        'label': '역할 기반 시각화'
+    }
+}
+
+def build_team_layout(team_data, team_index, team_number=None, auto_layouts=None):
+    """
+    팀 시각화에 필요한 좌표, 노드 정보, 관계선 목록을 한 번만 계산하는 함수
+    색상 체계나 출력 형식과 무관한 값만 담기 때문에 여러 변형 렌더링에 재사용할 수 있다.
+    auto_layouts에는 prepare_layouts(teams)로 미리 계산한 자동 배치 좌표를 넘긴다 (없으면 이 팀만 계산).
+    """
     team_info = team_data['team_info']
     
     # nodePositions와 relationships 파싱
     positions = parse_positions(team_info.get('nodePositions', '{}'))
     relationships = parse_relationships(team_info.get('relationships', '[]'))
     
-    # 실제 존재하는 agent들의 ID를 수집
-    existing_agent_ids = set()
-    for agent in team_data.get('agents', []):
-        existing_agent_ids.add(agent['agentId'])
+    # 노드 테이블을 한 번만 생성하여 존재 여부 확인과 ID 변환을 O(1) 조회로 처리
+    node_table = build_node_table(team_data)
+    existing_agent_ids = node_table['node_keys']
+    existing_node_keys = set(existing_agent_ids.values())
     
     # relationships에서 실제 존재하는 agent만 사용하도록 필터링
     filtered_relationships = []
@@ -206,8 +276,8 @@ def create_team_network_visualization(team_data, team_index, team_number=None, u
         
         if from_exists and to_exists:
             # agent ID를 node_key로 변환
-            from_node = from_node if from_node == '나' else convert_agent_id_to_node_key(from_node, team_data)
-            to_node = to_node if to_node == '나' else convert_agent_id_to_node_key(to_node, team_data)
+            from_node = from_node if from_node == '나' else convert_agent_id_to_node_key(from_node, team_data, node_table)
+            to_node = to_node if to_node == '나' else convert_agent_id_to_node_key(to_node, team_data, node_table)
             filtered_relationships.append({
                 'from': from_node,
                 'to': to_node,
@@ -218,97 +288,49 @@ def create_team_network_visualization(team_data, team_index, team_number=None, u
     # positions에서도 실제 존재하지 않는 agent 노드 제거
     filtered_positions = {}
     for node_id, pos in positions.items():
-        if node_id == '나':
+        if node_id == '나' or node_id in existing_node_keys:
             filtered_positions[node_id] = pos
-        else:
-            # node_key를 agent_id로 변환해서 확인
-            agent_id = None
-            for agent in team_data.get('agents', []):
-                if agent.get('node_key') == node_id:
-                    agent_id = agent['agentId']
-                    break
-            
-            if agent_id and agent_id in existing_agent_ids:
-                filtered_positions[node_id] = pos
     
     positions = filtered_positions
     
+    # 좌표가 없거나 일부 노드에만 있거나 겹치면 자동 배치 좌표로 채움 (fingerprint별 캐시)
+    positions = repair_positions(team_data, positions, auto_layouts)
+    
     if not positions:
         print(f"팀 {team_index + 1}: nodePositions가 없어서 스킵합니다.")
         return None
     
-    # 그래프 생성
-    fig, ax = plt.subplots(1, 1, figsize=(12, 8))
-    ax.set_aspect('equal')
-    
-    # 노드 색상 정의
-    def get_node_color(node_info):
-        if node_info['type'] == 'user':
-            # 사용자가 생성능력이 있지만 실제로 생성하지 않은 경우 빨간색
-            if node_info.get('has_generation', False) and not node_info.get('actually_generated', False):
-                return '#FF0000'  # 빨간색 (생성 능력 있지만 실제 생성 안함)
-            elif node_info.get('has_generation', False):
-                return '#0000FF'  # 파란색 (생성 능력 있고 실제 생성함)
-            else:
-                return '#FF0000'  # 빨간색 (생성 능력 없음)
-        elif node_info['type'] == 'agent':
-            if node_info.get('has_generation', False):
-                return '#0000FF'  # 파란색 (생성 능력 있음)
-            else:
-                return '#FF0000'  # 빨간색 (생성 능력 없음)
-        else:
-            return '#95A5A6'  # 회색 (알 수 없음)
-    
+    # 노드 정보 및 라벨
+    nodes = []
     for node_id, pos in positions.items():
-        x, y = pos['x'], pos['y']
-        node_info = get_node_info(node_id, team_data)
-        
-        # 노드 색상 결정
-        if use_role_colors:
-            color = get_role_based_color(node_info)
-        else:
-            color = get_node_color(node_info)
-        
-        # 리더인 경우 테두리 추가
-        if node_info.get('isLeader', False):
-            border_color = '#FFD700'  # 노란색
-            linewidth = 3
-        else:
-            border_color = 'black'
-            linewidth = 1
-        
-        # 노드 그리기
-        circle = plt.Circle((x, y), 25, color=color, ec=border_color, linewidth=linewidth, zorder=3)
-        ax.add_patch(circle)
-        
-        # 사용자인 경우 가운데에 "ME" 표시
-        if node_info['type'] == 'user':
-            ax.text(x, y, 'ME', ha='center', va='center', fontsize=10, weight='bold', color='white', zorder=4)
+        node_info = get_node_info(node_id, team_data, node_table)
         
-        # 노드 라벨 (이름)
-        ax.text(x, y-45, node_info['name'], ha='center', va='top', fontsize=9, weight='bold')
-        
-        # 역할 라벨 (agent인 경우만)
+        # 역할 라벨 (agent인 경우만), 사용자인 경우 직업 표시
+        sub_label = None
         if node_info['type'] == 'agent':
             # agent 정보에서 역할 가져오기
-            for agent in team_data.get('agents', []):
-                if agent.get('agentId') == node_info.get('agentId'):
-                    roles = agent.get('roles', [])
-                    # 역할을 줄여서 표시 (너무 길면 생략)
-                    role_text = ', '.join([role.replace('아이디어 ', '').replace('하기', '') for role in roles])
-                    if len(role_text) > 25:  # 너무 길면 줄임
-                        role_text = role_text[:22] + '...'
-                    ax.text(x, y-60, f"({role_text})", ha='center', va='top', fontsize=7, style='italic')
-                    break
+            roles = node_table['roles'][node_info['agentId']]
+            # 역할을 줄여서 표시 (너무 길면 생략)
+            role_text = ', '.join([role.replace('아이디어 ', '').replace('하기', '') for role in roles])
+            if len(role_text) > 25:  # 너무 길면 줄임
+                role_text = role_text[:22] + '...'
+            sub_label = f"({role_text})"
         else:
-            # 사용자인 경우 직업 표시
-            ax.text(x, y-60, f"({node_info['professional']})", ha='center', va='top', fontsize=7, style='italic')
+            sub_label = f"({node_info['professional']})"
+        
+        nodes.append({
+            'id': node_id,
+            'x': pos['x'],
+            'y': pos['y'],
+            'info': node_info,
+            'sub_label': sub_label
+        })
     
-    # 관계선 그리기
+    # 관계선 좌표 계산
+    edges = []
     for rel in relationships:
         from_node = rel['from']
         to_node = rel['to']
-        rel_type = rel['type']
         
         if from_node in positions and to_node in positions:
             x1, y1 = positions[from_node]['x'], positions[from_node]['y']
@@ -328,166 +350,504 @@ def create_team_network_visualization(team_data, team_index, team_number=None, u
                 unit_y = dy / distance
                 
                 # 시작점과 끝점을 노드 경계로 조정
-                start_x = x1 + unit_x * node_radius
-                start_y = y1 + unit_y * node_radius
-                end_x = x2 - unit_x * node_radius
-                end_y = y2 - unit_y * node_radius
-                
-                if rel_type == 'SUPERVISOR':
-                    # 화살표로 그리기 (더 두껍고 명확하게)
-                    ax.annotate('', xy=(end_x, end_y), xytext=(start_x, start_y),
-                              arrowprops=dict(arrowstyle='->', color='black', lw=3, 
-                                            shrinkA=0, shrinkB=0, mutation_scale=20),
-                              zorder=2)
-                elif rel_type == 'PEER':
-                    # 실선으로 그리기
-                    ax.plot([start_x, end_x], [start_y, end_y], color='#34495E', lw=2, zorder=1)
+                edges.append({
+                    'type': rel['type'],
+                    'start': (x1 + unit_x * node_radius, y1 + unit_y * node_radius),
+                    'end': (x2 - unit_x * node_radius, y2 - unit_y * node_radius)
+                })
     
-    # 제목 설정
+    # 제목 및 축 범위
     owner_name = team_data.get('owner_info', {}).get('name', 'Unknown')
     team_name = team_info.get('teamName', 'Unknown Team')
     display_team_number = team_number if team_number is not None else team_index + 1
-    ax.set_title(f'{owner_name} - {team_name}\n(Team {display_team_number})', fontsize=14, weight='bold', pad=20)
+    
+    return {
+        'title': f'{owner_name} - {team_name}\n(Team {display_team_number})',
+        'nodes': nodes,
+        'edges': edges,
+        'xlim': (-50, max([pos['x'] for pos in positions.values()]) + 100),
+        'ylim': (-100, max([pos['y'] for pos in positions.values()]) + 50)
+    }
+
+# 화살표 머리 크기 (annotate의 arrowstyle='->', mutation_scale=20과 동일, 단위: 포인트)
+ARROW_HEAD_LENGTH = 0.4 * 20
+ARROW_HEAD_WIDTH = 0.2 * 20
+
+def apply_color_scheme(ax, layout, node_patches, color_scheme, legend=True):
+    """이미 그려진 팀 그래프의 노드 색상과 범례를 주어진 색상 체계로 바꾸는 함수 (legend=False면 색상만)"""
+    scheme = COLOR_SCHEMES[color_scheme]
+    colors = [scheme['color'](node['info']) for node in layout['nodes']]
+    if isinstance(node_patches, PatchCollection):
+        node_patches.set_facecolor(colors)
+    else:
+        for circle, color in zip(node_patches, colors):
+            circle.set_facecolor(color)
+    
+    # 범례 추가 (기존 범례는 교체됨)
+    if legend:
+        ax.legend(handles=scheme['legend'](), loc='upper right', bbox_to_anchor=(1, 1))
+
+def _get_node_border(node_info):
+    """노드 테두리 색상과 두께를 결정하는 함수 (리더인 경우 노란색 굵은 테두리)"""
+    if node_info.get('isLeader', False):
+        return '#FFD700', 3  # 노란색
+    return 'black', 1
+
+def _draw_nodes_artists(ax, layout):
+    """노드마다 Circle 도형을 하나씩 추가하는 함수 (기존 방식)"""
+    node_patches = []
+    for node in layout['nodes']:
+        border_color, linewidth = _get_node_border(node['info'])
+        # 노드 그리기 (색상은 apply_color_scheme에서 지정)
+        circle = plt.Circle((node['x'], node['y']), 25, ec=border_color, linewidth=linewidth, zorder=3)
+        ax.add_patch(circle)
+        node_patches.append(circle)
+    return node_patches
+
+def _draw_edges_artists(ax, layout):
+    """관계선마다 annotate 화살표 또는 plot 선을 하나씩 추가하는 함수 (기존 방식)"""
+    for edge in layout['edges']:
+        start_x, start_y = edge['start']
+        end_x, end_y = edge['end']
+        
+        if edge['type'] == 'SUPERVISOR':
+            # 화살표로 그리기 (더 두껍고 명확하게)
+            ax.annotate('', xy=(end_x, end_y), xytext=(start_x, start_y),
+                      arrowprops=dict(arrowstyle='->', color='black', lw=3, 
+                                    shrinkA=0, shrinkB=0, mutation_scale=20),
+                      zorder=2)
+        elif edge['type'] == 'PEER':
+            # 실선으로 그리기
+            ax.plot([start_x, end_x], [start_y, end_y], color='#34495E', lw=2, zorder=1)
+
+def _draw_nodes_collection(ax, layout):
+    """모든 노드를 하나의 PatchCollection으로 추가하는 함수"""
+    circles = []
+    edge_colors = []
+    linewidths = []
+    for node in layout['nodes']:
+        border_color, linewidth = _get_node_border(node['info'])
+        circles.append(plt.Circle((node['x'], node['y']), 25))
+        edge_colors.append(border_color)
+        linewidths.append(linewidth)
+    
+    # 노드 색상은 apply_color_scheme에서 지정
+    node_collection = PatchCollection(circles, edgecolors=edge_colors, linewidths=linewidths, zorder=3)
+    ax.add_collection(node_collection)
+    return node_collection
+
+def _draw_edges_collection(fig, ax, layout):
+    """PEER 선, SUPERVISOR 화살표 몸통, 화살표 머리를 각각 하나의 LineCollection으로 추가하는 함수"""
+    peer_segments = []
+    supervisor_segments = []
+    for edge in layout['edges']:
+        if edge['type'] == 'SUPERVISOR':
+            supervisor_segments.append((edge['start'], edge['end']))
+        elif edge['type'] == 'PEER':
+            peer_segments.append((edge['start'], edge['end']))
+    
+    if peer_segments:
+        # 실선으로 그리기
+        ax.add_collection(LineCollection(peer_segments, colors='#34495E', linewidths=2, zorder=1))
+    
+    if supervisor_segments:
+        # 화살표 몸통
+        ax.add_collection(LineCollection(supervisor_segments, colors='black', linewidths=3,
+                                         capstyle='butt', zorder=2))
+        
+        # 화살표 머리: 끝점(데이터 좌표)을 offset으로 두고 모양은 포인트 단위로 그려 dpi와 무관하게 같은 크기 유지
+        segments = np.asarray(supervisor_segments, dtype=float)
+        direction = segments[:, 1] - segments[:, 0]
+        direction /= np.linalg.norm(direction, axis=1, keepdims=True)
+        normal = np.column_stack([-direction[:, 1], direction[:, 0]])
+        back = -direction * ARROW_HEAD_LENGTH
+        heads = np.stack([back + normal * ARROW_HEAD_WIDTH,
+                          np.zeros_like(back),
+                          back - normal * ARROW_HEAD_WIDTH], axis=1)
+        point_transform = Affine2D().scale(1 / 72) + fig.dpi_scale_trans
+        ax.add_collection(LineCollection(heads, colors='black', linewidths=3, joinstyle='round', capstyle='butt',
+                                         offsets=segments[:, 1], offset_transform=ax.transData,
+                                         transform=point_transform, zorder=2))
+
+def _draw_node_labels(ax, layout):
+    """노드 이름, ME 표시, 역할/직업 라벨을 추가하는 함수"""
+    for node in layout['nodes']:
+        x, y = node['x'], node['y']
+        node_info = node['info']
+        
+        # 사용자인 경우 가운데에 "ME" 표시
+        if node_info['type'] == 'user':
+            ax.text(x, y, 'ME', ha='center', va='center', fontsize=10, weight='bold', color='white', zorder=4)
+        
+        # 노드 라벨 (이름)
+        ax.text(x, y-45, node_info['name'], ha='center', va='top', fontsize=9, weight='bold')
+        
+        # 역할/직업 라벨
+        if node['sub_label'] is not None:
+            ax.text(x, y-60, node['sub_label'], ha='center', va='top', fontsize=7, style='italic')
+
+def draw_layout_on_axes(fig, ax, layout, draw_mode='collection', title_fontsize=14):
+    """주어진 축에 팀 그래프(노드, 관계선, 라벨, 제목)를 그리는 함수 (노드 도형 반환, 색상과 범례는 제외)"""
+    ax.set_aspect('equal')
+    
+    if draw_mode == 'artist':
+        node_patches = _draw_nodes_artists(ax, layout)
+        _draw_edges_artists(ax, layout)
+    else:
+        node_patches = _draw_nodes_collection(ax, layout)
+        _draw_edges_collection(fig, ax, layout)
+    _draw_node_labels(ax, layout)
+    
+    # 제목 설정
+    ax.set_title(layout['title'], fontsize=title_fontsize, weight='bold', pad=20)
     
     # 축 설정
-    ax.set_xlim(-50, max([pos['x'] for pos in positions.values()]) + 100)
-    ax.set_ylim(-100, max([pos['y'] for pos in positions.values()]) + 50)
+    ax.set_xlim(*layout['xlim'])
+    ax.set_ylim(*layout['ylim'])
     ax.set_xticks([])
     ax.set_yticks([])
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
     ax.spines['bottom'].set_visible(False)
     ax.spines['left'].set_visible(False)
+    return node_patches
+
+def draw_team_layout(layout, color_scheme='generation', draw_mode='collection'):
+    """
+    미리 계산된 레이아웃으로 팀 네트워크 그림을 그리는 함수 (그림과 노드 도형 반환)
+    draw_mode='collection'은 노드/관계선/화살표 머리를 컬렉션으로 묶어 그리고, 'artist'는 요소마다 도형을 추가한다.
+    """
+    fig, ax = plt.subplots(1, 1, figsize=(12, 8))
+    node_patches = draw_layout_on_axes(fig, ax, layout, draw_mode)
     
-    # 범례 추가
-    if use_role_colors:
-        legend_elements = [
-            plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#0000FF', 
-                      markersize=10, label='생성 역할'),
-            plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#FF0000', 
-                      markersize=10, label='평가/피드백 역할'),
-            plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#8A2BE2', 
-                      markersize=10, label='생성 + 평가/피드백'),
-            plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#95A5A6', 
-                      markersize=10, label='역할 없음'),
-            plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#0000FF', 
-                      markersize=10, markeredgecolor='#FFD700', markeredgewidth=3, label='Leader'),
-            patches.FancyArrowPatch((0, 0), (0.3, 0), arrowstyle='->', color='black', linewidth=3, label='Supervisor (→)'),
-            plt.Line2D([0], [0], color='#34495E', linewidth=2, label='Peer (—)')
-        ]
-    else:
-        legend_elements = [
-            plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#0000FF', 
-                      markersize=10, label='생성 능력 있고 실제 생성함'),
-            plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#FF0000', 
-                      markersize=10, label='생성 능력 없거나 실제 생성 안함'),
-            plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#0000FF', 
-                      markersize=10, markeredgecolor='#FFD700', markeredgewidth=3, label='Leader'),
-            patches.FancyArrowPatch((0, 0), (0.3, 0), arrowstyle='->', color='black', linewidth=3, label='Supervisor (→)'),
-            plt.Line2D([0], [0], color='#34495E', linewidth=2, label='Peer (—)')
-        ]
-    ax.legend(handles=legend_elements, loc='upper right', bbox_to_anchor=(1, 1))
+    # 노드 색상 및 범례
+    apply_color_scheme(ax, layout, node_patches, color_scheme)
     
     plt.tight_layout()
+    return fig, node_patches
+
+def create_team_network_visualization(team_data, team_index, team_number=None, use_role_colors=False):
+    """개별 팀의 네트워크 시각화를 생성하는 함수"""
+    layout = build_team_layout(team_data, team_index, team_number)
+    if layout is None:
+        return None
+    
+    fig, _ = draw_team_layout(layout, 'role' if use_role_colors else 'generation')
     return fig
 
-def get_filtered_teams_for_participant(teams, participant_name):
+def get_filtered_teams_for_participant(teams, participant_name, owner_index=None):
     """참가자별로 팀을 필터링하고 박유빈의 경우 특별 처리하는 함수"""
-    participant_teams = []
-    for team in teams:
-        owner_name = team.get('owner_info', {}).get('name', 'Unknown')
-        if owner_name == participant_name:
-            participant_teams.append(team)
-    
-    # 생성 시간순으로 정렬
-    participant_teams.sort(key=lambda x: x.get('team_info', {}).get('createdAt', ''))
-    
-    # 박유빈의 경우 2번째 팀 제외하고 번호 재조정
-    if participant_name == "박유빈" and len(participant_teams) >= 4:
-        # 원래 순서: 1, 2(삭제), 3, 4
-        # 새 순서: 1, 3(->2), 4(->3)
-        filtered_teams = [participant_teams[0], participant_teams[2], participant_teams[3]]
-        return filtered_teams
-    else:
-        return participant_teams
+    # 생성 시간순 정렬과 박유빈 2번째 팀 제외는 owner 인덱스에서 처리
+    if owner_index is None:
+        owner_index = build_owner_index(teams)
+    return get_participant_teams(owner_index, participant_name)
 
-def save_team_visualizations():
-    """모든 팀의 시각화를 생성하고 저장하는 함수"""
-    teams = load_teams_data()
+# 렌더 매니페스트: 출력 파일별로 렌더링 입력/설정의 지문을 기록하여 바뀐 이미지만 다시 그린다
+RENDER_MANIFEST_PATH = 'render_manifest.json'
+# 그리기 코드가 바뀌어 기존 이미지를 모두 무효화해야 할 때 올리는 버전
+RENDERER_VERSION = 2
+
+def load_render_manifest(manifest_path=RENDER_MANIFEST_PATH):
+    """렌더 매니페스트를 로드하는 함수 (없거나 손상된 경우 빈 매니페스트)"""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'files': {}}
+    manifest.setdefault('files', {})
+    return manifest
+
+def save_render_manifest(manifest, manifest_path=RENDER_MANIFEST_PATH):
+    """렌더 매니페스트를 저장하는 함수"""
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+def get_layout_fingerprint(layout):
+    """팀 레이아웃(멤버, 역할, 관계, 아이디어 생성 여부 등 렌더링 입력 전체)의 지문을 계산하는 함수"""
+    encoded = json.dumps(layout, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+def get_settings_fingerprint(color_scheme, output_format, dpi):
+    """렌더러 설정(색상 체계, 출력 형식, dpi, 렌더러 버전)의 지문을 계산하는 함수"""
+    settings = {
+        'renderer_version': RENDERER_VERSION,
+        'color_scheme': color_scheme,
+        'output_format': output_format,
+        'dpi': dpi
+    }
+    encoded = json.dumps(settings, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+def get_stale_variants(payload, variants, manifest, dpi, force=False):
+    """출력 파일이 없거나 매니페스트의 지문과 다른 (색상 체계, 출력 형식) 변형만 골라내는 함수"""
+    if force:
+        return list(variants)
+    
+    layout_fingerprint = payload['fingerprint']
+    stale = []
+    for color_scheme, output_format in variants:
+        filepath = get_output_path(payload, color_scheme, output_format)
+        entry = manifest['files'].get(filepath)
+        if (not os.path.exists(filepath) or entry is None
+                or entry.get('inputs') != layout_fingerprint
+                or entry.get('settings') != get_settings_fingerprint(color_scheme, output_format, dpi)):
+            stale.append((color_scheme, output_format))
+    return stale
+
+def setup_fonts():
+    """한글 폰트 설정 (시스템에 따라 조정 필요)"""
+    plt.rcParams['font.family'] = ['Arial Unicode MS', 'AppleGothic', 'Malgun Gothic', 'DejaVu Sans']
+    plt.rcParams['axes.unicode_minus'] = False
+
+def _init_render_worker():
+    """렌더링 워커 프로세스 초기화 함수 (화면 없는 백엔드 + 폰트 설정)"""
+    plt.switch_backend('Agg')
+    setup_fonts()
+
+def make_render_payload(team, participant_name, team_number, auto_layouts=None):
+    """워커에 전달할 팀별 경량 렌더링 데이터를 만드는 함수 (전체 팀 데이터 대신 계산된 레이아웃만 포함)"""
+    with span('layout', participant=participant_name, team_number=team_number):
+        layout = build_team_layout(team, team_number - 1, team_number, auto_layouts)
+    if layout is None:
+        return None
+    return {
+        'participant_name': participant_name,
+        'team_number': team_number,
+        'layout': layout,
+        'fingerprint': get_layout_fingerprint(layout)
+    }
+
+def get_output_path(payload, color_scheme, output_format='png'):
+    """색상 체계와 출력 형식에 따른 파일 경로를 만드는 함수 (사람이름_team_번호.형식)"""
+    filename = f"{payload['participant_name']}_team_{payload['team_number']}.{output_format}"
+    return os.path.join(COLOR_SCHEMES[color_scheme]['output_dir'], filename)
+
+def render_team_payload(payload, variants=(('generation', 'png'),), dpi=300):
+    """
+    레이아웃 하나로 요청된 (색상 체계, 출력 형식) 변형을 모두 저장하는 함수
+    그림은 한 번만 그리고 색상 체계별로 노드 색상과 범례만 교체한다. 저장된 (색상 체계, 출력 형식, 파일 경로) 목록을 반환한다.
+    """
+    # 매니페스트 비교로 일부 변형만 다시 그리는 경우 payload에 지정된 변형 사용
+    variants = payload.get('variants', variants)
+    saved = []
+    fig = None
+    node_patches = None
+    # 워커 프로세스에서 렌더링하는 경우(--workers > 1)에는 구간이 기록되지 않음
+    with span('render', participant=payload['participant_name'], team_number=payload['team_number']):
+        for color_scheme, output_format in variants:
+            if fig is None:
+                fig, node_patches = draw_team_layout(payload['layout'], color_scheme)
+            else:
+                apply_color_scheme(fig.axes[0], payload['layout'], node_patches, color_scheme)
+            
+            filepath = get_output_path(payload, color_scheme, output_format)
+            fig.savefig(filepath, dpi=dpi, bbox_inches='tight')
+            saved.append((color_scheme, output_format, filepath))
+        
+        if fig is not None:
+            plt.close(fig)
+    return saved
+
+def render_payloads(payloads, variants=(('generation', 'png'),), workers=1, dpi=300):
+    """렌더링 데이터 목록을 순차 또는 프로세스 풀로 렌더링하는 함수 ((payload, 저장 목록) 순서대로 반환)"""
+    if workers is None or workers <= 0:
+        workers = os.cpu_count() or 1
     
-    # 시각화 폴더 생성
-    os.makedirs('team_visualizations', exist_ok=True)
+    render = partial(render_team_payload, variants=tuple(variants), dpi=dpi)
+    if workers == 1 or len(payloads) <= 1:
+        for payload in payloads:
+            yield payload, render(payload)
+        return
     
-    # 모든 고유한 참가자 찾기
-    participants = set()
-    for team in teams:
-        owner_name = team.get('owner_info', {}).get('name', 'Unknown')
-        participants.add(owner_name)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker) as executor:
+        # chunksize를 두어 작은 팀들의 IPC 오버헤드를 줄임
+        chunksize = max(1, len(payloads) // (workers * 4))
+        for payload, saved in zip(payloads, executor.map(render, payloads, chunksize=chunksize)):
+            yield payload, saved
+
+def save_visualizations(color_schemes=('generation',), output_formats=('png',), workers=1, dpi=300,
+                        force=False, manifest_path=RENDER_MANIFEST_PATH):
+    """
+    한 번의 데이터 로드/레이아웃 계산으로 여러 색상 체계와 출력 형식의 팀 시각화를 저장하는 함수
+    렌더 매니페스트와 비교하여 입력이나 설정이 바뀌었거나 파일이 없는 이미지만 다시 그린다 (force=True면 전부).
+    """
+    with span('load'):
+        teams = load_teams_data()
+    manifest = load_render_manifest(manifest_path)
     
-    # 각 참가자별로 처리 (임현승 제외)
-    for participant_name in participants:
-        if participant_name == "임현승":
+    # 색상 체계별 시각화 폴더 생성
+    for color_scheme in color_schemes:
+        os.makedirs(COLOR_SCHEMES[color_scheme]['output_dir'], exist_ok=True)
+    variants = [(color_scheme, output_format) for color_scheme in color_schemes for output_format in output_formats]
+    
+    # 참가자별 팀 인덱스를 한 번만 생성 (임현승 제외)
+    with span('index'):
+        owner_index = build_owner_index(teams)
+    # 자동 배치가 필요한 팀의 좌표를 한 번의 배치 연산으로 미리 계산
+    with span('auto_layout'):
+        auto_layouts = prepare_layouts(teams)
+    payloads = []
+    up_to_date_count = 0
+    for participant_name, team_idx, team in iter_numbered_teams(owner_index):
+        payload = make_render_payload(team, participant_name, team_idx, auto_layouts)
+        if payload is None:
+            for color_scheme in color_schemes:
+                print(f"팀 {team_idx} ({participant_name}): {COLOR_SCHEMES[color_scheme]['label']} 생성 실패")
             continue
-        filtered_teams = get_filtered_teams_for_participant(teams, participant_name)
         
-        for team_idx, team in enumerate(filtered_teams, 1):
-            # 시각화 생성 (팀 번호 전달)
-            fig = create_team_network_visualization(team, team_idx - 1, team_idx)
-            
-            if fig is not None:
-                # 파일명 생성: 사람이름_team_번호
-                filename = f"{participant_name}_team_{team_idx}.png"
-                filepath = os.path.join('team_visualizations', filename)
-                
-                # 저장
-                fig.savefig(filepath, dpi=300, bbox_inches='tight')
-                plt.close(fig)
-                
-                print(f"저장 완료: {filepath}")
-            else:
-                print(f"팀 {team_idx} ({participant_name}): 시각화 생성 실패")
+        stale_variants = get_stale_variants(payload, variants, manifest, dpi, force)
+        up_to_date_count += len(variants) - len(stale_variants)
+        if stale_variants:
+            payload['variants'] = stale_variants
+            payloads.append(payload)
+    
+    try:
+        for payload, saved in render_payloads(payloads, variants, workers, dpi):
+            for color_scheme, output_format, filepath in saved:
+                manifest['files'][filepath] = {
+                    'inputs': payload['fingerprint'],
+                    'settings': get_settings_fingerprint(color_scheme, output_format, dpi)
+                }
+                print(f"{COLOR_SCHEMES[color_scheme]['label']} 저장 완료: {filepath}")
+    finally:
+        # 중간에 실패해도 이미 저장된 이미지는 매니페스트에 남김
+        save_render_manifest(manifest, manifest_path)
+        save_layout_cache()
+    
+    if up_to_date_count:
+        print(f"변경 없는 이미지 {up_to_date_count}개는 다시 그리지 않았습니다. (--force로 전체 재생성)")
 
-def save_role_based_visualizations():
-    """역할 기반 색상 체계로 팀 시각화를 생성하고 저장하는 함수"""
-    teams = load_teams_data()
+# 리포트(컨택트 시트/다중 페이지 PDF) 출력 폴더와 패널 크기 (인치)
+REPORT_DIR = 'team_reports'
+REPORT_PANEL_SIZE = (6, 4)
+
+def draw_contact_sheet(payloads, color_scheme='generation', columns=3, title=None, draw_mode='collection'):
+    """여러 팀을 하나의 격자 그림(컨택트 시트)에 패널로 그리는 함수 (범례는 그림 전체에 한 번만 표시)"""
+    rows = max(1, -(-len(payloads) // columns))
+    panel_width, panel_height = REPORT_PANEL_SIZE
+    fig, axes = plt.subplots(rows, columns, figsize=(columns * panel_width, rows * panel_height), squeeze=False)
     
-    # 역할 기반 시각화 폴더 생성
-    os.makedirs('role_based_visualizations', exist_ok=True)
+    for ax, payload in zip(axes.flat, payloads):
+        node_patches = draw_layout_on_axes(fig, ax, payload['layout'], draw_mode, title_fontsize=10)
+        apply_color_scheme(ax, payload['layout'], node_patches, color_scheme, legend=False)
     
-    # 모든 고유한 참가자 찾기
-    participants = set()
-    for team in teams:
-        owner_name = team.get('owner_info', {}).get('name', 'Unknown')
-        participants.add(owner_name)
+    # 남는 패널 숨기기
+    for ax in axes.flat[len(payloads):]:
+        ax.set_visible(False)
     
-    # 각 참가자별로 처리 (임현승 제외)
-    for participant_name in participants:
-        if participant_name == "임현승":
-            continue
-        filtered_teams = get_filtered_teams_for_participant(teams, participant_name)
+    legend_elements = COLOR_SCHEMES[color_scheme]['legend']()
+    fig.legend(handles=legend_elements, loc='upper center', ncol=len(legend_elements), bbox_to_anchor=(0.5, 1.0))
+    if title:
+        fig.suptitle(title, fontsize=16, weight='bold', y=1.04)
+    fig.tight_layout(rect=(0, 0, 1, 0.95))
+    return fig, axes.flat[:len(payloads)]
+
+def save_panel_thumbnails(fig, panel_axes, payloads, color_scheme, dpi=40):
+    """컨택트 시트의 각 패널 영역만 잘라 저해상도 썸네일로 저장하는 함수 (그림을 다시 그리지 않음)"""
+    thumbnail_dir = os.path.join(REPORT_DIR, 'thumbnails', color_scheme)
+    os.makedirs(thumbnail_dir, exist_ok=True)
+    
+    renderer = fig.canvas.get_renderer()
+    saved = []
+    for ax, payload in zip(panel_axes, payloads):
+        bbox = ax.get_tightbbox(renderer).transformed(fig.dpi_scale_trans.inverted())
+        filepath = os.path.join(thumbnail_dir, f"{payload['participant_name']}_team_{payload['team_number']}.png")
+        fig.savefig(filepath, dpi=dpi, bbox_inches=bbox)
+        saved.append(filepath)
+    return saved
+
+def save_team_report(color_schemes=('generation',), group_by='participant', columns=3, output_formats=('png', 'pdf'),
+                     sheet_dpi=150, thumbnail_dpi=None, draw_mode='collection'):
+    """
+    참가자별(group_by='participant') 또는 전체 코호트(group_by='cohort') 팀 그래프를
+    컨택트 시트 PNG와 다중 페이지 PDF(색상 체계별 한 파일)로 한 프로세스 안에서 저장하는 함수
+    thumbnail_dpi를 지정하면 각 패널을 저해상도 썸네일로도 저장한다.
+    """
+    with span('load'):
+        teams = load_teams_data()
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    
+    # 참가자별 팀 인덱스를 한 번만 생성하고 레이아웃도 한 번만 계산 (임현승 제외)
+    with span('index'):
+        owner_index = build_owner_index(teams)
+    with span('auto_layout'):
+        auto_layouts = prepare_layouts(teams)
+        save_layout_cache()
+    groups = []
+    for participant_name, participant_teams in owner_index.items():
+        payloads = [make_render_payload(team, participant_name, team_idx, auto_layouts)
+                    for team_idx, team in enumerate(participant_teams, 1)]
+        payloads = [payload for payload in payloads if payload is not None]
+        if payloads:
+            groups.append((participant_name, payloads))
+    if group_by == 'cohort':
+        groups = [('cohort', [payload for _, payloads in groups for payload in payloads])]
+        columns = max(columns, 6)
+    
+    for color_scheme in color_schemes:
+        label = COLOR_SCHEMES[color_scheme]['label']
+        pdf = None
+        if 'pdf' in output_formats:
+            pdf_path = os.path.join(REPORT_DIR, f"{group_by}_{color_scheme}.pdf")
+            pdf = PdfPages(pdf_path)
         
-        for team_idx, team in enumerate(filtered_teams, 1):
-            # 역할 기반 색상으로 시각화 생성
-            fig = create_team_network_visualization(team, team_idx - 1, team_idx, use_role_colors=True)
-            
-            if fig is not None:
-                # 파일명 생성: 사람이름_team_번호
-                filename = f"{participant_name}_team_{team_idx}.png"
-                filepath = os.path.join('role_based_visualizations', filename)
-                
-                # 저장
-                fig.savefig(filepath, dpi=300, bbox_inches='tight')
-                plt.close(fig)
-                
-                print(f"역할 기반 시각화 저장 완료: {filepath}")
-            else:
-                print(f"팀 {team_idx} ({participant_name}): 역할 기반 시각화 생성 실패")
+        try:
+            for group_name, payloads in groups:
+                with span('render_sheet', group=group_name, color_scheme=color_scheme, panels=len(payloads)):
+                    fig, panel_axes = draw_contact_sheet(payloads, color_scheme, columns,
+                                                         title=f"{group_name} ({label})", draw_mode=draw_mode)
+                    if 'png' in output_formats:
+                        sheet_path = os.path.join(REPORT_DIR, f"{group_name}_{color_scheme}.png")
+                        fig.savefig(sheet_path, dpi=sheet_dpi, bbox_inches='tight')
+                        print(f"{label} 컨택트 시트 저장 완료: {sheet_path}")
+                    if pdf is not None:
+                        pdf.savefig(fig, bbox_inches='tight')
+                    if thumbnail_dpi:
+                        save_panel_thumbnails(fig, panel_axes, payloads, color_scheme, thumbnail_dpi)
+                    plt.close(fig)
+        finally:
+            if pdf is not None:
+                pdf.close()
+                print(f"{label} PDF 리포트 저장 완료: {pdf_path}")
+
+def save_team_visualizations(workers=1):
+    """모든 팀의 시각화를 생성하고 저장하는 함수"""
+    save_visualizations(('generation',), workers=workers)
+
+def save_role_based_visualizations(workers=1):
+    """역할 기반 색상 체계로 팀 시각화를 생성하고 저장하는 함수"""
+    save_visualizations(('role',), workers=workers)
 
 if __name__ == "__main__":
-    # 한글 폰트 설정 (시스템에 따라 조정 필요)
-    plt.rcParams['font.family'] = ['Arial Unicode MS', 'AppleGothic', 'Malgun Gothic', 'DejaVu Sans']
-    plt.rcParams['axes.unicode_minus'] = False
+    parser = argparse.ArgumentParser(description='팀 네트워크 시각화 생성')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='렌더링 프로세스 수 (1: 순차 렌더링, 0: CPU 코어 수만큼)')
+    parser.add_argument('--schemes', nargs='+', default=['generation'], choices=sorted(COLOR_SCHEMES),
+                        help='생성할 색상 체계 (generation: 생성 능력 기반, role: 역할 기반)')
+    parser.add_argument('--formats', nargs='+', default=['png'], help='출력 형식 (png, pdf, svg ...)')
+    parser.add_argument('--role-based', action='store_true', help='역할 기반 색상 시각화도 함께 생성')
+    parser.add_argument('--dpi', type=int, default=300, help='래스터 출력 해상도')
+    parser.add_argument('--force', action='store_true', help='렌더 매니페스트를 무시하고 모든 이미지를 다시 생성')
+    parser.add_argument('--report', choices=['participant', 'cohort'],
+                        help='팀별 이미지 대신 참가자별/전체 컨택트 시트와 다중 페이지 PDF 리포트 생성')
+    parser.add_argument('--thumbnail-dpi', type=int, help='리포트 모드에서 패널별 저해상도 썸네일 dpi')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    configure_from_args(args)
+    
+    setup_fonts()
+    
+    # 기본은 기존 생성 능력 기반 시각화
+    color_schemes = list(args.schemes)
+    if args.role_based and 'role' not in color_schemes:
+        color_schemes.append('role')
+    if args.report:
+        save_team_report(color_schemes, group_by=args.report, thumbnail_dpi=args.thumbnail_dpi)
+    else:
+        save_visualizations(color_schemes, args.formats, workers=args.workers, dpi=args.dpi, force=args.force)
+    print("모든 팀 시각화가 완료되었습니다!")
     
-    # 기존 생성 능력 기반 시각화
-    save_team_visualizations()
-    print("모든 팀 시각화가 완료되었습니다!")
\ No newline at end of file
+    print_summary()
+    report_path = write_report()
+    if report_path:
+        print(f"계측 리포트 저장: {report_path}")